@@ -1,53 +1,179 @@
 """
 This module contains the core types and events for the Agent User Interaction Protocol.
+
+Names are imported lazily on first access, and the pydantic models build
+their validators and serializers on first use (`defer_build`), so that
+importing the package adds little to the cold start of a worker. Servers
+that prefer to pay that cost up front call `warmup()` at startup.
 """
 
-from ag_ui.core.events import (
-    EventType,
-    BaseEvent,
-    TextMessageStartEvent,
-    TextMessageContentEvent,
-    TextMessageEndEvent,
-    TextMessageChunkEvent,
-    ThinkingTextMessageStartEvent,
-    ThinkingTextMessageContentEvent,
-    ThinkingTextMessageEndEvent,
-    ToolCallStartEvent,
-    ToolCallArgsEvent,
-    ToolCallEndEvent,
-    ToolCallChunkEvent,
-    ToolCallResultEvent,
-    ThinkingStartEvent,
-    ThinkingEndEvent,
-    StateSnapshotEvent,
-    StateDeltaEvent,
-    MessagesSnapshotEvent,
-    RawEvent,
-    CustomEvent,
-    RunStartedEvent,
-    RunFinishedEvent,
-    RunErrorEvent,
-    StepStartedEvent,
-    StepFinishedEvent,
-    Event
-)
-
-from ag_ui.core.types import (
-    FunctionCall,
-    ToolCall,
-    BaseMessage,
-    DeveloperMessage,
-    SystemMessage,
-    AssistantMessage,
-    UserMessage,
-    ToolMessage,
-    Message,
-    Role,
-    Context,
-    Tool,
-    RunAgentInput,
-    State
-)
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from ag_ui.core.events import (
+        EventType,
+        BaseEvent,
+        TextMessageStartEvent,
+        TextMessageContentEvent,
+        TextMessageEndEvent,
+        TextMessageChunkEvent,
+        ThinkingTextMessageStartEvent,
+        ThinkingTextMessageContentEvent,
+        ThinkingTextMessageEndEvent,
+        ToolCallStartEvent,
+        ToolCallArgsEvent,
+        ToolCallEndEvent,
+        ToolCallChunkEvent,
+        ToolCallResultEvent,
+        ThinkingStartEvent,
+        ThinkingEndEvent,
+        StateSnapshotEvent,
+        StateDeltaEvent,
+        MessagesSnapshotEvent,
+        RawEvent,
+        CustomEvent,
+        RunStartedEvent,
+        RunFinishedEvent,
+        RunErrorEvent,
+        StepStartedEvent,
+        StepFinishedEvent,
+        Event,
+        set_strict_construction,
+        is_strict_construction,
+    )
+
+    from ag_ui.core.types import (
+        FunctionCall,
+        ToolCall,
+        BaseMessage,
+        DeveloperMessage,
+        SystemMessage,
+        AssistantMessage,
+        UserMessage,
+        ToolMessage,
+        Message,
+        Role,
+        Context,
+        Tool,
+        RunAgentInput,
+        State,
+        RawJSON,
+    )
+
+    from ag_ui.core.registry import (
+        EVENT_CLASSES,
+        EVENT_WIRE_CODES,
+        EVENT_TYPES_BY_WIRE_CODE,
+        get_event_class,
+        get_event_adapter,
+    )
+
+    from ag_ui.core.parsing import LazyMessages, MessageCache, parse_run_agent_input
+
+# Module of every lazily imported name
+_LAZY_IMPORTS: Dict[str, str] = {
+    **dict.fromkeys((
+        "EventType",
+        "BaseEvent",
+        "TextMessageStartEvent",
+        "TextMessageContentEvent",
+        "TextMessageEndEvent",
+        "TextMessageChunkEvent",
+        "ThinkingTextMessageStartEvent",
+        "ThinkingTextMessageContentEvent",
+        "ThinkingTextMessageEndEvent",
+        "ToolCallStartEvent",
+        "ToolCallArgsEvent",
+        "ToolCallEndEvent",
+        "ToolCallChunkEvent",
+        "ToolCallResultEvent",
+        "ThinkingStartEvent",
+        "ThinkingEndEvent",
+        "StateSnapshotEvent",
+        "StateDeltaEvent",
+        "MessagesSnapshotEvent",
+        "RawEvent",
+        "CustomEvent",
+        "RunStartedEvent",
+        "RunFinishedEvent",
+        "RunErrorEvent",
+        "StepStartedEvent",
+        "StepFinishedEvent",
+        "Event",
+        "set_strict_construction",
+        "is_strict_construction",
+    ), "ag_ui.core.events"),
+    **dict.fromkeys((
+        "FunctionCall",
+        "ToolCall",
+        "BaseMessage",
+        "DeveloperMessage",
+        "SystemMessage",
+        "AssistantMessage",
+        "UserMessage",
+        "ToolMessage",
+        "Message",
+        "Role",
+        "Context",
+        "Tool",
+        "RunAgentInput",
+        "State",
+        "RawJSON",
+    ), "ag_ui.core.types"),
+    **dict.fromkeys((
+        "EVENT_CLASSES",
+        "EVENT_WIRE_CODES",
+        "EVENT_TYPES_BY_WIRE_CODE",
+        "get_event_class",
+        "get_event_adapter",
+    ), "ag_ui.core.registry"),
+    **dict.fromkeys((
+        "LazyMessages",
+        "MessageCache",
+        "parse_run_agent_input",
+    ), "ag_ui.core.parsing"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
+def warmup() -> None:
+    """
+    Imports all events and types and builds the validators and serializers
+    of their models, which are otherwise built on first use, along with the
+    cached adapters for the Event union and the run input.
+    """
+    from pydantic import BaseModel  # pylint: disable=import-outside-toplevel
+
+    for module_name in ("ag_ui.core.types", "ag_ui.core.events", "ag_ui.core.parsing"):
+        module = importlib.import_module(module_name)
+        for value in vars(module).values():
+            if (
+                isinstance(value, type)
+                and issubclass(value, BaseModel)
+                and value.__module__ == module_name
+                and not value.__pydantic_complete__
+            ):
+                value.model_rebuild()
+
+    registry = importlib.import_module("ag_ui.core.registry")
+    parsing = importlib.import_module("ag_ui.core.parsing")
+    registry.get_event_adapter()
+    parsing._input_models(None)  # pylint: disable=protected-access
+    parsing._message_adapter()  # pylint: disable=protected-access
+
 
 __all__ = [
     # Events
@@ -78,6 +204,8 @@ __all__ = [
     "StepStartedEvent",
     "StepFinishedEvent",
     "Event",
+    "set_strict_construction",
+    "is_strict_construction",
     # Types
     "FunctionCall",
     "ToolCall",
@@ -92,5 +220,18 @@ __all__ = [
     "Context",
     "Tool",
     "RunAgentInput",
-    "State"
+    "State",
+    "RawJSON",
+    # Registry
+    "EVENT_CLASSES",
+    "EVENT_WIRE_CODES",
+    "EVENT_TYPES_BY_WIRE_CODE",
+    "get_event_class",
+    "get_event_adapter",
+    # Parsing
+    "LazyMessages",
+    "MessageCache",
+    "parse_run_agent_input",
+    # Startup
+    "warmup",
 ]
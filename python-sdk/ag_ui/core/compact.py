@@ -0,0 +1,336 @@
+"""
+This module contains compact, immutable records of the AG-UI events.
+
+Pipelines that buffer large numbers of events can hold them as records
+instead of pydantic models. A record keeps its fields in `__slots__` and has
+no `__dict__`, fields set or extras, so it needs a fraction of the memory.
+Every class in `ag_ui.core.events` has a record class of the same name here.
+
+Records convert losslessly to and from the models and can be encoded
+directly by `EventEncoder`:
+
+    record = compact.from_event(event)
+    event = record.to_event()
+
+Records are not validated. They are immutable, but the values they hold
+(for example a state snapshot) are shared, not copied.
+"""
+
+from typing import Any, ClassVar, Dict, Tuple, Type, TypeVar
+
+from ag_ui.core import events
+from ag_ui.core.events import EventType
+
+_RecordT = TypeVar("_RecordT", bound="BaseEvent")
+
+_MISSING = object()
+
+# Record class of every event class
+_RECORD_CLASSES: Dict[Type[events.BaseEvent], Type["BaseEvent"]] = {}
+
+_object_new = object.__new__
+_object_setattr = object.__setattr__
+
+
+class BaseEvent:
+    """
+    Compact record of a BaseEvent, and base class of all records.
+    """
+    __slots__ = ("type", "timestamp", "raw_event")
+
+    model_class: ClassVar[Type[events.BaseEvent]]
+    _fields: ClassVar[Tuple[str, ...]]
+    _defaults: ClassVar[Tuple[Tuple[str, Any], ...]]
+
+    def __init_subclass__(cls, model_class: Type[events.BaseEvent], **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        _register(cls, model_class)
+
+    def __init__(self, **values: Any):
+        for name, default in self._defaults:
+            value = values.pop(name, default)
+            if value is _MISSING:
+                raise TypeError(f"{type(self).__name__} is missing the field {name!r}")
+            _object_setattr(self, name, value)
+        if values:
+            raise TypeError(f"{type(self).__name__} has no fields {sorted(values)!r}")
+
+    @classmethod
+    def from_event(cls: Type[_RecordT], event: events.BaseEvent) -> _RecordT:
+        """
+        Creates a record from an event of the matching model class, or of
+        the class parameterized with a state model.
+        """
+        if _model_class(type(event)) is not cls.model_class:
+            raise TypeError(
+                f"{cls.__name__} records {cls.model_class.__name__}, "
+                f"not {type(event).__name__}"
+            )
+        values = event.__dict__
+        record = _object_new(cls)
+        for name in cls._fields:
+            _object_setattr(record, name, values[name])
+        return record
+
+    def to_event(self) -> events.BaseEvent:
+        """
+        Converts the record into its pydantic model, without validation
+        unless strict construction is enabled.
+        """
+        return self.model_class.trusted(**self._asdict())
+
+    def replace(self: _RecordT, **changes: Any) -> _RecordT:
+        """
+        Returns a copy of the record with the given fields replaced.
+        """
+        values = self._asdict()
+        values.update(changes)
+        return type(self)(**values)
+
+    def _asdict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self._fields}
+
+    def _values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self._fields)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} records are immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} records are immutable")
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._values()))
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+    def __reduce__(self):
+        return (_restore, (type(self), self._values()))
+
+
+def _register(cls: Type[BaseEvent], model_class: Type[events.BaseEvent]) -> None:
+    fields = tuple(model_class.model_fields)
+    slots = [
+        name for klass in reversed(cls.__mro__) for name in klass.__dict__.get("__slots__", ())
+    ]
+    if sorted(slots) != sorted(fields):
+        raise TypeError(f"The slots of {cls.__name__} do not match the fields of {model_class}")
+    defaults = []
+    for name, field in model_class.model_fields.items():
+        annotation_args = getattr(field.annotation, "__args__", ())
+        if name == "type" and len(annotation_args) == 1 and isinstance(annotation_args[0], EventType):
+            defaults.append((name, annotation_args[0]))
+        elif field.is_required():
+            defaults.append((name, _MISSING))
+        else:
+            defaults.append((name, field.get_default(call_default_factory=True)))
+    cls.model_class = model_class
+    cls._fields = fields
+    cls._defaults = tuple(defaults)
+    _RECORD_CLASSES[model_class] = cls
+
+
+def _model_class(cls: type) -> type:
+    """
+    Returns the generic class of a class parameterized with a state model,
+    e.g. StateSnapshotEvent for StateSnapshotEvent[MyState].
+    """
+    metadata = getattr(cls, "__pydantic_generic_metadata__", None)
+    return (metadata and metadata["origin"]) or cls
+
+
+def _restore(cls: Type[BaseEvent], values: Tuple[Any, ...]) -> BaseEvent:
+    record = _object_new(cls)
+    for name, value in zip(cls._fields, values):
+        _object_setattr(record, name, value)
+    return record
+
+
+def from_event(event: events.BaseEvent) -> BaseEvent:
+    """
+    Creates the record of an event.
+    """
+    try:
+        record_class = _RECORD_CLASSES[_model_class(type(event))]
+    except KeyError as exc:
+        raise TypeError(f"There is no compact record for {type(event).__name__}") from exc
+    return record_class.from_event(event)
+
+
+_register(BaseEvent, events.BaseEvent)
+
+
+class TextMessageStartEvent(BaseEvent, model_class=events.TextMessageStartEvent):
+    """
+    Compact record of a TextMessageStartEvent.
+    """
+    __slots__ = ("message_id", "role")
+
+
+class TextMessageContentEvent(BaseEvent, model_class=events.TextMessageContentEvent):
+    """
+    Compact record of a TextMessageContentEvent.
+    """
+    __slots__ = ("message_id", "delta")
+
+
+class TextMessageEndEvent(BaseEvent, model_class=events.TextMessageEndEvent):
+    """
+    Compact record of a TextMessageEndEvent.
+    """
+    __slots__ = ("message_id",)
+
+
+class TextMessageChunkEvent(BaseEvent, model_class=events.TextMessageChunkEvent):
+    """
+    Compact record of a TextMessageChunkEvent.
+    """
+    __slots__ = ("message_id", "role", "delta")
+
+
+class ThinkingTextMessageStartEvent(BaseEvent, model_class=events.ThinkingTextMessageStartEvent):
+    """
+    Compact record of a ThinkingTextMessageStartEvent.
+    """
+    __slots__ = ()
+
+
+class ThinkingTextMessageContentEvent(BaseEvent, model_class=events.ThinkingTextMessageContentEvent):
+    """
+    Compact record of a ThinkingTextMessageContentEvent.
+    """
+    __slots__ = ("delta",)
+
+
+class ThinkingTextMessageEndEvent(BaseEvent, model_class=events.ThinkingTextMessageEndEvent):
+    """
+    Compact record of a ThinkingTextMessageEndEvent.
+    """
+    __slots__ = ()
+
+
+class ToolCallStartEvent(BaseEvent, model_class=events.ToolCallStartEvent):
+    """
+    Compact record of a ToolCallStartEvent.
+    """
+    __slots__ = ("tool_call_id", "tool_call_name", "parent_message_id")
+
+
+class ToolCallArgsEvent(BaseEvent, model_class=events.ToolCallArgsEvent):
+    """
+    Compact record of a ToolCallArgsEvent.
+    """
+    __slots__ = ("tool_call_id", "delta")
+
+
+class ToolCallEndEvent(BaseEvent, model_class=events.ToolCallEndEvent):
+    """
+    Compact record of a ToolCallEndEvent.
+    """
+    __slots__ = ("tool_call_id",)
+
+
+class ToolCallChunkEvent(BaseEvent, model_class=events.ToolCallChunkEvent):
+    """
+    Compact record of a ToolCallChunkEvent.
+    """
+    __slots__ = ("tool_call_id", "tool_call_name", "parent_message_id", "delta")
+
+
+class ToolCallResultEvent(BaseEvent, model_class=events.ToolCallResultEvent):
+    """
+    Compact record of a ToolCallResultEvent.
+    """
+    __slots__ = ("message_id", "tool_call_id", "content", "role")
+
+
+class ThinkingStartEvent(BaseEvent, model_class=events.ThinkingStartEvent):
+    """
+    Compact record of a ThinkingStartEvent.
+    """
+    __slots__ = ("title",)
+
+
+class ThinkingEndEvent(BaseEvent, model_class=events.ThinkingEndEvent):
+    """
+    Compact record of a ThinkingEndEvent.
+    """
+    __slots__ = ()
+
+
+class StateSnapshotEvent(BaseEvent, model_class=events.StateSnapshotEvent):
+    """
+    Compact record of a StateSnapshotEvent.
+    """
+    __slots__ = ("snapshot",)
+
+
+class StateDeltaEvent(BaseEvent, model_class=events.StateDeltaEvent):
+    """
+    Compact record of a StateDeltaEvent.
+    """
+    __slots__ = ("delta",)
+
+
+class MessagesSnapshotEvent(BaseEvent, model_class=events.MessagesSnapshotEvent):
+    """
+    Compact record of a MessagesSnapshotEvent.
+    """
+    __slots__ = ("messages",)
+
+
+class RawEvent(BaseEvent, model_class=events.RawEvent):
+    """
+    Compact record of a RawEvent.
+    """
+    __slots__ = ("event", "source")
+
+
+class CustomEvent(BaseEvent, model_class=events.CustomEvent):
+    """
+    Compact record of a CustomEvent.
+    """
+    __slots__ = ("name", "value")
+
+
+class RunStartedEvent(BaseEvent, model_class=events.RunStartedEvent):
+    """
+    Compact record of a RunStartedEvent.
+    """
+    __slots__ = ("thread_id", "run_id")
+
+
+class RunFinishedEvent(BaseEvent, model_class=events.RunFinishedEvent):
+    """
+    Compact record of a RunFinishedEvent.
+    """
+    __slots__ = ("thread_id", "run_id", "result")
+
+
+class RunErrorEvent(BaseEvent, model_class=events.RunErrorEvent):
+    """
+    Compact record of a RunErrorEvent.
+    """
+    __slots__ = ("message", "code")
+
+
+class StepStartedEvent(BaseEvent, model_class=events.StepStartedEvent):
+    """
+    Compact record of a StepStartedEvent.
+    """
+    __slots__ = ("step_name",)
+
+
+class StepFinishedEvent(BaseEvent, model_class=events.StepFinishedEvent):
+    """
+    Compact record of a StepFinishedEvent.
+    """
+    __slots__ = ("step_name",)
+
@@ -2,11 +2,87 @@
 This module contains the event types for the Agent User Interaction Protocol Python SDK.
 """
 
+import copy
+import os
 from enum import Enum
-from typing import Any, List, Literal, Optional, Union, Annotated
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    Annotated,
+    get_args,
+    get_origin,
+)
 from pydantic import Field
 
-from .types import Message, State, ConfiguredBaseModel
+from .types import Message, StateT, ConfiguredBaseModel
+
+_EventT = TypeVar("_EventT", bound="BaseEvent")
+
+# Whether BaseEvent.trusted validates like the regular constructor
+_strict_construction = os.environ.get("AG_UI_STRICT_EVENTS", "").lower() in ("1", "true", "yes")
+
+# Per event class: the initial __dict__, the fields with a default factory
+# and the private attribute defaults
+_TrustedPlan = Tuple[
+    Dict[str, Any],
+    Tuple[Tuple[str, Callable[[], Any]], ...],
+    Optional[Dict[str, Any]],
+]
+_TRUSTED_PLANS: Dict[type, _TrustedPlan] = {}
+
+_object_new = object.__new__
+_object_setattr = object.__setattr__
+
+
+def set_strict_construction(strict: bool) -> None:
+    """
+    Switches `BaseEvent.trusted` between trusted construction (the default),
+    which skips validation, and strict construction, which validates like
+    the regular constructor. Strict construction is meant for tests and
+    debugging; it can also be enabled with the AG_UI_STRICT_EVENTS
+    environment variable.
+    """
+    global _strict_construction  # pylint: disable=global-statement
+    _strict_construction = strict
+
+
+def is_strict_construction() -> bool:
+    """
+    Returns whether `BaseEvent.trusted` validates its values.
+    """
+    return _strict_construction
+
+
+def _trusted_plan(cls: type) -> _TrustedPlan:
+    template: Dict[str, Any] = {}
+    factories: List[Tuple[str, Callable[[], Any]]] = []
+    for name, field in cls.model_fields.items():
+        template[name] = None
+        if name == "type" and get_origin(field.annotation) is Literal:
+            template[name] = get_args(field.annotation)[0]
+        elif field.default_factory is not None:
+            factories.append((name, field.default_factory))
+        elif field.is_required():
+            continue
+        elif isinstance(field.default, (type(None), str, int, float, bool, tuple, Enum)):
+            template[name] = field.default
+        else:
+            factories.append((name, partial(copy.deepcopy, field.default)))
+    private = {
+        name: attribute.get_default() for name, attribute in cls.__private_attributes__.items()
+    } or None
+    plan = _TRUSTED_PLANS[cls] = (template, tuple(factories), private)
+    return plan
 
 
 class EventType(str, Enum):
@@ -47,6 +123,39 @@ class BaseEvent(ConfiguredBaseModel):
     timestamp: Optional[int] = None
     raw_event: Optional[Any] = None
 
+    @classmethod
+    def trusted(cls: Type[_EventT], **values: Any) -> _EventT:
+        """
+        Creates an event from values that the caller guarantees to be valid,
+        such as events built by the agent's own code. Takes field names, not
+        camelCase aliases; `type` defaults to the event type of the class.
+
+        Validation, including the checks in `model_post_init`, is skipped
+        unless strict construction is enabled (see `set_strict_construction`).
+        Names that are not fields of the class raise a TypeError.
+        """
+        try:
+            template, factories, private = _TRUSTED_PLANS[cls]
+        except KeyError:
+            template, factories, private = _trusted_plan(cls)
+        if _strict_construction:
+            if "type" not in values and template["type"] is not None:
+                values["type"] = template["type"]
+            return cls(**values)
+        data = {**template, **values}
+        if len(data) != len(template):
+            unknown = ", ".join(sorted(values.keys() - template.keys()))
+            raise TypeError(f"{cls.__name__}.trusted() got unknown fields: {unknown}")
+        for name, factory in factories:
+            if name not in values:
+                data[name] = factory()
+        event = _object_new(cls)
+        _object_setattr(event, "__dict__", data)
+        _object_setattr(event, "__pydantic_fields_set__", {"type", *values})
+        _object_setattr(event, "__pydantic_extra__", None)
+        _object_setattr(event, "__pydantic_private__", private and copy.deepcopy(private))
+        return event
+
 
 class TextMessageStartEvent(BaseEvent):
     """
@@ -168,12 +277,14 @@ class ThinkingEndEvent(BaseEvent):
     """
     type: Literal[EventType.THINKING_END]
 
-class StateSnapshotEvent(BaseEvent):
+class StateSnapshotEvent(BaseEvent, Generic[StateT]):
     """
-    Event containing a snapshot of the state.
+    Event containing a snapshot of the state. Parameterize it with a state
+    model, e.g. `StateSnapshotEvent[MyState]`, to validate and serialize the
+    snapshot with that model's schema instead of as an untyped value.
     """
     type: Literal[EventType.STATE_SNAPSHOT]
-    snapshot: State
+    snapshot: StateT
 
 
 class StateDeltaEvent(BaseEvent):
@@ -260,11 +371,16 @@ Event = Annotated[
         TextMessageContentEvent,
         TextMessageEndEvent,
         TextMessageChunkEvent,
+        ThinkingTextMessageStartEvent,
+        ThinkingTextMessageContentEvent,
+        ThinkingTextMessageEndEvent,
         ToolCallStartEvent,
         ToolCallArgsEvent,
         ToolCallEndEvent,
         ToolCallChunkEvent,
         ToolCallResultEvent,
+        ThinkingStartEvent,
+        ThinkingEndEvent,
         StateSnapshotEvent,
         StateDeltaEvent,
         MessagesSnapshotEvent,
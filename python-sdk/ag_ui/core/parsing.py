@@ -0,0 +1,313 @@
+"""
+This module contains the parsing of RunAgentInput request bodies.
+
+`parse_run_agent_input` validates a request body in one call. With
+`lazy=True` only the envelope (ids, state, tools, context and the shape of
+the message list) is validated up front; every message is validated when it
+is first accessed. Agents that only look at the tail of a long thread then
+pay for the messages they read:
+
+    input_data = parse_run_agent_input(body, lazy=True, eager_messages=20)
+    last = input_data.messages[-1]        # validated up front
+    history = input_data.messages.validate_all()
+
+Errors in lazily validated messages are raised as `ValidationError` on
+access, or up front with `validate_all()`.
+
+Clients send the whole conversation with every run. A `MessageCache` shared
+between requests keeps the validated messages by id, so a message that was
+seen before with the same content is not validated again:
+
+    cache = MessageCache(max_messages=50_000)
+    input_data = parse_run_agent_input(body, message_cache=cache)
+
+Cached messages are shared by all runs that contain them and must not be
+modified.
+
+Without a `state_type`, request bodies of 64 KB or more are decoded with
+`json.loads` and then validated. pydantic validates typed messages from
+JSON faster than from dicts, but converts untyped values such as a large
+`state` to Python objects about twice as slowly as `json.loads`.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any, Dict, Generic, Iterator, List, Mapping, Optional, Tuple, Type, Union
+
+from pydantic import TypeAdapter
+
+from ag_ui.core.types import ConfiguredBaseModel, Context, Message, RunAgentInput, StateT, Tool
+
+RequestBody = Union[bytes, bytearray, memoryview, str, Mapping[str, Any]]
+
+# The body size from which untyped request bodies are decoded with json.loads
+_JSON_LOADS_MIN_SIZE = 64 * 1024
+
+
+class _RunAgentInputEnvelope(ConfiguredBaseModel, Generic[StateT]):
+    """
+    RunAgentInput with the messages left as unvalidated JSON objects.
+    """
+    thread_id: str
+    run_id: str
+    state: StateT
+    messages: List[Dict[str, Any]]
+    tools: List[Tool]
+    context: List[Context]
+    forwarded_props: Any
+
+
+@lru_cache(maxsize=None)
+def _input_models(
+    state_type: Any,
+) -> Tuple[Type[RunAgentInput], Type[_RunAgentInputEnvelope], TypeAdapter]:
+    """
+    Returns the input model, the envelope model and the input adapter for a
+    state type.
+    """
+    if state_type is None:
+        model, envelope = RunAgentInput, _RunAgentInputEnvelope
+    else:
+        model, envelope = RunAgentInput[state_type], _RunAgentInputEnvelope[state_type]
+    return model, envelope, TypeAdapter(model)
+
+
+@lru_cache(maxsize=None)
+def _message_adapter() -> TypeAdapter:
+    return TypeAdapter(Message)
+
+
+class MessageCache:
+    """
+    A bounded LRU cache of validated messages, keyed by message id. A cached
+    message is only reused if the JSON object it was validated from equals
+    the new one, so an edited message is validated again. The least recently
+    used messages are evicted when either `max_messages` or `max_bytes`,
+    an estimate of the size of the messages' JSON, is exceeded. Safe to
+    share between threads.
+    """
+    def __init__(self, max_messages: int = 10_000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Any, Tuple[Mapping[str, Any], Message, int]]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        """
+        The estimated size of the cached messages.
+        """
+        return self._bytes
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the hit, miss and eviction counts and the cache size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "messages": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def validate(self, raw: Mapping[str, Any]) -> Message:
+        """
+        Returns the cached message for a JSON object, validating and caching
+        it on a miss.
+        """
+        # comparing the decoded objects is cheaper than hashing their JSON
+        # and cannot collide
+        key = raw.get("id")
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == raw:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        message = _message_adapter().validate_python(raw)
+        size = len(repr(raw))
+        if not isinstance(key, str) or size > self.max_bytes:
+            return message
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[key] = (raw, message, size)
+            self._bytes += size
+            self._evict()
+        return message
+
+    def validate_many(self, raws: List[Mapping[str, Any]]) -> List[Message]:
+        """
+        Returns the messages for a list of JSON objects, like `validate` but
+        with one lookup pass for the whole list.
+        """
+        messages: List[Optional[Message]] = []
+        append = messages.append
+        with self._lock:
+            entries = self._entries
+            move_to_end = entries.move_to_end
+            for raw in raws:
+                key = raw.get("id")
+                entry = entries.get(key)
+                if entry is not None and entry[0] == raw:
+                    move_to_end(key)
+                    append(entry[1])
+                else:
+                    append(None)
+        hits = len(messages)
+        for index, message in enumerate(messages):
+            if message is None:
+                hits -= 1
+                messages[index] = self.validate(raws[index])
+        with self._lock:
+            self.hits += hits
+        return messages
+
+    def clear(self) -> None:
+        """
+        Removes all messages from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _evict(self) -> None:
+        entries = self._entries
+        while len(entries) > self.max_messages or self._bytes > self.max_bytes:
+            _, (_, _, size) = entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LazyMessages(Sequence):
+    """
+    A read-only sequence of messages that validates every message on first
+    access. Validated messages are kept; their raw data is released.
+    """
+    __slots__ = ("_raw", "_messages", "_validated", "_validate")
+
+    def __init__(
+        self,
+        raw: List[Mapping[str, Any]],
+        eager: int = 0,
+        message_cache: Optional[MessageCache] = None,
+    ):
+        self._validate = (
+            message_cache.validate if message_cache is not None
+            else _message_adapter().validate_python
+        )
+        self._raw: List[Optional[Mapping[str, Any]]] = list(raw)
+        self._messages: List[Optional[Message]] = [None] * len(self._raw)
+        self._validated = 0
+        for index in range(max(len(self._raw) - eager, 0), len(self._raw)):
+            self._load(index)
+
+    @property
+    def validated_count(self) -> int:
+        """
+        The number of messages validated so far.
+        """
+        return self._validated
+
+    def validate_all(self) -> List[Message]:
+        """
+        Validates all remaining messages and returns them as a list.
+        """
+        return [self._load(index) for index in range(len(self._messages))]
+
+    def _load(self, index: int) -> Message:
+        message = self._messages[index]
+        if message is None:
+            message = self._validate(self._raw[index])
+            self._messages[index] = message
+            self._raw[index] = None
+            self._validated += 1
+        return message
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._load(i) for i in range(*index.indices(len(self._messages)))]
+        if index < 0:
+            index += len(self._messages)
+        if not 0 <= index < len(self._messages):
+            raise IndexError("message index out of range")
+        return self._load(index)
+
+    def __iter__(self) -> Iterator[Message]:
+        for index in range(len(self._messages)):
+            yield self._load(index)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, LazyMessages)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}({len(self._messages)} messages, "
+            f"{self._validated} validated)"
+        )
+
+
+def parse_run_agent_input(
+    data: RequestBody,
+    *,
+    state_type: Any = None,
+    lazy: bool = False,
+    eager_messages: int = 0,
+    message_cache: Optional[MessageCache] = None,
+) -> RunAgentInput:
+    """
+    Validates a RunAgentInput from a JSON request body, or from an already
+    decoded JSON object. With a `state_type` the result is a
+    `RunAgentInput[state_type]` whose state is validated as that type.
+
+    With `lazy=True` the messages are a `LazyMessages` sequence that
+    validates each message on first access; the last `eager_messages`
+    messages are validated up front. Otherwise all messages are validated.
+    Messages found in `message_cache` are not validated again.
+    """
+    is_json = isinstance(data, (bytes, bytearray, memoryview, str))
+    if isinstance(data, memoryview):
+        data = bytes(data)
+    if is_json and state_type is None and len(data) >= _JSON_LOADS_MIN_SIZE:
+        try:
+            data = json.loads(data)
+            is_json = False
+        except ValueError:
+            pass  # validated as JSON below, which raises a ValidationError
+    model, envelope_model, adapter = _input_models(state_type)
+    if not lazy and message_cache is None:
+        return adapter.validate_json(data) if is_json else adapter.validate_python(data)
+
+    envelope = (
+        envelope_model.model_validate_json(data) if is_json
+        else envelope_model.model_validate(data)
+    )
+    fields = dict(envelope.__dict__)
+    if lazy:
+        fields["messages"] = LazyMessages(envelope.messages, eager_messages, message_cache)
+    else:
+        fields["messages"] = message_cache.validate_many(envelope.messages)
+    return model.model_construct(**fields)
@@ -0,0 +1,100 @@
+"""
+This module contains the registry of AG-UI event classes.
+
+Every event type maps to exactly one class of the `Event` union and to an
+integer wire code. The codes of the event types in the protobuf schema are
+the values of `ag_ui.EventType` in events.proto; the remaining types follow
+from 16 in the order of `EventType`. Routers and compact codecs can dispatch
+on the code, or validate a payload whose type is already known directly with
+its class, without going through the discriminated union:
+
+    code = EVENT_WIRE_CODES[EventType.TOOL_CALL_ARGS]  # 4
+    event = get_event_adapter(code).validate_json(payload)
+"""
+
+from functools import lru_cache
+from typing import Dict, Type, Union, get_args
+
+from pydantic import TypeAdapter
+
+from ag_ui.core.events import BaseEvent, Event, EventType
+
+# The event class of every event type, from the Event union
+EVENT_CLASSES: Dict[EventType, Type[BaseEvent]] = {
+    get_args(cls.model_fields["type"].annotation)[0]: cls
+    for cls in get_args(get_args(Event)[0])
+}
+
+# Wire codes of the event types in ag_ui.EventType of events.proto
+_PROTO_WIRE_CODES: Dict[EventType, int] = {
+    EventType.TEXT_MESSAGE_START: 0,
+    EventType.TEXT_MESSAGE_CONTENT: 1,
+    EventType.TEXT_MESSAGE_END: 2,
+    EventType.TOOL_CALL_START: 3,
+    EventType.TOOL_CALL_ARGS: 4,
+    EventType.TOOL_CALL_END: 5,
+    EventType.STATE_SNAPSHOT: 6,
+    EventType.STATE_DELTA: 7,
+    EventType.MESSAGES_SNAPSHOT: 8,
+    EventType.RAW: 9,
+    EventType.CUSTOM: 10,
+    EventType.RUN_STARTED: 11,
+    EventType.RUN_FINISHED: 12,
+    EventType.RUN_ERROR: 13,
+    EventType.STEP_STARTED: 14,
+    EventType.STEP_FINISHED: 15,
+}
+
+# The integer wire code of every event type
+EVENT_WIRE_CODES: Dict[EventType, int] = {
+    **_PROTO_WIRE_CODES,
+    **{
+        event_type: code
+        for code, event_type in enumerate(
+            (event_type for event_type in EventType if event_type not in _PROTO_WIRE_CODES),
+            start=len(_PROTO_WIRE_CODES),
+        )
+    },
+}
+
+# The event type of every wire code
+EVENT_TYPES_BY_WIRE_CODE: Dict[int, EventType] = {
+    code: event_type for event_type, code in EVENT_WIRE_CODES.items()
+}
+
+
+def _event_type(event_type: Union[EventType, str, int]) -> EventType:
+    if isinstance(event_type, int):
+        try:
+            return EVENT_TYPES_BY_WIRE_CODE[event_type]
+        except KeyError:
+            raise ValueError(f"Unknown event wire code {event_type}") from None
+    return EventType(event_type)
+
+
+def get_event_class(event_type: Union[EventType, str, int]) -> Type[BaseEvent]:
+    """
+    Returns the event class for an event type, given as EventType, its
+    string value or its wire code.
+    """
+    return EVENT_CLASSES[_event_type(event_type)]
+
+
+@lru_cache(maxsize=None)
+def _class_adapter(cls: Type[BaseEvent]) -> TypeAdapter:
+    return TypeAdapter(cls)
+
+
+def get_event_adapter(event_type: Union[EventType, str, int, None] = None) -> TypeAdapter:
+    """
+    Returns the cached TypeAdapter for the class of an event type, or for
+    the whole Event union if no type is given.
+    """
+    if event_type is None:
+        return _union_adapter()
+    return _class_adapter(get_event_class(event_type))
+
+
+@lru_cache(maxsize=None)
+def _union_adapter() -> TypeAdapter:
+    return TypeAdapter(Event)
@@ -0,0 +1,423 @@
+"""
+This module contains an alternative msgspec backend for the AG-UI events and
+RunAgentInput.
+
+The classes mirror the pydantic models in `ag_ui.core.events` and
+`ag_ui.core.types` as msgspec Structs with the same camelCase wire format.
+Events form a tagged union on `type` and messages on `role`, so decoding
+picks the class from the discriminator just like the pydantic unions. Use it
+where JSON decoding, validation and encoding dominate, e.g. in gateways:
+
+    from ag_ui.core import structs
+
+    input_data = structs.decode_run_agent_input(body)
+    event = structs.decode_event(line)
+    data = structs.encode(event)
+
+Requires the optional `msgspec` package. Keys are written in field order
+with required fields first, so the output is equal to the pydantic models'
+JSON as a value but not necessarily byte by byte. As with `exclude_none`,
+None fields of events are not written; the required fields of RunAgentInput
+are always written, also when they are null.
+"""
+
+from typing import Any, List, Literal, Optional, Union
+
+try:
+    import msgspec
+except ImportError as exc:  # pragma: no cover
+    raise ImportError(
+        "ag_ui.core.structs requires the msgspec package: pip install msgspec"
+    ) from exc
+
+from ag_ui.core.events import EventType
+from ag_ui.core.types import RawJSON
+
+
+class FunctionCall(msgspec.Struct, kw_only=True, rename="camel", forbid_unknown_fields=True):
+    """
+    Name and arguments of a function call.
+    """
+    name: str
+    arguments: str
+
+
+class ToolCall(msgspec.Struct, kw_only=True, rename="camel", forbid_unknown_fields=True):
+    """
+    A tool call, modelled after OpenAI tool calls.
+    """
+    id: str
+    type: Literal["function"]
+    function: FunctionCall
+
+
+class BaseMessage(
+    msgspec.Struct,
+    kw_only=True,
+    rename="camel",
+    omit_defaults=True,
+    forbid_unknown_fields=True,
+    tag_field="role",
+):
+    """
+    A base message, modelled after OpenAI messages.
+    """
+    id: str
+
+    @property
+    def role(self) -> str:
+        """
+        The role of the message, the discriminator of the Message union.
+        """
+        return self.__struct_config__.tag
+
+
+class DeveloperMessage(BaseMessage, tag="developer"):
+    """
+    A developer message.
+    """
+    content: str
+    name: Optional[str] = None
+
+
+class SystemMessage(BaseMessage, tag="system"):
+    """
+    A system message.
+    """
+    content: str
+    name: Optional[str] = None
+
+
+class AssistantMessage(BaseMessage, tag="assistant"):
+    """
+    An assistant message.
+    """
+    content: Optional[str] = None
+    name: Optional[str] = None
+    tool_calls: Optional[List[ToolCall]] = None
+
+
+class UserMessage(BaseMessage, tag="user"):
+    """
+    A user message.
+    """
+    content: str
+    name: Optional[str] = None
+
+
+class ToolMessage(BaseMessage, tag="tool"):
+    """
+    A tool result message.
+    """
+    content: str
+    tool_call_id: str
+
+
+Message = Union[DeveloperMessage, SystemMessage, AssistantMessage, UserMessage, ToolMessage]
+
+
+class Context(msgspec.Struct, kw_only=True, rename="camel", forbid_unknown_fields=True):
+    """
+    Additional context for the agent.
+    """
+    description: str
+    value: str
+
+
+class Tool(msgspec.Struct, kw_only=True, rename="camel", forbid_unknown_fields=True):
+    """
+    A tool definition.
+    """
+    name: str
+    description: str
+    parameters: Any  # JSON Schema for the tool parameters
+
+
+class RunAgentInput(msgspec.Struct, kw_only=True, rename="camel", forbid_unknown_fields=True):
+    """
+    Input for running an agent.
+    """
+    thread_id: str
+    run_id: str
+    state: Any
+    messages: List[Message]
+    tools: List[Tool]
+    context: List[Context]
+    forwarded_props: Any
+
+
+class BaseEvent(
+    msgspec.Struct,
+    kw_only=True,
+    rename="camel",
+    omit_defaults=True,
+    forbid_unknown_fields=True,
+    tag_field="type",
+):
+    """
+    Base event for all events in the Agent User Interaction Protocol.
+    """
+    timestamp: Optional[int] = None
+    raw_event: Any = None
+
+    @property
+    def type(self) -> EventType:
+        """
+        The type of the event, the discriminator of the Event union.
+        """
+        return EventType(self.__struct_config__.tag)
+
+
+class TextMessageStartEvent(BaseEvent, tag=EventType.TEXT_MESSAGE_START.value):
+    """
+    Event indicating the start of a text message.
+    """
+    message_id: str
+    role: Literal["assistant"]
+
+
+class TextMessageContentEvent(BaseEvent, tag=EventType.TEXT_MESSAGE_CONTENT.value):
+    """
+    Event containing a piece of text message content.
+    """
+    message_id: str
+    delta: str  # This should not be an empty string
+
+    def __post_init__(self):
+        if len(self.delta) == 0:
+            raise ValueError("Delta must not be an empty string")
+
+
+class TextMessageEndEvent(BaseEvent, tag=EventType.TEXT_MESSAGE_END.value):
+    """
+    Event indicating the end of a text message.
+    """
+    message_id: str
+
+
+class TextMessageChunkEvent(BaseEvent, tag=EventType.TEXT_MESSAGE_CHUNK.value):
+    """
+    Event containing a chunk of text message content.
+    """
+    message_id: Optional[str] = None
+    role: Optional[Literal["assistant"]] = None
+    delta: Optional[str] = None
+
+
+class ThinkingTextMessageStartEvent(BaseEvent, tag=EventType.THINKING_TEXT_MESSAGE_START.value):
+    """
+    Event indicating the start of a thinking text message.
+    """
+
+
+class ThinkingTextMessageContentEvent(
+    BaseEvent, tag=EventType.THINKING_TEXT_MESSAGE_CONTENT.value
+):
+    """
+    Event indicating a piece of a thinking text message.
+    """
+    delta: str  # This should not be an empty string
+
+    def __post_init__(self):
+        if len(self.delta) == 0:
+            raise ValueError("Delta must not be an empty string")
+
+
+class ThinkingTextMessageEndEvent(BaseEvent, tag=EventType.THINKING_TEXT_MESSAGE_END.value):
+    """
+    Event indicating the end of a thinking text message.
+    """
+
+
+class ToolCallStartEvent(BaseEvent, tag=EventType.TOOL_CALL_START.value):
+    """
+    Event indicating the start of a tool call.
+    """
+    tool_call_id: str
+    tool_call_name: str
+    parent_message_id: Optional[str] = None
+
+
+class ToolCallArgsEvent(BaseEvent, tag=EventType.TOOL_CALL_ARGS.value):
+    """
+    Event containing tool call arguments.
+    """
+    tool_call_id: str
+    delta: str
+
+
+class ToolCallEndEvent(BaseEvent, tag=EventType.TOOL_CALL_END.value):
+    """
+    Event indicating the end of a tool call.
+    """
+    tool_call_id: str
+
+
+class ToolCallChunkEvent(BaseEvent, tag=EventType.TOOL_CALL_CHUNK.value):
+    """
+    Event containing a chunk of tool call content.
+    """
+    tool_call_id: Optional[str] = None
+    tool_call_name: Optional[str] = None
+    parent_message_id: Optional[str] = None
+    delta: Optional[str] = None
+
+
+class ToolCallResultEvent(BaseEvent, tag=EventType.TOOL_CALL_RESULT.value):
+    """
+    Event containing the result of a tool call.
+    """
+    message_id: str
+    tool_call_id: str
+    content: str
+    role: Optional[Literal["tool"]] = None
+
+
+class ThinkingStartEvent(BaseEvent, tag=EventType.THINKING_START.value):
+    """
+    Event indicating the start of a thinking step event.
+    """
+    title: Optional[str] = None
+
+
+class ThinkingEndEvent(BaseEvent, tag=EventType.THINKING_END.value):
+    """
+    Event indicating the end of a thinking step event.
+    """
+
+
+class StateSnapshotEvent(BaseEvent, tag=EventType.STATE_SNAPSHOT.value):
+    """
+    Event containing a snapshot of the state.
+    """
+    snapshot: Any = None
+
+
+class StateDeltaEvent(BaseEvent, tag=EventType.STATE_DELTA.value):
+    """
+    Event containing a delta of the state.
+    """
+    delta: List[Any]  # JSON Patch (RFC 6902)
+
+
+class MessagesSnapshotEvent(BaseEvent, tag=EventType.MESSAGES_SNAPSHOT.value):
+    """
+    Event containing a snapshot of the messages.
+    """
+    messages: List[Message]
+
+
+class RawEvent(BaseEvent, tag=EventType.RAW.value):
+    """
+    Event containing a raw event.
+    """
+    event: Any = None
+    source: Optional[str] = None
+
+
+class CustomEvent(BaseEvent, tag=EventType.CUSTOM.value):
+    """
+    Event containing a custom event.
+    """
+    name: str
+    value: Any = None
+
+
+class RunStartedEvent(BaseEvent, tag=EventType.RUN_STARTED.value):
+    """
+    Event indicating that a run has started.
+    """
+    thread_id: str
+    run_id: str
+
+
+class RunFinishedEvent(BaseEvent, tag=EventType.RUN_FINISHED.value):
+    """
+    Event indicating that a run has finished.
+    """
+    thread_id: str
+    run_id: str
+    result: Any = None
+
+
+class RunErrorEvent(BaseEvent, tag=EventType.RUN_ERROR.value):
+    """
+    Event indicating that a run has encountered an error.
+    """
+    message: str
+    code: Optional[str] = None
+
+
+class StepStartedEvent(BaseEvent, tag=EventType.STEP_STARTED.value):
+    """
+    Event indicating that a step has started.
+    """
+    step_name: str
+
+
+class StepFinishedEvent(BaseEvent, tag=EventType.STEP_FINISHED.value):
+    """
+    Event indicating that a step has finished.
+    """
+    step_name: str
+
+
+Event = Union[
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageChunkEvent,
+    ThinkingTextMessageStartEvent,
+    ThinkingTextMessageContentEvent,
+    ThinkingTextMessageEndEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    ToolCallChunkEvent,
+    ToolCallResultEvent,
+    ThinkingStartEvent,
+    ThinkingEndEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+    MessagesSnapshotEvent,
+    RawEvent,
+    CustomEvent,
+    RunStartedEvent,
+    RunFinishedEvent,
+    RunErrorEvent,
+    StepStartedEvent,
+    StepFinishedEvent,
+]
+
+def _enc_hook(value: Any) -> Any:
+    if isinstance(value, RawJSON):
+        return msgspec.Raw(value.text.encode("utf-8"))
+    raise NotImplementedError(f"Objects of type {type(value).__name__} are not supported")
+
+
+_encoder = msgspec.json.Encoder(enc_hook=_enc_hook)
+_event_decoder = msgspec.json.Decoder(Event)
+_run_agent_input_decoder = msgspec.json.Decoder(RunAgentInput)
+
+
+def encode(value: Any) -> bytes:
+    """
+    Encodes an event, RunAgentInput or any other struct to JSON.
+    """
+    return _encoder.encode(value)
+
+
+def decode_event(data: Union[bytes, str]) -> Event:
+    """
+    Decodes and validates a JSON encoded event. Raises
+    msgspec.ValidationError for invalid events.
+    """
+    return _event_decoder.decode(data)
+
+
+def decode_run_agent_input(data: Union[bytes, str]) -> RunAgentInput:
+    """
+    Decodes and validates a JSON encoded RunAgentInput. Raises
+    msgspec.ValidationError for invalid input.
+    """
+    return _run_agent_input_decoder.decode(data)
@@ -2,9 +2,11 @@
 This module contains the types for the Agent User Interaction Protocol Python SDK.
 """
 
-from typing import Any, List, Literal, Optional, Union, Annotated
-from pydantic import BaseModel, Field, ConfigDict
+import json
+from typing import Any, Generic, List, Literal, Optional, TypeVar, Union, Annotated
+from pydantic import BaseModel, Field, ConfigDict, SerializerFunctionWrapHandler, field_serializer
 from pydantic.alias_generators import to_camel
+from pydantic_core import SchemaSerializer, core_schema
 
 class ConfiguredBaseModel(BaseModel):
     """
@@ -14,6 +16,7 @@ class ConfiguredBaseModel(BaseModel):
         extra="forbid",
         alias_generator=to_camel,
         populate_by_name=True,
+        defer_build=True,
     )
 
 
@@ -112,18 +115,85 @@ class Tool(ConfiguredBaseModel):
     parameters: Any  # JSON Schema for the tool parameters
 
 
-class RunAgentInput(ConfiguredBaseModel):
+# State can be any type
+State = Any
+
+# The state type of generic models; Any unless the model is parameterized
+StateT = TypeVar("StateT")
+
+
+class RunAgentInput(ConfiguredBaseModel, Generic[StateT]):
     """
-    Input for running an agent.
+    Input for running an agent. Parameterize it with a state model, e.g.
+    `RunAgentInput[MyState]`, to validate the state with that model.
     """
     thread_id: str
     run_id: str
-    state: Any
+    state: StateT
     messages: List[Message]
     tools: List[Tool]
     context: List[Context]
     forwarded_props: Any
 
-
-# State can be any type
-State = Any
+    @field_serializer("messages", mode="wrap")
+    def _serialize_messages(self, messages: Any, handler: SerializerFunctionWrapHandler) -> Any:
+        # lazily validated messages (see ag_ui.core.parsing) are validated
+        # before they are serialized
+        if not isinstance(messages, list):
+            messages = list(messages)
+        return handler(messages)
+
+
+class RawJSON:
+    """
+    An already encoded JSON value, for example a state snapshot read from a
+    cache. Use it as the value of `StateSnapshotEvent.snapshot`,
+    `CustomEvent.value` or `RawEvent.event`: the EventEncoder writes the text
+    into the frame as it is, without decoding and re-encoding it. The text is
+    not validated; pass compact JSON to get the same bytes as pydantic.
+    Text with line breaks, such as pretty-printed JSON, is made compact
+    once here, as it would break the lines of SSE and NDJSON frames.
+    Other serializers, such as `model_dump` and the protobuf encoding,
+    decode the text first.
+    """
+    __slots__ = ("text",)
+
+    def __init__(self, data: Union[str, bytes, bytearray, memoryview]):
+        text = data if isinstance(data, str) else bytes(data).decode("utf-8")
+        if "\n" in text or "\r" in text:
+            text = json.dumps(json.loads(text), ensure_ascii=False, separators=(",", ":"))
+        self.text = text
+
+    @classmethod
+    def dumps(cls, value: Any) -> "RawJSON":
+        """
+        Encodes a value to compact JSON once, to be sent many times.
+        """
+        return cls(json.dumps(value, ensure_ascii=False, separators=(",", ":")))
+
+    def loads(self) -> Any:
+        """
+        Decodes the JSON text.
+        """
+        return json.loads(self.text)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, RawJSON):
+            return self.text == other.text
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.text)
+
+    def __repr__(self) -> str:
+        text = self.text if len(self.text) <= 40 else self.text[:37] + "..."
+        return f"RawJSON({text!r})"
+
+
+# pydantic serializes values of Any fields by their __pydantic_serializer__,
+# so RawJSON needs no annotation on the fields that accept it
+RawJSON.__pydantic_serializer__ = SchemaSerializer(
+    core_schema.any_schema(
+        serialization=core_schema.plain_serializer_function_ser_schema(RawJSON.loads)
+    )
+)
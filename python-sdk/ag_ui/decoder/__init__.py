@@ -0,0 +1,21 @@
+"""
+This module contains the decoders for AG-UI event streams.
+"""
+
+from ag_ui.decoder.sse import SSEDecoder, decode_sse_stream, iter_sse_events
+from ag_ui.decoder.proto import ProtoDecoder, decode_proto_stream, iter_proto_events
+from ag_ui.decoder.ndjson import NDJSONDecoder, decode_ndjson_stream, iter_ndjson_events
+from ag_ui.decoder.partial_json import PartialJSONParser
+
+__all__ = [
+    "SSEDecoder",
+    "decode_sse_stream",
+    "iter_sse_events",
+    "ProtoDecoder",
+    "decode_proto_stream",
+    "iter_proto_events",
+    "NDJSONDecoder",
+    "decode_ndjson_stream",
+    "iter_ndjson_events",
+    "PartialJSONParser",
+]
@@ -0,0 +1,81 @@
+"""
+This module contains the incremental decoder for NDJSON AG-UI event streams
+(`application/x-ndjson`), one JSON encoded event per line.
+
+The same decoder reads `.jsonl` run transcripts, for example from
+`gzip.open(path, "rb")`.
+"""
+
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List
+
+from ag_ui.core.events import Event
+from ag_ui.core.registry import get_event_adapter
+
+
+class NDJSONDecoder:
+    """
+    Incrementally decodes newline delimited JSON into AG-UI events. Empty
+    lines are skipped.
+    """
+    def __init__(self):
+        self._buffer = bytearray()
+        # The length of the buffer that is known to contain no line end
+        self._scanned = 0
+
+    def feed(self, chunk: bytes) -> List[Event]:
+        """
+        Adds a chunk of the stream and returns the events it completed.
+        """
+        buffer = self._buffer
+        buffer += chunk
+        lines: List[bytes] = []
+        start = 0
+        end = buffer.find(b"\n", self._scanned)
+        if end >= 0:
+            with memoryview(buffer) as view:
+                while end >= 0:
+                    if end > start:
+                        line = bytes(view[start:end])
+                        if not line.isspace():
+                            lines.append(line)
+                    start = end + 1
+                    end = buffer.find(b"\n", start)
+            del buffer[:start]
+        self._scanned = len(buffer)
+        validate = get_event_adapter().validate_json
+        return [validate(line) for line in lines]
+
+    def close(self) -> List[Event]:
+        """
+        Ends the stream and returns the event on an unterminated last line,
+        if any.
+        """
+        buffer, self._buffer = self._buffer, bytearray()
+        self._scanned = 0
+        if not buffer or buffer.isspace():
+            return []
+        return [get_event_adapter().validate_json(bytes(buffer))]
+
+
+def iter_ndjson_events(chunks: Iterable[bytes]) -> Iterator[Event]:
+    """
+    Decodes an iterable of byte chunks, or the lines of a file opened in
+    binary mode, into events.
+    """
+    decoder = NDJSONDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
+
+
+async def decode_ndjson_stream(chunks: AsyncIterable[bytes]) -> AsyncIterator[Event]:
+    """
+    Decodes an async byte stream, such as `httpx.Response.aiter_bytes()` or
+    `aiohttp.StreamReader.iter_any()`, into events.
+    """
+    decoder = NDJSONDecoder()
+    async for chunk in chunks:
+        for event in decoder.feed(chunk):
+            yield event
+    for event in decoder.close():
+        yield event
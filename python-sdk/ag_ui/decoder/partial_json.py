@@ -0,0 +1,312 @@
+"""
+This module contains an incremental parser for JSON documents that arrive in
+fragments, such as the arguments of a tool call streamed as the `delta`s of
+TOOL_CALL_ARGS or TOOL_CALL_CHUNK events.
+
+The parser keeps its state between fragments, so each fragment is read once
+instead of parsing the whole buffer again for every token. It reports each
+value as soon as it is complete, with its path, and gives the best-effort
+value of the document so far:
+
+    parser = PartialJSONParser()
+    for event in events:
+        for path, value in parser.feed(event.delta):
+            ...  # e.g. (("steps", 0, "description"), "Plan the trip")
+        preview = parser.value  # e.g. {"story": "Once upon a ti"}
+    arguments = parser.close()
+"""
+
+import json
+import re
+from typing import Any, List, Optional, Tuple, Union
+
+Path = Tuple[Union[str, int], ...]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING_SPECIAL = re.compile(r'["\\]')
+_NUMBER_CHARS = re.compile(r"[-+0-9.eE]*")
+_HIGH_SURROGATE_ESCAPE = re.compile(r"\\u[dD][89abAB][0-9a-fA-F]{2}$")
+_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?")
+_LITERALS = {"t": ("true", True), "f": ("false", False), "n": ("null", None)}
+
+_MISSING = object()
+
+# Parser states: expecting a value, a value or "]" after "[", a key, a key or
+# "}" after "{", ":" after a key, "," or a closing bracket after a value, or
+# nothing after the document; inside a string, a number or a literal
+(
+    _VALUE, _FIRST_VALUE, _KEY, _FIRST_KEY, _COLON, _AFTER, _DONE,
+    _STRING, _NUMBER_STATE, _LITERAL,
+) = range(10)
+
+
+def _number(text: str) -> Union[int, float]:
+    if "." in text or "e" in text or "E" in text:
+        return float(text)
+    return int(text)
+
+
+class PartialJSONParser:
+    """
+    Incrementally parses one JSON document from text fragments. Raises
+    ValueError as soon as the text cannot be the start of a JSON document.
+    """
+
+    def __init__(self):
+        self._state = _VALUE
+        self._root: Any = None
+        # The open containers, and the key in each of the value being parsed
+        self._stack: List[Union[dict, list]] = []
+        self._path: List[Union[str, int, None]] = []
+        # The text of the string, number or literal being parsed; of a
+        # string, the part that `value` has not decoded into `_decoded` yet
+        self._parts: List[str] = []
+        self._decoded = ""
+        self._is_key = False
+        self._escape = False
+        self._literal: Optional[Tuple[str, Any]] = None
+        # Whether `value` put a partial value into the list being parsed
+        self._slot = False
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether the document is complete. A number at the top level is
+        only complete at `close()`.
+        """
+        return self._state == _DONE
+
+    @property
+    def value(self) -> Any:
+        """
+        The best-effort value of the document so far: open objects and
+        arrays with the members parsed so far, and the partial text of a
+        string. Incomplete keys, numbers that are not valid yet and literals
+        are left out. The value is updated in place as fragments are fed;
+        reading it costs the length of the string being parsed, if any.
+        """
+        partial = self._partial()
+        if partial is not _MISSING:
+            if not self._stack:
+                return partial
+            self._put(partial)
+            self._slot = True
+        return self._root
+
+    def _partial(self) -> Any:
+        state = self._state
+        if state == _STRING and not self._is_key:
+            return self._partial_string()
+        if state == _NUMBER_STATE:
+            match = _NUMBER.match("".join(self._parts))
+            if match and match.group():
+                return _number(match.group().rstrip("."))
+        return _MISSING
+
+    def _partial_string(self) -> Any:
+        """
+        Decodes the string text read since the last call, so that reading
+        the value after every fragment does not decode the string again.
+        """
+        raw = "".join(self._parts)
+        # An escape sequence at the end may not be complete yet
+        for end in range(len(raw), max(len(raw) - 6, -1), -1):
+            try:
+                decoded = json.loads('"' + raw[:end] + '"')
+            except ValueError:
+                continue
+            # The low surrogate that may follow an escaped high surrogate must
+            # be decoded with it, so the escape is decoded again next time
+            if decoded and "\ud800" <= decoded[-1] <= "\udbff" and _HIGH_SURROGATE_ESCAPE.search(raw, 0, end):
+                self._decoded += decoded[:-1]
+                self._parts = [raw[end - 6:]]
+                return self._decoded + decoded[-1]
+            self._decoded += decoded
+            self._parts = [raw[end:]]
+            return self._decoded
+        return _MISSING
+
+    def _put(self, value: Any) -> None:
+        parent = self._stack[-1]
+        if type(parent) is dict:
+            parent[self._path[-1]] = value
+        elif self._slot:
+            parent[-1] = value
+        else:
+            parent.append(value)
+
+    def _start(self, char: str) -> Optional[Union[dict, list]]:
+        """
+        Starts a value, and returns it if it is an object or an array.
+        """
+        if char == "{":
+            return {}
+        if char == "[":
+            return []
+        if char == '"':
+            self._state = _STRING
+            self._is_key = False
+            self._parts = []
+            self._decoded = ""
+        elif char == "-" or char.isdigit():
+            self._state = _NUMBER_STATE
+            self._parts = [char]
+        elif char in _LITERALS:
+            self._state = _LITERAL
+            self._literal = _LITERALS[char]
+            self._parts = [char]
+        else:
+            raise ValueError(f"Unexpected {char!r} where a JSON value was expected")
+        return None
+
+    def _finish(self, value: Any, completed: List[Tuple[Path, Any]], store: bool = True) -> None:
+        """
+        Ends a value: stores it in its container, unless it is an object or
+        array that was stored when it started, and reports it.
+        """
+        if self._stack:
+            if store:
+                self._put(value)
+            self._slot = False
+            self._state = _AFTER
+        else:
+            self._root = value
+            self._state = _DONE
+        completed.append((tuple(self._path), value))
+
+    def feed(self, text: str) -> List[Tuple[Path, Any]]:
+        """
+        Parses a fragment of the document and returns the values it
+        completed, innermost first, as (path, value) pairs. The path of the
+        document itself is ().
+        """
+        completed: List[Tuple[Path, Any]] = []
+        position = 0
+        length = len(text)
+        while position < length:
+            state = self._state
+            if state == _STRING:
+                position = self._feed_string(text, position, completed)
+                continue
+            if state == _NUMBER_STATE:
+                end = _NUMBER_CHARS.match(text, position).end()
+                self._parts.append(text[position:end])
+                position = end
+                if position < length:
+                    self._finish_number(completed)
+                continue
+            if state == _LITERAL:
+                word, literal = self._literal
+                have = len(self._parts[0])
+                take = text[position:position + len(word) - have]
+                if not word.startswith(self._parts[0] + take, 0):
+                    raise ValueError(f"Invalid literal {self._parts[0] + take!r}")
+                self._parts[0] += take
+                position += len(take)
+                if len(self._parts[0]) == len(word):
+                    self._finish(literal, completed)
+                continue
+            position = _WHITESPACE.match(text, position).end()
+            if position >= length:
+                break
+            char = text[position]
+            position += 1
+            if state == _VALUE or state == _FIRST_VALUE:
+                if char == "]" and state == _FIRST_VALUE:
+                    self._close(completed)
+                    continue
+                parent = self._stack[-1] if self._stack else None
+                if type(parent) is list:
+                    self._path[-1] = len(parent)
+                container = self._start(char)
+                if container is not None:
+                    if parent is None:
+                        self._root = container
+                    else:
+                        self._put(container)
+                    self._stack.append(container)
+                    self._path.append(None)
+                    self._state = _FIRST_KEY if char == "{" else _FIRST_VALUE
+            elif state == _KEY or state == _FIRST_KEY:
+                if char == '"':
+                    self._state = _STRING
+                    self._is_key = True
+                    self._parts = []
+                    self._decoded = ""
+                elif char == "}" and state == _FIRST_KEY:
+                    self._close(completed)
+                else:
+                    raise ValueError(f"Unexpected {char!r} where an object key was expected")
+            elif state == _COLON:
+                if char != ":":
+                    raise ValueError(f"Unexpected {char!r} where ':' was expected")
+                self._state = _VALUE
+            elif state == _AFTER:
+                is_dict = type(self._stack[-1]) is dict
+                if char == ",":
+                    self._state = _KEY if is_dict else _VALUE
+                elif char == ("}" if is_dict else "]"):
+                    self._close(completed)
+                else:
+                    raise ValueError(f"Unexpected {char!r} after a value")
+            else:
+                raise ValueError(f"Unexpected {char!r} after the end of the document")
+        return completed
+
+    def _feed_string(self, text: str, position: int, completed: List[Tuple[Path, Any]]) -> int:
+        """
+        Reads string text up to the closing quote or the end of the
+        fragment, and returns the position after it.
+        """
+        parts = self._parts
+        if self._escape:
+            # The character after a backslash at the end of the last fragment
+            parts.append(text[position])
+            position += 1
+            self._escape = False
+        while True:
+            match = _STRING_SPECIAL.search(text, position)
+            if match is None:
+                parts.append(text[position:])
+                return len(text)
+            end = match.start()
+            if text[end] == "\\":
+                parts.append(text[position:end + 2])
+                if end + 1 >= len(text):
+                    self._escape = True
+                    return len(text)
+                position = end + 2
+                continue
+            parts.append(text[position:end])
+            raw = "".join(parts)
+            self._parts = []
+            value = self._decoded + json.loads('"' + raw + '"')
+            if self._is_key:
+                self._path[-1] = value
+                self._state = _COLON
+            else:
+                self._finish(value, completed)
+            return end + 1
+
+    def _finish_number(self, completed: List[Tuple[Path, Any]]) -> None:
+        text = "".join(self._parts)
+        if not _NUMBER.fullmatch(text):
+            raise ValueError(f"Invalid number {text!r}")
+        self._finish(_number(text), completed)
+
+    def _close(self, completed: List[Tuple[Path, Any]]) -> None:
+        container = self._stack.pop()
+        self._path.pop()
+        self._finish(container, completed, store=False)
+
+    def close(self) -> Any:
+        """
+        Ends the document and returns its value. Raises ValueError if the
+        document is incomplete.
+        """
+        if self._state == _NUMBER_STATE and not self._stack:
+            self._finish_number([])
+        if self._state != _DONE:
+            raise ValueError("Incomplete JSON document")
+        return self._root
+
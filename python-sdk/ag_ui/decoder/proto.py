@@ -0,0 +1,78 @@
+"""
+This module contains the incremental decoder for protobuf AG-UI event streams
+(`application/vnd.ag-ui.event+proto`).
+
+Every frame is an `ag_ui.Event` message preceded by its length as a 4-byte
+big-endian integer. Frames can be split across chunks in any way; complete
+frames are decoded straight from the receive buffer.
+"""
+
+import struct
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List
+
+from ag_ui.core.events import BaseEvent
+from ag_ui.proto.proto import decode
+
+_unpack_length = struct.Struct(">I").unpack_from
+
+
+class ProtoDecoder:
+    """
+    Incrementally decodes length-prefixed protobuf frames into AG-UI events.
+    """
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> List[BaseEvent]:
+        """
+        Adds a chunk of the stream and returns the events it completed.
+        """
+        buffer = self._buffer
+        buffer += chunk
+        events: List[BaseEvent] = []
+        available = len(buffer)
+        pos = 0
+        try:
+            while available - pos >= 4:
+                end = pos + 4 + _unpack_length(buffer, pos)[0]
+                if end > available:
+                    break
+                start, pos = pos + 4, end
+                events.append(decode(buffer, start, end))
+        finally:
+            if pos:
+                del buffer[:pos]
+        return events
+
+    def close(self) -> List[BaseEvent]:
+        """
+        Ends the stream. Raises ValueError if it ended inside a frame.
+        """
+        if self._buffer:
+            remaining = len(self._buffer)
+            self._buffer = bytearray()
+            raise ValueError(f"Stream ended inside a frame ({remaining} bytes left)")
+        return []
+
+
+def iter_proto_events(chunks: Iterable[bytes]) -> Iterator[BaseEvent]:
+    """
+    Decodes an iterable of byte chunks into events.
+    """
+    decoder = ProtoDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
+
+
+async def decode_proto_stream(chunks: AsyncIterable[bytes]) -> AsyncIterator[BaseEvent]:
+    """
+    Decodes an async byte stream, such as `httpx.Response.aiter_bytes()` or
+    `aiohttp.StreamReader.iter_any()`, into events.
+    """
+    decoder = ProtoDecoder()
+    async for chunk in chunks:
+        for event in decoder.feed(chunk):
+            yield event
+    for event in decoder.close():
+        yield event
@@ -0,0 +1,134 @@
+"""
+This module contains the incremental SSE decoder for AG-UI event streams.
+
+The decoder accepts byte chunks of any size, for example from
+`httpx.Response.aiter_bytes()` or `aiohttp.StreamReader.iter_any()`. Lines are
+located with `bytearray.find` on the receive buffer, which is searched only
+from where the last chunk ended; only the payload of `data:` lines is copied
+out, once, through a memoryview. Payloads are validated as typed events with
+`TypeAdapter(Event).validate_json`, without decoding to str first.
+
+Example:
+
+    async with httpx.AsyncClient() as client:
+        async with client.stream("POST", url, json=payload) as response:
+            async for event in decode_sse_stream(response.aiter_bytes()):
+                ...
+"""
+
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional
+
+from ag_ui.core.events import Event
+from ag_ui.core.registry import get_event_adapter
+
+_CR = 0x0D
+_DATA = b"data:"
+_ID = b"id:"
+_COMMENT = 0x3A  # ":"
+_SPACE = 0x20
+
+
+class SSEDecoder:
+    """
+    Incrementally decodes Server-Sent Events into AG-UI events.
+
+    Lines may end with LF or CRLF. Comment lines, `event:` and `retry:`
+    fields are ignored; multiple `data:` lines of one event are joined with
+    a newline. The `id:` field of the latest event is kept in
+    `last_event_id`, to be sent as `Last-Event-ID` when reconnecting.
+    """
+    def __init__(self):
+        self._buffer = bytearray()
+        # The length of the buffer that is known to contain no line end
+        self._scanned = 0
+        self._data: List[bytes] = []
+        self.last_event_id: Optional[str] = None
+
+    def feed(self, chunk: bytes) -> List[Event]:
+        """
+        Adds a chunk of the stream and returns the events it completed.
+        """
+        buffer = self._buffer
+        buffer += chunk
+        payloads: List[bytes] = []
+        start = 0
+        end = buffer.find(b"\n", self._scanned)
+        if end >= 0:
+            with memoryview(buffer) as view:
+                while end >= 0:
+                    line_end = end - 1 if end > start and buffer[end - 1] == _CR else end
+                    if line_end == start:
+                        self._dispatch(payloads)
+                    else:
+                        self._process_line(buffer, view, start, line_end)
+                    start = end + 1
+                    end = buffer.find(b"\n", start)
+            del buffer[:start]
+        self._scanned = len(buffer)
+        validate = get_event_adapter().validate_json
+        return [validate(payload) for payload in payloads]
+
+    def close(self) -> List[Event]:
+        """
+        Ends the stream and returns the event left in the buffer, if any.
+        """
+        payloads: List[bytes] = []
+        if self._buffer:
+            buffer, self._buffer = self._buffer, bytearray()
+            self._scanned = 0
+            line_end = len(buffer) - 1 if buffer[-1] == _CR else len(buffer)
+            if line_end:
+                with memoryview(buffer) as view:
+                    self._process_line(buffer, view, 0, line_end)
+        self._dispatch(payloads)
+        validate = get_event_adapter().validate_json
+        return [validate(payload) for payload in payloads]
+
+    def _process_line(self, buffer: bytearray, view: memoryview, start: int, end: int) -> None:
+        if buffer[start] == _COMMENT:
+            return
+        if buffer.startswith(_DATA, start, end):
+            value_start = start + len(_DATA)
+            if value_start < end and buffer[value_start] == _SPACE:
+                value_start += 1
+            self._data.append(bytes(view[value_start:end]))
+        elif buffer.startswith(_ID, start, end):
+            value_start = start + len(_ID)
+            if value_start < end and buffer[value_start] == _SPACE:
+                value_start += 1
+            self.last_event_id = str(view[value_start:end], "utf-8")
+        elif end - start == 4 and buffer.startswith(b"data", start, end):
+            # a field name without a colon has an empty value
+            self._data.append(b"")
+
+    def _dispatch(self, payloads: List[bytes]) -> None:
+        data = self._data
+        if not data:
+            return
+        self._data = []
+        payload = data[0] if len(data) == 1 else b"\n".join(data)
+        if payload:
+            payloads.append(payload)
+
+
+def iter_sse_events(chunks: Iterable[bytes]) -> Iterator[Event]:
+    """
+    Decodes an iterable of byte chunks into events.
+    """
+    decoder = SSEDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
+
+
+async def decode_sse_stream(chunks: AsyncIterable[bytes]) -> AsyncIterator[Event]:
+    """
+    Decodes an async byte stream, such as `httpx.Response.aiter_bytes()` or
+    `aiohttp.StreamReader.iter_any()`, into events.
+    """
+    decoder = SSEDecoder()
+    async for chunk in chunks:
+        for event in decoder.feed(chunk):
+            yield event
+    for event in decoder.close():
+        yield event
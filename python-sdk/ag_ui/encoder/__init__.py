@@ -2,6 +2,25 @@
 This module contains the EventEncoder class.
 """
 
-from ag_ui.encoder.encoder import EventEncoder, AGUI_MEDIA_TYPE
+from ag_ui.encoder.encoder import EventEncoder, AGUI_MEDIA_TYPE, NDJSON_MEDIA_TYPE
+from ag_ui.encoder.coalesce import EventCoalescer, coalesce_events
+from ag_ui.encoder.replay import (
+    ReplayBuffer,
+    ReplayUnavailableError,
+    ResumableRun,
+    ResumableRunRegistry,
+    RunCancelledError,
+)
 
-__all__ = ["EventEncoder", "AGUI_MEDIA_TYPE"]
+__all__ = [
+    "EventEncoder",
+    "AGUI_MEDIA_TYPE",
+    "NDJSON_MEDIA_TYPE",
+    "EventCoalescer",
+    "coalesce_events",
+    "ReplayBuffer",
+    "ReplayUnavailableError",
+    "ResumableRun",
+    "ResumableRunRegistry",
+    "RunCancelledError",
+]
@@ -0,0 +1,160 @@
+"""
+This module contains the coalescing stage for streamed content deltas.
+
+LLM providers often deliver tokens of one to three characters, and sending
+each of them as a frame costs a syscall and a client render per token. The
+EventCoalescer merges adjacent deltas for the same message or tool call into
+one event and releases it after `max_latency` seconds or `max_bytes` bytes
+of delta, whichever comes first. Any other event flushes the pending delta
+first, so the order of events is kept.
+
+Example:
+
+    async def event_generator():
+        async for event in coalesce_events(agent_events(), max_latency=0.015):
+            yield encoder.encode(event)
+"""
+
+import asyncio
+import time
+from typing import AsyncIterable, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from ag_ui.core.events import BaseEvent, EventType
+
+# Mergeable event types and the fields that identify the message or tool call
+MERGEABLE_FIELDS: Dict[EventType, Tuple[str, ...]] = {
+    EventType.TEXT_MESSAGE_CONTENT: ("message_id",),
+    EventType.TEXT_MESSAGE_CHUNK: ("message_id", "role"),
+    EventType.THINKING_TEXT_MESSAGE_CONTENT: (),
+    EventType.TOOL_CALL_ARGS: ("tool_call_id",),
+    EventType.TOOL_CALL_CHUNK: ("tool_call_id", "tool_call_name", "parent_message_id"),
+}
+
+
+class EventCoalescer:
+    """
+    Merges adjacent content deltas of the same message or tool call.
+
+    `push` returns the events that are ready to be sent, `flush` releases
+    the pending delta and `poll` releases it once `max_latency` has passed.
+    """
+    def __init__(
+        self,
+        max_latency: float = 0.015,
+        max_bytes: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_latency = max_latency
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._pending: Optional[BaseEvent] = None
+        self._merged = False
+        self._deltas: List[str] = []
+        self._size = 0
+        self._since = 0.0
+
+    def push(self, event: BaseEvent) -> List[BaseEvent]:
+        """
+        Adds an event and returns the events that are ready to be sent.
+        """
+        ready: List[BaseEvent] = []
+        if self._pending is not None and self._can_merge(event):
+            self._merged = True
+            self._add_delta(event.delta)
+        else:
+            ready.extend(self.flush())
+            if event.type in MERGEABLE_FIELDS and event.raw_event is None:
+                self._pending = event
+                self._merged = False
+                self._deltas = []
+                self._size = 0
+                self._since = self._clock()
+                self._add_delta(event.delta)
+            else:
+                ready.append(event)
+        if self._pending is not None and (
+            self._size >= self.max_bytes or self._clock() - self._since >= self.max_latency
+        ):
+            ready.extend(self.flush())
+        return ready
+
+    def poll(self) -> List[BaseEvent]:
+        """
+        Releases the pending delta if it has waited for `max_latency`.
+        """
+        if self._pending is not None and self._clock() - self._since >= self.max_latency:
+            return self.flush()
+        return []
+
+    def time_until_flush(self) -> Optional[float]:
+        """
+        Returns the seconds until the pending delta must be released, or None
+        if nothing is pending.
+        """
+        if self._pending is None:
+            return None
+        return max(0.0, self.max_latency - (self._clock() - self._since))
+
+    def flush(self) -> List[BaseEvent]:
+        """
+        Releases the pending delta as a single event.
+        """
+        if self._pending is None:
+            return []
+        event = self._pending
+        if self._merged:
+            event = event.model_copy(update={"delta": "".join(self._deltas)})
+        self._pending = None
+        self._deltas = []
+        return [event]
+
+    def _add_delta(self, delta: Optional[str]) -> None:
+        if delta:
+            self._deltas.append(delta)
+            self._size += len(delta.encode("utf-8"))
+
+    def _can_merge(self, event: BaseEvent) -> bool:
+        pending = self._pending
+        if event.type != pending.type or event.raw_event is not None:
+            return False
+        # a missing identifying field continues the pending message or tool call
+        for name in MERGEABLE_FIELDS[event.type]:
+            value = getattr(event, name)
+            if value is not None and value != getattr(pending, name):
+                return False
+        return True
+
+
+async def coalesce_events(
+    events: AsyncIterable[BaseEvent],
+    max_latency: float = 0.015,
+    max_bytes: int = 4096,
+) -> AsyncIterator[BaseEvent]:
+    """
+    Coalesces the content deltas of an event stream. A pending delta is
+    released after `max_latency` seconds even if no further event arrives.
+    """
+    coalescer = EventCoalescer(max_latency=max_latency, max_bytes=max_bytes)
+    iterator = events.__aiter__()
+    next_event: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if next_event is None:
+                next_event = asyncio.ensure_future(iterator.__anext__())
+            done, _ = await asyncio.wait({next_event}, timeout=coalescer.time_until_flush())
+            if not done:
+                for event in coalescer.flush():
+                    yield event
+                continue
+            future, next_event = next_event, None
+            try:
+                event = future.result()
+            except StopAsyncIteration:
+                break
+            for ready in coalescer.push(event):
+                yield ready
+        for event in coalescer.flush():
+            yield event
+    finally:
+        if next_event is not None:
+            next_event.cancel()
@@ -0,0 +1,129 @@
+"""
+This module contains the streaming compression for encoded events.
+
+Frames are fed through one compressor per stream, so the repeated parts of
+consecutive frames (event types, ids, keys) are encoded against the shared
+history. After every frame or batch the compressor is sync-flushed: the
+client can decode everything sent so far without waiting for more data.
+
+Supported content codings are gzip and deflate (zlib), and zstd when the
+optional `zstandard` package is installed.
+"""
+
+import zlib
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+from ag_ui.encoder.media_type import PARSE_CACHE_SIZE
+
+IDENTITY = "identity"
+
+# Content codings in order of server preference. With a flush after every
+# small frame gzip compresses better than zstd (see
+# benchmarks/bench_compression.py), so zstd is only used when requested with
+# a higher quality.
+SUPPORTED_ENCODINGS: Tuple[str, ...] = (
+    ("gzip", "deflate", "zstd") if zstandard is not None else ("gzip", "deflate")
+)
+
+_ZLIB_WBITS = {"gzip": 31, "deflate": 15}
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_accept_encoding(accept_encoding: str) -> Dict[str, float]:
+    """
+    Parses an Accept-Encoding header into a mapping of coding to quality.
+    Results are cached.
+    """
+    result: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = item.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        result[coding] = q
+    return result
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def negotiate_content_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Picks the content coding for an Accept-Encoding header, or None if the
+    stream should not be compressed. The coding with the highest quality
+    wins; on equal quality the server preference order applies. Results are
+    cached per header value.
+    """
+    if not accept_encoding:
+        return None
+    accepted = parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best: Optional[str] = None
+    best_q = 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    if best is not None and accepted.get(IDENTITY, 0.0) > best_q:
+        return None
+    return best
+
+
+class StreamCompressor:
+    """
+    Incrementally compresses a stream of frames with one of the supported
+    content codings.
+    """
+    def __init__(self, encoding: str, level: Optional[int] = None):
+        if encoding not in SUPPORTED_ENCODINGS:
+            raise ValueError(f"Unsupported content encoding: {encoding}")
+        self.encoding = encoding
+        self.finished = False
+        if encoding == "zstd":
+            compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+            self._compressor = compressor.compressobj()
+            self._sync_flush = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        else:
+            self._compressor = zlib.compressobj(
+                6 if level is None else level, zlib.DEFLATED, _ZLIB_WBITS[encoding]
+            )
+            self._sync_flush = zlib.Z_SYNC_FLUSH
+
+    def compress(self, data: bytes, flush: bool = True) -> bytes:
+        """
+        Compresses data. With `flush=True` the output ends on a sync flush
+        point, so the receiver can decode all frames written so far.
+        """
+        if self.finished:
+            raise RuntimeError("Cannot compress after the stream was finished")
+        output = self._compressor.compress(data)
+        if flush:
+            output += self._compressor.flush(self._sync_flush)
+        return output
+
+    def flush(self) -> bytes:
+        """
+        Sync-flushes all data passed to `compress` so far.
+        """
+        return self._compressor.flush(self._sync_flush)
+
+    def finish(self) -> bytes:
+        """
+        Ends the compressed stream and returns the remaining output.
+        """
+        if self.finished:
+            return b""
+        self.finished = True
+        return self._compressor.flush()
@@ -2,31 +2,237 @@
 This module contains the EventEncoder class
 """
 
+from functools import lru_cache
+from typing import Iterable, Optional
+
 from ag_ui.core.events import BaseEvent
+from ag_ui.proto import AGUI_MEDIA_TYPE
+from ag_ui.proto import encode as encode_proto
+from ag_ui.encoder.serializers import get_binary_serializer, get_serializer
+from ag_ui.encoder.media_type import (
+    PARSE_CACHE_SIZE,
+    _sort_key,
+    get_media_type_priority,
+    parse_accept,
+)
+from ag_ui.encoder.compression import StreamCompressor, negotiate_content_encoding
+
+SSE_MEDIA_TYPE = "text/event-stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Media types the encoder can produce besides SSE. They are only selected
+# when the client names them explicitly in the Accept header; wildcards and
+# missing headers always get SSE.
+ALTERNATIVE_MEDIA_TYPES = (AGUI_MEDIA_TYPE, NDJSON_MEDIA_TYPE)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def negotiate_content_type(accept: Optional[str], protobuf: bool = True) -> str:
+    """
+    Picks the content type for an Accept header. The media type with the
+    highest quality wins, then the more specific match, then the one listed
+    first in the header, like `preferred_media_types`. With `protobuf=False`
+    the protobuf encoding is never picked. Results are cached per header
+    value.
+    """
+    if not accept:
+        return SSE_MEDIA_TYPE
+    accepted = parse_accept(accept)
+    provided = (SSE_MEDIA_TYPE,) + ALTERNATIVE_MEDIA_TYPES
+    best = None
+    for index, media_type in enumerate(provided):
+        if media_type == AGUI_MEDIA_TYPE and not protobuf:
+            continue
+        priority = get_media_type_priority(media_type, accepted, index)
+        if priority.q <= 0:
+            continue
+        # alternatives need type and subtype to both match explicitly
+        if index and priority.s & 6 != 6:
+            continue
+        if best is None or _sort_key(priority) < _sort_key(best):
+            best = priority
+    return SSE_MEDIA_TYPE if best is None else provided[best.i]
 
-AGUI_MEDIA_TYPE = "application/vnd.ag-ui.event+proto"
 
 class EventEncoder:
     """
-    Encodes Agent User Interaction events.
+    Encodes Agent User Interaction events, either pydantic models or the
+    compact records of `ag_ui.core.compact`.
+
+    With `event_ids=True` every encoded event gets the next id of a
+    monotonically increasing counter, written as the SSE `id:` field, so
+    that clients can resume with a `Last-Event-ID` header.
+
+    With NDJSON (`application/x-ndjson`) every event is one line of JSON;
+    the event ids are counted but not written.
+
+    The protobuf encoding is only negotiated with `binary=True`, for callers
+    that write the output of `encode_binary` or `encode_batch`: `encode`
+    returns text, so it cannot produce it.
+
+    If `accept_encoding` allows a supported content coding, the output of
+    `encode_binary` and `encode_batch` is compressed with one compressor
+    per stream that is sync-flushed after every call; see
+    `get_content_encoding`.
     """
-    def __init__(self, accept: str = None):
-        pass
+    def __init__(
+        self,
+        accept: Optional[str] = None,
+        event_ids: bool = False,
+        accept_encoding: Optional[str] = None,
+        binary: bool = False,
+    ):
+        self.content_type = negotiate_content_type(accept, binary)
+        self.event_ids = event_ids
+        self.last_event_id = 0
+        self.content_encoding = negotiate_content_encoding(accept_encoding)
+        self._compressor = (
+            StreamCompressor(self.content_encoding) if self.content_encoding else None
+        )
+
+    @property
+    def accepts_protobuf(self) -> bool:
+        """
+        Whether the negotiated content type is the protobuf encoding.
+        """
+        return self.content_type == AGUI_MEDIA_TYPE
+
+    @property
+    def accepts_ndjson(self) -> bool:
+        """
+        Whether the negotiated content type is NDJSON.
+        """
+        return self.content_type == NDJSON_MEDIA_TYPE
 
     def get_content_type(self) -> str:
         """
         Returns the content type of the encoder.
         """
-        return "text/event-stream"
+        return self.content_type
+
+    def get_content_encoding(self) -> Optional[str]:
+        """
+        Returns the value for the Content-Encoding header, or None if the
+        output of `encode_binary` is not compressed.
+        """
+        return self.content_encoding
 
     def encode(self, event: BaseEvent) -> str:
         """
-        Encodes an event.
+        Encodes an event as a line of JSON if NDJSON was negotiated,
+        otherwise as SSE. Raises ValueError if protobuf was negotiated; use
+        `encode_binary` for it.
         """
+        if self.accepts_protobuf:
+            raise ValueError("The protobuf encoding is binary; use encode_binary")
+        if self.accepts_ndjson:
+            return self._encode_ndjson(event)
         return self._encode_sse(event)
 
+    def encode_binary(self, event: BaseEvent) -> bytes:
+        """
+        Encodes an event using the negotiated content type: length-prefixed
+        protobuf or NDJSON if the client accepts it, otherwise UTF-8 encoded
+        SSE. The frame is compressed if a content encoding was negotiated.
+        """
+        frame = self._encode_frame(event)
+        if self._compressor is not None:
+            return self._compressor.compress(frame)
+        return frame
+
+    def encode_batch(self, events: Iterable[BaseEvent]) -> bytes:
+        """
+        Encodes several events like `encode_binary`, flushing the compressor
+        only once after the last frame.
+        """
+        frames = b"".join([self._encode_frame(event) for event in events])
+        if self._compressor is not None:
+            return self._compressor.compress(frames)
+        return frames
+
+    def finish(self) -> bytes:
+        """
+        Returns the bytes that end the compressed stream. Returns an empty
+        byte string if the output is not compressed.
+        """
+        if self._compressor is not None:
+            return self._compressor.finish()
+        return b""
+
+    def _encode_frame(self, event: BaseEvent) -> bytes:
+        """
+        Encodes an event into an uncompressed frame of the negotiated content type.
+        """
+        if self.accepts_protobuf:
+            return self._encode_protobuf(event)
+        if self.accepts_ndjson:
+            return self._encode_ndjson_bytes(event)
+        return self._encode_sse_bytes(event)
+
     def _encode_sse(self, event: BaseEvent) -> str:
         """
         Encodes an event into an SSE string.
         """
-        return f"data: {event.model_dump_json(by_alias=True, exclude_none=True)}\n\n"
+        return f"{self._sse_prefix()}{self._encode_json(event)}\n\n"
+
+    def _encode_sse_bytes(self, event: BaseEvent) -> bytes:
+        """
+        Encodes an event into SSE bytes, written from JSON bytes without a
+        str round-trip.
+        """
+        return b"".join((self._sse_prefix().encode("utf-8"), self._encode_json_bytes(event), b"\n\n"))
+
+    def _encode_ndjson(self, event: BaseEvent) -> str:
+        """
+        Encodes an event into a line of JSON.
+        """
+        if self.event_ids:
+            self.last_event_id += 1
+        return f"{self._encode_json(event)}\n"
+
+    def _encode_ndjson_bytes(self, event: BaseEvent) -> bytes:
+        """
+        Encodes an event into a UTF-8 encoded line of JSON.
+        """
+        if self.event_ids:
+            self.last_event_id += 1
+        return self._encode_json_bytes(event) + b"\n"
+
+    def _encode_json(self, event: BaseEvent) -> str:
+        """
+        Encodes an event into a JSON string.
+        """
+        serializer = get_serializer(type(event))
+        if serializer is not None:
+            return serializer(event)
+        return event.model_dump_json(by_alias=True, exclude_none=True)
+
+    def _encode_json_bytes(self, event: BaseEvent) -> bytes:
+        """
+        Encodes an event into UTF-8 encoded JSON. Events without a fast
+        serializer are written from the JSON bytes produced by pydantic-core.
+        """
+        serializer = get_binary_serializer(type(event))
+        if serializer is not None:
+            return serializer(event)
+        return event.__pydantic_serializer__.to_json(event, by_alias=True, exclude_none=True)
+
+    def _encode_protobuf(self, event: BaseEvent) -> bytes:
+        """
+        Encodes an event into a protobuf message prefixed with its length
+        as a big-endian uint32.
+        """
+        if self.event_ids:
+            self.last_event_id += 1
+        message = encode_proto(event)
+        return len(message).to_bytes(4, "big") + message
+
+    def _sse_prefix(self) -> str:
+        """
+        Returns the start of an SSE frame, including the next event id if
+        event ids are enabled.
+        """
+        if not self.event_ids:
+            return "data: "
+        self.last_event_id += 1
+        return f"id: {self.last_event_id}\ndata: "
@@ -0,0 +1,188 @@
+"""
+This module contains the Accept header negotiation for the EventEncoder.
+
+Ported from `typescript-sdk/packages/encoder/src/media-type.ts`, which is
+modified from https://github.com/jshttp/negotiator/blob/master/lib/mediaType.js
+(negotiator, Copyright(c) 2012 Isaac Z. Schlueter, Copyright(c) 2014 Federico
+Romero, Copyright(c) 2014-2015 Douglas Christopher Wilson, MIT Licensed).
+
+Parsed Accept headers are kept in an LRU cache, since clients send the same
+few headers over and over.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+PARSE_CACHE_SIZE = 256
+
+_SIMPLE_MEDIA_TYPE = re.compile(r"^\s*([^\s/;]+)/([^;\s]+)\s*(?:;(.*))?$", re.DOTALL)
+_LEADING_FLOAT = re.compile(r"\s*([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)")
+
+
+class MediaType(NamedTuple):
+    """
+    A media range parsed from an Accept header.
+    """
+    type: str
+    subtype: str
+    params: Tuple[Tuple[str, str], ...]
+    q: float
+    i: int
+
+
+class Priority(NamedTuple):
+    """
+    How well a provided media type matches an Accept header.
+
+    `q` is the quality, `s` the specificity (4: type, 2: subtype,
+    1: parameters), `o` the index of the matching media range in the
+    Accept header and `i` the index of the provided type.
+    """
+    o: int
+    q: float
+    s: int
+    i: int
+
+
+def _parse_float(value: str) -> float:
+    # like JavaScript's parseFloat, invalid values are never acceptable
+    match = _LEADING_FLOAT.match(value)
+    return float(match.group(1)) if match else 0.0
+
+
+def _split_quoted(value: str, separator: str) -> List[str]:
+    parts = value.split(separator)
+    result = [parts[0]]
+    for part in parts[1:]:
+        if result[-1].count('"') % 2 == 0:
+            result.append(part)
+        else:
+            result[-1] += separator + part
+    return result
+
+
+def _parse_media_type(value: str, index: int) -> Optional[MediaType]:
+    match = _SIMPLE_MEDIA_TYPE.match(value)
+    if not match:
+        return None
+
+    params: Dict[str, str] = {}
+    q = 1.0
+    if match.group(3):
+        for parameter in _split_quoted(match.group(3), ";"):
+            key, _, val = parameter.strip().partition("=")
+            key = key.lower()
+            # unwrap quoted values
+            if len(val) >= 2 and val[0] == '"' and val[-1] == '"':
+                val = val[1:-1]
+            if key == "q":
+                q = _parse_float(val)
+                break
+            params[key] = val
+
+    return MediaType(
+        type=match.group(1),
+        subtype=match.group(2),
+        params=tuple(params.items()),
+        q=q,
+        i=index,
+    )
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_accept(accept: str) -> Tuple[MediaType, ...]:
+    """
+    Parses an Accept header into its media ranges. Results are cached.
+    """
+    result = []
+    for index, value in enumerate(_split_quoted(accept, ",")):
+        media_type = _parse_media_type(value.strip(), index)
+        if media_type:
+            result.append(media_type)
+    return tuple(result)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_provided(media_type: str) -> Optional[MediaType]:
+    return _parse_media_type(media_type, 0)
+
+
+def _specify(media_type: str, spec: MediaType, index: int) -> Optional[Priority]:
+    provided = _parse_provided(media_type)
+    if not provided:
+        return None
+
+    s = 0
+    if spec.type.lower() == provided.type.lower():
+        s |= 4
+    elif spec.type != "*":
+        return None
+
+    if spec.subtype.lower() == provided.subtype.lower():
+        s |= 2
+    elif spec.subtype != "*":
+        return None
+
+    if spec.params:
+        provided_params = dict(provided.params)
+        if all(
+            value == "*" or value.lower() == provided_params.get(key, "").lower()
+            for key, value in spec.params
+        ):
+            s |= 1
+        else:
+            return None
+
+    return Priority(o=spec.i, q=spec.q, s=s, i=index)
+
+
+def get_media_type_priority(media_type: str, accepted: Sequence[MediaType], index: int = 0) -> Priority:
+    """
+    Returns the priority of a provided media type for the parsed Accept header.
+    """
+    priority = Priority(o=-1, q=0.0, s=0, i=index)
+    for spec in accepted:
+        candidate = _specify(media_type, spec, index)
+        if candidate and (
+            priority.s - candidate.s or priority.q - candidate.q or priority.o - candidate.o
+        ) < 0:
+            priority = candidate
+    return priority
+
+
+def _sort_key(priority: Priority) -> Tuple[float, int, int, int]:
+    return (-priority.q, -priority.s, priority.o, priority.i)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _preferred_media_types(accept: Optional[str], provided: Optional[Tuple[str, ...]]) -> Tuple[str, ...]:
+    # RFC 2616 sec 14.2: no header = */*
+    accepts = parse_accept("*/*" if accept is None else accept)
+
+    if provided is None:
+        # sorted list of all types
+        specs = sorted(
+            (spec for spec in accepts if spec.q > 0),
+            key=lambda spec: (-spec.q, -spec.i),
+        )
+        return tuple(f"{spec.type}/{spec.subtype}" for spec in specs)
+
+    priorities = [
+        get_media_type_priority(media_type, accepts, index)
+        for index, media_type in enumerate(provided)
+    ]
+    # sorted list of accepted types
+    return tuple(
+        provided[priority.i]
+        for priority in sorted((p for p in priorities if p.q > 0), key=_sort_key)
+    )
+
+
+def preferred_media_types(accept: Optional[str] = None, provided: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    Returns the provided media types acceptable to the Accept header, most
+    preferred first. Without `provided`, returns all acceptable media types
+    listed in the header.
+    """
+    return list(_preferred_media_types(accept, None if provided is None else tuple(provided)))
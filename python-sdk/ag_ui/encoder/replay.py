@@ -0,0 +1,289 @@
+"""
+This module contains the replay buffer for resumable event streams.
+
+A ResumableRun consumes the events of a run in a background task and keeps
+the encoded frames in a bounded ReplayBuffer. Every frame carries an SSE
+`id:` field, so a client whose connection drops can reconnect with a
+`Last-Event-ID` header, receive only the frames it missed and then follow the
+live tail, instead of starting the run again.
+
+Example:
+
+    runs = ResumableRunRegistry()
+
+    @app.post("/agent")
+    async def agent_endpoint(input_data: RunAgentInput, request: Request):
+        run = runs.get(input_data.run_id)
+        if run is None:
+            run = runs.start(
+                input_data.run_id,
+                run_agent(input_data),
+                accept=request.headers.get("accept"),
+            )
+        return StreamingResponse(
+            run.stream(request.headers.get("last-event-id")),
+            media_type=run.get_content_type()
+        )
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import AsyncIterable, AsyncIterator, Deque, List, Optional, Union
+
+from ag_ui.core.events import BaseEvent
+from ag_ui.encoder.encoder import EventEncoder
+
+
+class ReplayUnavailableError(LookupError):
+    """
+    Raised when frames requested for replay were already evicted from the
+    buffer. The client has to start the run again.
+    """
+
+
+class RunCancelledError(RuntimeError):
+    """
+    Raised to the subscribers of a run that was cancelled before it
+    finished, e.g. because the registry made room for newer runs.
+    """
+
+
+def parse_last_event_id(value: Union[str, int, None]) -> Optional[int]:
+    """
+    Parses a `Last-Event-ID` header value. Returns None for missing or
+    malformed values.
+    """
+    if value is None or isinstance(value, int):
+        return value
+    try:
+        return int(value.strip())
+    except ValueError:
+        return None
+
+
+class ReplayBuffer:
+    """
+    Bounded buffer of the most recent encoded frames of a run, keyed by
+    contiguous event ids.
+    """
+    def __init__(self, max_events: int = 1024):
+        if max_events < 1:
+            raise ValueError("max_events must be at least 1")
+        self._frames: Deque[bytes] = deque(maxlen=max_events)
+        self._first_event_id = 1
+        self._waiters: List[asyncio.Future] = []
+        self.closed = False
+        self.error: Optional[BaseException] = None
+
+    @property
+    def last_event_id(self) -> int:
+        """
+        Returns the id of the most recent frame, or 0 if there is none.
+        """
+        return self._first_event_id + len(self._frames) - 1
+
+    def append(self, event_id: int, frame: bytes) -> None:
+        """
+        Appends the frame with the next event id, evicting the oldest frame
+        if the buffer is full.
+        """
+        if self.closed:
+            raise RuntimeError("Cannot append to a closed replay buffer")
+        if event_id != self.last_event_id + 1:
+            raise ValueError(f"Expected event id {self.last_event_id + 1}, got {event_id}")
+        if len(self._frames) == self._frames.maxlen:
+            self._first_event_id += 1
+        self._frames.append(frame)
+        self._wake()
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        """
+        Marks the run as finished. Subscribers stop after the last frame and
+        re-raise `error` if one is given.
+        """
+        self.closed = True
+        self.error = error
+        self._wake()
+
+    def frames_after(self, last_event_id: int) -> List[bytes]:
+        """
+        Returns the frames with ids greater than `last_event_id`.
+        """
+        self.check_available(last_event_id)
+        return list(islice(self._frames, last_event_id + 1 - self._first_event_id, None))
+
+    def check_available(self, last_event_id: int) -> None:
+        """
+        Raises ReplayUnavailableError if frames after `last_event_id` were
+        already evicted.
+        """
+        if last_event_id + 1 < self._first_event_id:
+            raise ReplayUnavailableError(
+                f"Events after id {last_event_id} are no longer available"
+            )
+
+    async def subscribe(self, last_event_id: Optional[int] = None) -> AsyncIterator[bytes]:
+        """
+        Yields the frames after `last_event_id` (all frames if None), then
+        follows new frames until the buffer is closed.
+        """
+        next_event_id = (last_event_id or 0) + 1
+        while True:
+            frames = self.frames_after(next_event_id - 1)
+            next_event_id += len(frames)
+            for frame in frames:
+                yield frame
+            if next_event_id <= self.last_event_id:
+                continue
+            if self.closed:
+                if self.error is not None:
+                    raise self.error
+                return
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+
+    def _wake(self) -> None:
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+class ResumableRun:
+    """
+    Encodes the events of a run into a replay buffer in the background, so
+    that clients can attach, detach and reattach while the run continues.
+    """
+    def __init__(
+        self,
+        events: AsyncIterable[BaseEvent],
+        accept: Optional[str] = None,
+        max_events: int = 1024,
+    ):
+        self.encoder = EventEncoder(accept=accept, event_ids=True, binary=True)
+        self.buffer = ReplayBuffer(max_events=max_events)
+        self.finished_at: Optional[float] = None
+        self._events = events
+        self._task: Optional[asyncio.Task] = None
+
+    def get_content_type(self) -> str:
+        """
+        Returns the content type of the encoded frames.
+        """
+        return self.encoder.get_content_type()
+
+    def start(self) -> None:
+        """
+        Starts consuming the events. Must be called from a running event loop.
+        """
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether all events of the run have been consumed.
+        """
+        return self.buffer.closed
+
+    def stream(self, last_event_id: Union[str, int, None] = None) -> AsyncIterator[bytes]:
+        """
+        Returns the frames after `last_event_id` (usually the `Last-Event-ID`
+        header) followed by the live tail of the run. Raises
+        ReplayUnavailableError right away if the missed frames were evicted.
+        """
+        last_event_id = parse_last_event_id(last_event_id)
+        self.buffer.check_available(last_event_id or 0)
+        self.start()
+        return self.buffer.subscribe(last_event_id)
+
+    def cancel(self) -> None:
+        """
+        Stops consuming the events of the run. Subscribers get the frames
+        so far and then RunCancelledError.
+        """
+        if self._task is not None:
+            self._task.cancel()
+        # a task cancelled before it started never runs its cleanup
+        self._close(RunCancelledError("The run was cancelled"))
+
+    def _close(self, error: Optional[BaseException]) -> None:
+        if not self.buffer.closed:
+            self.finished_at = time.monotonic()
+            self.buffer.close(error)
+
+    async def _run(self) -> None:
+        error: Optional[BaseException] = None
+        try:
+            async for event in self._events:
+                frame = self.encoder.encode_binary(event)
+                self.buffer.append(self.encoder.last_event_id, frame)
+        except asyncio.CancelledError:
+            error = RunCancelledError("The run was cancelled")
+            raise
+        except Exception as exc:  # pylint: disable=broad-except
+            error = exc
+        finally:
+            self._close(error)
+
+
+class ResumableRunRegistry:
+    """
+    Keeps the resumable runs of a server by run id. Finished runs are kept
+    for `retention` seconds; at most `max_runs` runs are kept in total. To
+    make room, the oldest finished run is dropped first, and the oldest live
+    run is cancelled only if all runs are live.
+    """
+    def __init__(self, max_runs: int = 1024, retention: float = 60.0, max_events: int = 1024):
+        self.max_runs = max_runs
+        self.retention = retention
+        self.max_events = max_events
+        self._runs: "OrderedDict[str, ResumableRun]" = OrderedDict()
+
+    def get(self, run_id: str) -> Optional[ResumableRun]:
+        """
+        Returns the run with the given id, if it is still available.
+        """
+        self._evict()
+        return self._runs.get(run_id)
+
+    def start(
+        self,
+        run_id: str,
+        events: AsyncIterable[BaseEvent],
+        accept: Optional[str] = None,
+    ) -> ResumableRun:
+        """
+        Starts a resumable run. Must be called from a running event loop.
+        A live run with the same id is cancelled.
+        """
+        self._evict()
+        previous = self._runs.pop(run_id, None)
+        if previous is not None:
+            previous.cancel()
+        while self._runs and len(self._runs) >= self.max_runs:
+            self._drop_oldest()
+        run = ResumableRun(events, accept=accept, max_events=self.max_events)
+        self._runs[run_id] = run
+        run.start()
+        return run
+
+    def _drop_oldest(self) -> None:
+        for run_id, run in self._runs.items():
+            if run.finished_at is not None:
+                del self._runs[run_id]
+                return
+        _, run = self._runs.popitem(last=False)
+        run.cancel()
+
+    def _evict(self) -> None:
+        deadline = time.monotonic() - self.retention
+        expired = [
+            run_id for run_id, run in self._runs.items()
+            if run.finished_at is not None and run.finished_at < deadline
+        ]
+        for run_id in expired:
+            del self._runs[run_id]
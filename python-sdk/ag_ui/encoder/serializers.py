@@ -0,0 +1,297 @@
+"""
+This module contains the fast JSON serializers for AG-UI events.
+
+For every event class a serializer is compiled once from the model fields:
+keys are pre-rendered in their camelCase wire form, and only the field values
+are escaped at encode time. Values that are not plain strings, ints or event
+types are delegated to a pydantic TypeAdapter for the field, so the output is
+byte-identical to `model_dump_json(by_alias=True, exclude_none=True)`.
+Field values wrapped in `RawJSON` are spliced into the output as they are.
+
+The binary serializers write the same JSON as UTF-8 bytes for the encoder's
+byte output. They take the bytes of the delegated values from pydantic-core
+as they are, so large values such as state snapshots are not turned into a
+str and encoded again.
+
+The compact records in `ag_ui.core.compact` are serialized the same way as
+their model classes. The msgspec structs in `ag_ui.core.structs` are
+serialized by msgspec.
+"""
+
+import inspect
+import threading
+from enum import Enum
+from json.encoder import encode_basestring
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, List, Literal, Optional, Type, Union, get_args, get_origin
+
+from pydantic import TypeAdapter
+
+from ag_ui.core import compact, events
+from ag_ui.core.events import BaseEvent, EventType
+from ag_ui.core.types import RawJSON
+
+Serializer = Callable[[Union[BaseEvent, compact.BaseEvent]], str]
+BinarySerializer = Callable[[Union[BaseEvent, compact.BaseEvent]], bytes]
+
+# Field kinds
+_STR = "str"
+_INT = "int"
+_ENUM = "enum"
+_JSON = "json"
+
+_ENUM_JSON: Dict[EventType, str] = {
+    event_type: encode_basestring(event_type.value) for event_type in EventType
+}
+
+_STRUCTS_MODULE = "ag_ui.core.structs"
+
+_serializers: Dict[type, Optional[Serializer]] = {}
+_binary_serializers: Dict[type, Optional[BinarySerializer]] = {}
+_lock = threading.Lock()
+
+
+def _strip_optional(annotation: Any) -> Any:
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _field_kind(annotation: Any) -> str:
+    annotation = _strip_optional(annotation)
+    if annotation is str:
+        return _STR
+    if annotation is int:
+        return _INT
+    if annotation is EventType:
+        return _ENUM
+    if get_origin(annotation) is Literal:
+        args = get_args(annotation)
+        if all(isinstance(arg, EventType) for arg in args):
+            return _ENUM
+        if all(isinstance(arg, str) and not isinstance(arg, Enum) for arg in args):
+            return _STR
+    return _JSON
+
+
+class _FieldAdapter:
+    """
+    Lazily built TypeAdapter used for values the fast path does not handle.
+    """
+    __slots__ = ("annotation", "_dump")
+
+    def __init__(self, annotation: Any):
+        self.annotation = annotation
+        self._dump = None
+
+    def __call__(self, value: Any) -> str:
+        return self.to_json(value).decode("utf-8")
+
+    def to_json(self, value: Any) -> bytes:
+        """
+        Returns the JSON bytes of a value.
+        """
+        if self._dump is None:
+            self._dump = TypeAdapter(self.annotation).serializer.to_json
+        return self._dump(value, by_alias=True, exclude_none=True)
+
+
+def _compile_plan(cls: Union[Type[BaseEvent], Type[compact.BaseEvent]]) -> tuple:
+    """
+    Returns the fields of an event class or compact record class as
+    (key, kind, adapter) in order, a function that reads their values and
+    whether the class is a record, whose values are read from the record
+    rather than from the `__dict__` of the model.
+    """
+    is_record = issubclass(cls, compact.BaseEvent)
+    model_fields = (cls.model_class if is_record else cls).model_fields
+    plan = []
+    for name, field in model_fields.items():
+        key = encode_basestring(field.serialization_alias or field.alias or name) + ":"
+        plan.append((key, _field_kind(field.annotation), _FieldAdapter(field.annotation)))
+    plan = tuple(plan)
+    names = tuple(model_fields)
+    # reads the field values in plan order; records keep them in slots
+    read = (attrgetter if is_record else itemgetter)(*names)
+    if len(names) == 1:
+        read_one = read
+        read = lambda source: (read_one(source),)  # pylint: disable=unnecessary-lambda-assignment
+    return plan, read, is_record
+
+
+def compile_serializer(cls: Union[Type[BaseEvent], Type[compact.BaseEvent]]) -> Serializer:
+    """
+    Compiles a serializer for an event class or compact record class.
+    """
+    plan, read, is_record = _compile_plan(cls)
+    escape = encode_basestring
+    enum_json = _ENUM_JSON
+
+    def serialize(event: Union[BaseEvent, compact.BaseEvent]) -> str:
+        values = read(event) if is_record else read(event.__dict__)
+        items: List[str] = []
+        for (key, kind, adapter), value in zip(plan, values):
+            if value is None:
+                continue
+            value_type = type(value)
+            if kind is _STR and value_type is str:
+                items.append(key + escape(value))
+            elif kind is _ENUM and value_type is EventType:
+                items.append(key + enum_json[value])
+            elif kind is _INT and value_type is int:
+                items.append(key + str(value))
+            elif value_type is RawJSON:
+                items.append(key + value.text)
+            else:
+                items.append(key + adapter(value))
+        return "{" + ",".join(items) + "}"
+
+    serialize.__qualname__ = f"serialize_{cls.__name__}"
+    return serialize
+
+
+def compile_binary_serializer(
+    cls: Union[Type[BaseEvent], Type[compact.BaseEvent]]
+) -> BinarySerializer:
+    """
+    Compiles a serializer for an event class or compact record class that
+    returns UTF-8 encoded JSON.
+    """
+    plan, read, is_record = _compile_plan(cls)
+    if all(kind is not _JSON for _, kind, _ in plan):
+        # the text of events without JSON values is encoded once
+        serialize_text = compile_serializer(cls)
+
+        def serialize_simple(event: Union[BaseEvent, compact.BaseEvent]) -> bytes:
+            return serialize_text(event).encode("utf-8")
+
+        serialize_simple.__qualname__ = f"serialize_binary_{cls.__name__}"
+        return serialize_simple
+
+    escape = encode_basestring
+    enum_json = _ENUM_JSON
+
+    def serialize(event: Union[BaseEvent, compact.BaseEvent]) -> bytes:
+        chunks: List[bytes] = []
+        # the text written since the last chunk of bytes from pydantic-core
+        text = "{"
+        separator = ""
+        values = read(event) if is_record else read(event.__dict__)
+        for (key, kind, adapter), value in zip(plan, values):
+            if value is None:
+                continue
+            value_type = type(value)
+            if kind is _STR and value_type is str:
+                text += separator + key + escape(value)
+            elif kind is _ENUM and value_type is EventType:
+                text += separator + key + enum_json[value]
+            elif kind is _INT and value_type is int:
+                text += separator + key + str(value)
+            elif value_type is RawJSON:
+                text += separator + key + value.text
+            else:
+                chunks.append((text + separator + key).encode("utf-8"))
+                chunks.append(adapter.to_json(value))
+                text = ""
+            separator = ","
+        chunks.append((text + "}").encode("utf-8"))
+        return b"".join(chunks)
+
+    serialize.__qualname__ = f"serialize_binary_{cls.__name__}"
+    return serialize
+
+
+def compile_struct_serializer(cls: type) -> Serializer:
+    """
+    Returns a serializer for a struct class from `ag_ui.core.structs`.
+    """
+    # structs is only imported here, once one of its classes is in use,
+    # so msgspec stays optional
+    from ag_ui.core import structs  # pylint: disable=import-outside-toplevel
+
+    encode = structs.encode
+
+    def serialize(event: Any) -> str:
+        return encode(event).decode("utf-8")
+
+    serialize.__qualname__ = f"serialize_{cls.__name__}"
+    return serialize
+
+
+def compile_struct_binary_serializer(cls: type) -> BinarySerializer:
+    """
+    Returns a serializer for a struct class from `ag_ui.core.structs` that
+    returns UTF-8 encoded JSON.
+    """
+    from ag_ui.core import structs  # pylint: disable=import-outside-toplevel
+
+    encode = structs.encode
+
+    def serialize(event: Any) -> bytes:
+        return encode(event)
+
+    serialize.__qualname__ = f"serialize_binary_{cls.__name__}"
+    return serialize
+
+
+def _is_registered_event(cls: type) -> bool:
+    return cls.__module__ in (events.__name__, compact.__name__)
+
+
+def _compile(cls: type) -> Optional[Serializer]:
+    if _is_registered_event(cls):
+        return compile_serializer(cls)
+    if cls.__module__ == _STRUCTS_MODULE:
+        return compile_struct_serializer(cls)
+    return None
+
+
+def _compile_binary(cls: type) -> Optional[BinarySerializer]:
+    if _is_registered_event(cls):
+        return compile_binary_serializer(cls)
+    if cls.__module__ == _STRUCTS_MODULE:
+        return compile_struct_binary_serializer(cls)
+    return None
+
+
+def get_serializer(cls: type) -> Optional[Serializer]:
+    """
+    Returns the fast serializer for an event class, or None if the class is
+    not one of the event classes in `ag_ui.core.events`, record classes in
+    `ag_ui.core.compact` or struct classes in `ag_ui.core.structs`.
+    """
+    try:
+        return _serializers[cls]
+    except KeyError:
+        pass
+    with _lock:
+        if cls not in _serializers:
+            _serializers[cls] = _compile(cls)
+        return _serializers[cls]
+
+
+def get_binary_serializer(cls: type) -> Optional[BinarySerializer]:
+    """
+    Returns the binary serializer for the classes that `get_serializer`
+    has a serializer for, or None.
+    """
+    try:
+        return _binary_serializers[cls]
+    except KeyError:
+        pass
+    with _lock:
+        if cls not in _binary_serializers:
+            _binary_serializers[cls] = _compile_binary(cls)
+        return _binary_serializers[cls]
+
+
+def event_classes() -> List[Type[BaseEvent]]:
+    """
+    Returns the event classes that have fast serializers.
+    """
+    return [
+        cls for _, cls in inspect.getmembers(events, inspect.isclass)
+        if issubclass(cls, BaseEvent) and cls.__module__ == events.__name__
+    ]
@@ -0,0 +1,7 @@
+"""
+This module contains the protocol buffer encoding for AG-UI events.
+"""
+
+from ag_ui.proto.proto import encode, decode, AGUI_MEDIA_TYPE
+
+__all__ = ["encode", "decode", "AGUI_MEDIA_TYPE"]
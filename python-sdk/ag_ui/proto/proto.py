@@ -0,0 +1,600 @@
+"""
+This module contains the protocol buffer encoding and decoding for AG-UI
+events.
+
+The wire format matches the schemas in
+`typescript-sdk/packages/proto/src/proto` (events.proto, types.proto and
+patch.proto). Messages are read and written directly in the protobuf wire
+format so that no generated code or protobuf runtime is required.
+"""
+
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+from pydantic_core import to_jsonable_python
+
+from ag_ui.core.events import BaseEvent, EventType
+from ag_ui.core.registry import EVENT_CLASSES, EVENT_WIRE_CODES
+
+AGUI_MEDIA_TYPE = "application/vnd.ag-ui.event+proto"
+
+# Wire types
+_VARINT = 0
+_FIXED64 = 1
+_LEN = 2
+
+# Field kinds used in the event specs below
+_STRING = "string"
+_OPTIONAL_STRING = "optional_string"
+_VALUE = "value"
+_MESSAGES = "messages"
+_PATCH = "patch"
+
+# ag_ui.EventType values from events.proto, which declares the wire codes
+# 0 to 15 of the event registry
+PROTO_EVENT_TYPES: Dict[EventType, int] = {
+    event_type: code for event_type, code in EVENT_WIRE_CODES.items() if code <= 15
+}
+
+# ag_ui.JsonPatchOperationType values from patch.proto
+PROTO_PATCH_OPERATIONS: Dict[str, int] = {
+    "add": 0,
+    "remove": 1,
+    "replace": 2,
+    "move": 3,
+    "copy": 4,
+    "test": 5,
+}
+
+# For every event type: the field number in the `Event` oneof and the
+# (field number, attribute name, kind) of the fields after `base_event`.
+EVENT_SPECS: Dict[EventType, Tuple[int, Tuple[Tuple[int, str, str], ...]]] = {
+    EventType.TEXT_MESSAGE_START: (1, (
+        (2, "message_id", _STRING),
+        (3, "role", _OPTIONAL_STRING),
+    )),
+    EventType.TEXT_MESSAGE_CONTENT: (2, (
+        (2, "message_id", _STRING),
+        (3, "delta", _STRING),
+    )),
+    EventType.TEXT_MESSAGE_END: (3, (
+        (2, "message_id", _STRING),
+    )),
+    EventType.TOOL_CALL_START: (4, (
+        (2, "tool_call_id", _STRING),
+        (3, "tool_call_name", _STRING),
+        (4, "parent_message_id", _OPTIONAL_STRING),
+    )),
+    EventType.TOOL_CALL_ARGS: (5, (
+        (2, "tool_call_id", _STRING),
+        (3, "delta", _STRING),
+    )),
+    EventType.TOOL_CALL_END: (6, (
+        (2, "tool_call_id", _STRING),
+    )),
+    EventType.STATE_SNAPSHOT: (7, (
+        (2, "snapshot", _VALUE),
+    )),
+    EventType.STATE_DELTA: (8, (
+        (2, "delta", _PATCH),
+    )),
+    EventType.MESSAGES_SNAPSHOT: (9, (
+        (2, "messages", _MESSAGES),
+    )),
+    EventType.RAW: (10, (
+        (2, "event", _VALUE),
+        (3, "source", _OPTIONAL_STRING),
+    )),
+    EventType.CUSTOM: (11, (
+        (2, "name", _STRING),
+        (3, "value", _VALUE),
+    )),
+    EventType.RUN_STARTED: (12, (
+        (2, "thread_id", _STRING),
+        (3, "run_id", _STRING),
+    )),
+    EventType.RUN_FINISHED: (13, (
+        (2, "thread_id", _STRING),
+        (3, "run_id", _STRING),
+        (4, "result", _VALUE),
+    )),
+    EventType.RUN_ERROR: (14, (
+        (2, "code", _OPTIONAL_STRING),
+        (3, "message", _STRING),
+    )),
+    EventType.STEP_STARTED: (15, (
+        (2, "step_name", _STRING),
+    )),
+    EventType.STEP_FINISHED: (16, (
+        (2, "step_name", _STRING),
+    )),
+    EventType.TEXT_MESSAGE_CHUNK: (17, (
+        (2, "message_id", _OPTIONAL_STRING),
+        (3, "role", _OPTIONAL_STRING),
+        (4, "delta", _OPTIONAL_STRING),
+    )),
+    EventType.TOOL_CALL_CHUNK: (18, (
+        (2, "tool_call_id", _OPTIONAL_STRING),
+        (3, "tool_call_name", _OPTIONAL_STRING),
+        (4, "parent_message_id", _OPTIONAL_STRING),
+        (5, "delta", _OPTIONAL_STRING),
+    )),
+}
+
+# Event classes of the event types in EVENT_SPECS
+# The event class and the fields by field number for every oneof field number
+_ONEOF_SPECS: Dict[int, Tuple[EventType, Type[BaseEvent], Dict[int, Tuple[str, str]]]] = {
+    oneof_field: (
+        event_type,
+        EVENT_CLASSES[event_type],
+        {field_number: (name, kind) for field_number, name, kind in fields},
+    )
+    for event_type, (oneof_field, fields) in EVENT_SPECS.items()
+}
+
+_PATCH_OPERATION_NAMES: Dict[int, str] = {
+    value: name for name, value in PROTO_PATCH_OPERATIONS.items()
+}
+
+# Doubles in this range that hold an integer are decoded as int, the same
+# value JSON.parse(JSON.stringify(value)) gives in the TypeScript SDK.
+_MAX_SAFE_INTEGER = 2 ** 53 - 1
+
+_pack_double = struct.Struct("<d").pack
+_unpack_double = struct.Struct("<d").unpack_from
+
+
+def _tag(field_number: int, wire_type: int) -> int:
+    return (field_number << 3) | wire_type
+
+
+def _write_varint(buf: bytearray, value: int) -> None:
+    if value < 0:
+        value += 1 << 64
+    while value > 0x7F:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def _write_bytes(buf: bytearray, field_number: int, data: bytes) -> None:
+    _write_varint(buf, _tag(field_number, _LEN))
+    _write_varint(buf, len(data))
+    buf += data
+
+
+def _write_string(buf: bytearray, field_number: int, value: str) -> None:
+    _write_bytes(buf, field_number, value.encode("utf-8"))
+
+
+def _encode_value(value: Any) -> bytearray:
+    """
+    Encodes a JSON compatible value as a google.protobuf.Value.
+    """
+    buf = bytearray()
+    if value is None:
+        buf += b"\x08\x00"
+    elif value is True:
+        buf += b"\x20\x01"
+    elif value is False:
+        buf += b"\x20\x00"
+    elif isinstance(value, (int, float)):
+        buf.append(_tag(2, _FIXED64))
+        buf += _pack_double(float(value))
+    elif isinstance(value, str):
+        _write_string(buf, 3, value)
+    elif isinstance(value, dict):
+        _write_bytes(buf, 5, _encode_struct(value))
+    elif isinstance(value, (list, tuple)):
+        _write_bytes(buf, 6, _encode_list_value(value))
+    else:
+        raise TypeError(f"Cannot encode value of type {type(value).__name__}")
+    return buf
+
+
+def _encode_struct(value: Dict[str, Any]) -> bytearray:
+    buf = bytearray()
+    for key, item in value.items():
+        entry = bytearray()
+        _write_string(entry, 1, key)
+        _write_bytes(entry, 2, _encode_value(item))
+        _write_bytes(buf, 1, entry)
+    return buf
+
+
+def _encode_list_value(value: List[Any]) -> bytearray:
+    buf = bytearray()
+    for item in value:
+        _write_bytes(buf, 1, _encode_value(item))
+    return buf
+
+
+def _encode_tool_call(tool_call: Any) -> bytearray:
+    buf = bytearray()
+    if tool_call.id:
+        _write_string(buf, 1, tool_call.id)
+    if tool_call.type:
+        _write_string(buf, 2, tool_call.type)
+    function = bytearray()
+    if tool_call.function.name:
+        _write_string(function, 1, tool_call.function.name)
+    if tool_call.function.arguments:
+        _write_string(function, 2, tool_call.function.arguments)
+    _write_bytes(buf, 3, function)
+    return buf
+
+
+def _encode_message(message: Any) -> bytearray:
+    buf = bytearray()
+    if message.id:
+        _write_string(buf, 1, message.id)
+    if message.role:
+        _write_string(buf, 2, message.role)
+    content = getattr(message, "content", None)
+    if content is not None:
+        _write_string(buf, 3, content)
+    name = getattr(message, "name", None)
+    if name is not None:
+        _write_string(buf, 4, name)
+    for tool_call in getattr(message, "tool_calls", None) or ():
+        _write_bytes(buf, 5, _encode_tool_call(tool_call))
+    tool_call_id = getattr(message, "tool_call_id", None)
+    if tool_call_id is not None:
+        _write_string(buf, 6, tool_call_id)
+    return buf
+
+
+def _encode_patch_operation(operation: Dict[str, Any]) -> bytearray:
+    buf = bytearray()
+    try:
+        op = PROTO_PATCH_OPERATIONS[operation["op"]]
+    except KeyError as exc:
+        raise ValueError(f"Invalid JSON Patch operation: {operation!r}") from exc
+    if op:
+        buf.append(_tag(1, _VARINT))
+        _write_varint(buf, op)
+    if operation.get("path"):
+        _write_string(buf, 2, operation["path"])
+    if operation.get("from") is not None:
+        _write_string(buf, 3, operation["from"])
+    if "value" in operation:
+        _write_bytes(buf, 4, _encode_value(operation["value"]))
+    return buf
+
+
+def _encode_base_event(event: BaseEvent) -> bytearray:
+    buf = bytearray()
+    proto_type = PROTO_EVENT_TYPES.get(event.type)
+    if proto_type:
+        buf.append(_tag(1, _VARINT))
+        _write_varint(buf, proto_type)
+    if event.timestamp is not None:
+        buf.append(_tag(2, _VARINT))
+        _write_varint(buf, event.timestamp)
+    if event.raw_event is not None:
+        _write_bytes(buf, 3, _encode_value(to_jsonable_python(event.raw_event, by_alias=True)))
+    return buf
+
+
+def encode(event: BaseEvent) -> bytes:
+    """
+    Encodes an event to the protocol buffer binary format (an `ag_ui.Event` message).
+    """
+    try:
+        oneof_field, fields = EVENT_SPECS[event.type]
+    except KeyError as exc:
+        raise ValueError(
+            f"Event type {event.type.value} is not supported by the protobuf encoding"
+        ) from exc
+
+    body = bytearray()
+    _write_bytes(body, 1, _encode_base_event(event))
+    for field_number, name, kind in fields:
+        value = getattr(event, name)
+        if value is None:
+            continue
+        if kind is _STRING:
+            if value:
+                _write_string(body, field_number, value)
+        elif kind is _OPTIONAL_STRING:
+            _write_string(body, field_number, value)
+        elif kind is _VALUE:
+            _write_bytes(
+                body, field_number, _encode_value(to_jsonable_python(value, by_alias=True))
+            )
+        elif kind is _MESSAGES:
+            for message in value:
+                _write_bytes(body, field_number, _encode_message(message))
+        elif kind is _PATCH:
+            for operation in to_jsonable_python(value, by_alias=True):
+                _write_bytes(body, field_number, _encode_patch_operation(operation))
+
+    buf = bytearray()
+    _write_bytes(buf, oneof_field, body)
+    return bytes(buf)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    byte = data[pos]
+    if byte < 0x80:
+        return byte, pos + 1
+    value = byte & 0x7F
+    shift = 7
+    pos += 1
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _skip_field(data: bytes, pos: int, wire_type: int) -> int:
+    if wire_type == _VARINT:
+        return _read_varint(data, pos)[1]
+    if wire_type == _FIXED64:
+        return pos + 8
+    if wire_type == _LEN:
+        length, pos = _read_varint(data, pos)
+        return pos + length
+    if wire_type == 5:
+        return pos + 4
+    raise ValueError(f"Unsupported wire type {wire_type}")
+
+
+def _iter_fields(data: bytes, pos: int, end: int) -> Iterator[Tuple[int, int, int, int]]:
+    """
+    Yields (field number, wire type, value, end) for the fields between pos
+    and end. For length-delimited fields value is the start of the data,
+    for varints it is the value itself.
+    """
+    while pos < end:
+        tag, pos = _read_varint(data, pos)
+        wire_type = tag & 7
+        if wire_type == _LEN:
+            length, pos = _read_varint(data, pos)
+            yield tag >> 3, wire_type, pos, pos + length
+            pos += length
+        elif wire_type == _VARINT:
+            value, pos = _read_varint(data, pos)
+            yield tag >> 3, wire_type, value, pos
+        else:
+            pos = _skip_field(data, pos, wire_type)
+    if pos != end:
+        raise ValueError("Truncated protobuf message")
+
+
+def _decode_value(data: bytes, pos: int, end: int) -> Any:
+    """
+    Decodes a google.protobuf.Value directly into the equivalent Python
+    object (None, bool, int, float, str, dict or list).
+    """
+    # Tags of the Value, Struct and ListValue fields and most lengths fit in
+    # one byte, so single byte varints are read inline in the three
+    # functions below.
+    result = None
+    while pos < end:
+        tag = data[pos]
+        pos += 1
+        if tag == 0x1A:  # string_value
+            length = data[pos]
+            if length < 0x80:
+                pos += 1
+            else:
+                length, pos = _read_varint(data, pos)
+            result = data[pos:pos + length].decode("utf-8")
+            pos += length
+        elif tag == 0x11:  # number_value
+            result = _unpack_double(data, pos)[0]
+            pos += 8
+            if result.is_integer() and -_MAX_SAFE_INTEGER <= result <= _MAX_SAFE_INTEGER:
+                result = int(result)
+        elif tag == 0x2A:  # struct_value
+            length, pos = _read_varint(data, pos)
+            result = _decode_struct(data, pos, pos + length)
+            pos += length
+        elif tag == 0x32:  # list_value
+            length, pos = _read_varint(data, pos)
+            result = _decode_list_value(data, pos, pos + length)
+            pos += length
+        elif tag == 0x20:  # bool_value
+            value, pos = _read_varint(data, pos)
+            result = value != 0
+        elif tag == 0x08:  # null_value
+            pos = _read_varint(data, pos)[1]
+            result = None
+        else:
+            tag, pos = _read_varint(data, pos - 1)
+            pos = _skip_field(data, pos, tag & 7)
+    return result
+
+
+def _decode_struct(data: bytes, pos: int, end: int) -> Dict[str, Any]:
+    result: Dict[str, Any] = {}
+    while pos < end:
+        tag = data[pos]
+        if tag != 0x0A:  # fields entry
+            tag, pos = _read_varint(data, pos)
+            pos = _skip_field(data, pos, tag & 7)
+            continue
+        length = data[pos + 1]
+        if length < 0x80:
+            pos += 2
+        else:
+            length, pos = _read_varint(data, pos + 1)
+        entry_end = pos + length
+        key = ""
+        value = None
+        while pos < entry_end:
+            tag = data[pos]
+            if tag == 0x0A or tag == 0x12:
+                length = data[pos + 1]
+                if length < 0x80:
+                    pos += 2
+                else:
+                    length, pos = _read_varint(data, pos + 1)
+                if tag == 0x0A:
+                    key = data[pos:pos + length].decode("utf-8")
+                else:
+                    value = _decode_value(data, pos, pos + length)
+                pos += length
+            else:
+                tag, pos = _read_varint(data, pos)
+                pos = _skip_field(data, pos, tag & 7)
+        result[key] = value
+    return result
+
+
+def _decode_list_value(data: bytes, pos: int, end: int) -> List[Any]:
+    result: List[Any] = []
+    append = result.append
+    while pos < end:
+        tag = data[pos]
+        if tag != 0x0A:  # values
+            tag, pos = _read_varint(data, pos)
+            pos = _skip_field(data, pos, tag & 7)
+            continue
+        length = data[pos + 1]
+        if length < 0x80:
+            pos += 2
+        else:
+            length, pos = _read_varint(data, pos + 1)
+        append(_decode_value(data, pos, pos + length))
+        pos += length
+    return result
+
+
+def _decode_string(data: bytes, start: int, end: int) -> str:
+    return data[start:end].decode("utf-8")
+
+
+def _decode_tool_call(data: bytes, pos: int, end: int) -> Dict[str, Any]:
+    tool_call: Dict[str, Any] = {"id": "", "type": ""}
+    function = {"name": "", "arguments": ""}
+    for field_number, wire_type, start, stop in _iter_fields(data, pos, end):
+        if wire_type != _LEN:
+            continue
+        if field_number == 1:
+            tool_call["id"] = _decode_string(data, start, stop)
+        elif field_number == 2:
+            tool_call["type"] = _decode_string(data, start, stop)
+        elif field_number == 3:
+            for function_field, function_wire_type, f_start, f_stop in _iter_fields(
+                data, start, stop
+            ):
+                if function_wire_type != _LEN:
+                    continue
+                if function_field == 1:
+                    function["name"] = _decode_string(data, f_start, f_stop)
+                elif function_field == 2:
+                    function["arguments"] = _decode_string(data, f_start, f_stop)
+    tool_call["function"] = function
+    return tool_call
+
+
+_MESSAGE_FIELDS = {1: "id", 2: "role", 3: "content", 4: "name", 6: "tool_call_id"}
+
+
+def _decode_message(data: bytes, pos: int, end: int) -> Dict[str, Any]:
+    message: Dict[str, Any] = {"id": "", "role": ""}
+    for field_number, wire_type, start, stop in _iter_fields(data, pos, end):
+        if wire_type != _LEN:
+            continue
+        if field_number == 5:
+            message.setdefault("tool_calls", []).append(_decode_tool_call(data, start, stop))
+        elif field_number in _MESSAGE_FIELDS:
+            message[_MESSAGE_FIELDS[field_number]] = _decode_string(data, start, stop)
+    return message
+
+
+def _decode_patch_operation(data: bytes, pos: int, end: int) -> Dict[str, Any]:
+    operation: Dict[str, Any] = {"op": "add", "path": ""}
+    for field_number, wire_type, start, stop in _iter_fields(data, pos, end):
+        if field_number == 1 and wire_type == _VARINT:
+            try:
+                operation["op"] = _PATCH_OPERATION_NAMES[start]
+            except KeyError as exc:
+                raise ValueError(f"Invalid JSON Patch operation type {start}") from exc
+        elif wire_type != _LEN:
+            continue
+        elif field_number == 2:
+            operation["path"] = _decode_string(data, start, stop)
+        elif field_number == 3:
+            operation["from"] = _decode_string(data, start, stop)
+        elif field_number == 4:
+            operation["value"] = _decode_value(data, start, stop)
+    return operation
+
+
+def _decode_base_event(data: bytes, pos: int, end: int, values: Dict[str, Any]) -> None:
+    for field_number, wire_type, start, stop in _iter_fields(data, pos, end):
+        if field_number == 2 and wire_type == _VARINT:
+            values["timestamp"] = start - (1 << 64) if start >= 1 << 63 else start
+        elif field_number == 3 and wire_type == _LEN:
+            values["raw_event"] = _decode_value(data, start, stop)
+
+
+def _decode_event_body(
+    data: bytes, pos: int, end: int, fields: Dict[int, Tuple[str, str]]
+) -> Dict[str, Any]:
+    values: Dict[str, Any] = {}
+    for name, kind in fields.values():
+        if kind is _STRING:
+            values[name] = ""
+        elif kind is _VALUE:
+            values[name] = None
+        elif kind is _MESSAGES or kind is _PATCH:
+            values[name] = []
+    for field_number, wire_type, start, stop in _iter_fields(data, pos, end):
+        if wire_type != _LEN:
+            continue
+        if field_number == 1:
+            _decode_base_event(data, start, stop, values)
+            continue
+        try:
+            name, kind = fields[field_number]
+        except KeyError:
+            continue
+        if kind is _STRING or kind is _OPTIONAL_STRING:
+            values[name] = _decode_string(data, start, stop)
+        elif kind is _VALUE:
+            values[name] = _decode_value(data, start, stop)
+        elif kind is _MESSAGES:
+            values[name].append(_decode_message(data, start, stop))
+        elif kind is _PATCH:
+            values[name].append(_decode_patch_operation(data, start, stop))
+    return values
+
+
+def decode(
+    data: Union[bytes, bytearray, memoryview],
+    start: int = 0,
+    end: Optional[int] = None,
+) -> BaseEvent:
+    """
+    Decodes an `ag_ui.Event` message into the matching event class. `start`
+    and `end` select a message inside a larger buffer without copying it.
+    Raises ValueError for malformed messages.
+    """
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    if end is None:
+        end = len(data)
+    event_spec = None
+    try:
+        for field_number, wire_type, body_start, body_end in _iter_fields(data, start, end):
+            if wire_type != _LEN:
+                continue
+            try:
+                event_spec = _ONEOF_SPECS[field_number]
+            except KeyError as exc:
+                raise ValueError(f"Unknown event field number {field_number}") from exc
+            event_type, event_class, fields = event_spec
+            values = _decode_event_body(data, body_start, body_end, fields)
+    except (IndexError, struct.error, UnicodeDecodeError) as exc:
+        raise ValueError(f"Malformed protobuf event: {exc}") from exc
+    if event_spec is None:
+        raise ValueError("Protobuf message does not contain an event")
+    values["type"] = event_type
+    return event_class.model_validate(values)
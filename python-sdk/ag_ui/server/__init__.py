@@ -0,0 +1,12 @@
+"""
+This module contains helpers for serving AG-UI agents over HTTP.
+
+The FastAPI dependencies are in `ag_ui.server.fastapi`, which requires the
+fastapi package.
+"""
+
+from ag_ui.server.context import RunContext
+
+__all__ = [
+    "RunContext",
+]
@@ -0,0 +1,68 @@
+"""
+This module contains the RunContext class
+"""
+
+from typing import AsyncIterable, AsyncIterator, Dict, Optional
+
+from ag_ui.core.events import BaseEvent
+from ag_ui.core.types import RunAgentInput
+from ag_ui.encoder.encoder import EventEncoder
+
+
+class RunContext:
+    """
+    The validated input of a run together with an EventEncoder negotiated
+    from the request's Accept and Accept-Encoding headers, ready to stream
+    the run's events back to the client.
+    """
+    def __init__(
+        self,
+        input_data: RunAgentInput,
+        accept: Optional[str] = None,
+        accept_encoding: Optional[str] = None,
+        event_ids: bool = False,
+    ):
+        self.input_data = input_data
+        self.encoder = EventEncoder(
+            accept=accept, event_ids=event_ids, accept_encoding=accept_encoding, binary=True
+        )
+
+    @property
+    def thread_id(self) -> str:
+        """
+        The thread id of the run.
+        """
+        return self.input_data.thread_id
+
+    @property
+    def run_id(self) -> str:
+        """
+        The run id of the run.
+        """
+        return self.input_data.run_id
+
+    def get_content_type(self) -> str:
+        """
+        Returns the content type of the response.
+        """
+        return self.encoder.get_content_type()
+
+    def get_headers(self) -> Dict[str, str]:
+        """
+        Returns the response headers besides the content type.
+        """
+        content_encoding = self.encoder.get_content_encoding()
+        if content_encoding is None:
+            return {}
+        return {"Content-Encoding": content_encoding}
+
+    async def stream(self, events: AsyncIterable[BaseEvent]) -> AsyncIterator[bytes]:
+        """
+        Encodes the events of the run into the response body.
+        """
+        encoder = self.encoder
+        async for event in events:
+            yield encoder.encode_binary(event)
+        tail = encoder.finish()
+        if tail:
+            yield tail
@@ -0,0 +1,122 @@
+"""
+This module contains FastAPI dependencies that validate the RunAgentInput
+directly from the raw request body.
+
+Declaring `input_data: RunAgentInput` as an endpoint parameter makes FastAPI
+decode the JSON into dicts and lists first, and only then validate that
+tree. These dependencies read the body bytes and validate them in one
+`TypeAdapter(RunAgentInput).validate_json` call instead:
+
+    from ag_ui.server.fastapi import run_context, streaming_response
+
+    @app.post("/")
+    async def agent_endpoint(context: RunContext = Depends(run_context())):
+        return streaming_response(context, run_agent(context.input_data))
+
+Invalid bodies are answered with FastAPI's usual 422 response. Since the
+body is not a declared parameter, it is not part of the OpenAPI schema.
+
+Long message histories validate considerably faster this way. Bodies of
+64 KB or more without a `state_type` are decoded with `json.loads` instead,
+as pydantic converts large untyped states more slowly than `json.loads`
+(see `parse_run_agent_input`); `benchmarks/bench_fastapi.py` compares both
+signatures.
+"""
+
+from typing import Any, AsyncIterable, Awaitable, Callable, Optional
+
+try:
+    from fastapi import Request
+    from fastapi.exceptions import RequestValidationError
+    from fastapi.responses import StreamingResponse
+except ImportError as exc:  # pragma: no cover
+    raise ImportError(
+        "ag_ui.server.fastapi requires the fastapi package: pip install fastapi"
+    ) from exc
+from pydantic import ValidationError
+
+from ag_ui.core.events import BaseEvent
+from ag_ui.core.parsing import MessageCache, parse_run_agent_input
+from ag_ui.core.types import RunAgentInput
+from ag_ui.server.context import RunContext
+
+
+def _parse(
+    body: bytes,
+    state_type: Any,
+    lazy: bool,
+    eager_messages: int,
+    message_cache: Optional[MessageCache],
+) -> RunAgentInput:
+    try:
+        return parse_run_agent_input(
+            body,
+            state_type=state_type,
+            lazy=lazy,
+            eager_messages=eager_messages,
+            message_cache=message_cache,
+        )
+    except ValidationError as exc:
+        raise RequestValidationError(
+            [
+                {**error, "loc": ("body", *error["loc"])}
+                for error in exc.errors(include_url=False)
+            ],
+            body=body,
+        ) from exc
+
+
+def run_agent_input(
+    *,
+    state_type: Any = None,
+    lazy: bool = False,
+    eager_messages: int = 0,
+    message_cache: Optional[MessageCache] = None,
+) -> Callable[[Request], Awaitable[RunAgentInput]]:
+    """
+    Returns a dependency that validates the request body as RunAgentInput.
+    See `parse_run_agent_input` for the options.
+    """
+    async def dependency(request: Request) -> RunAgentInput:
+        return _parse(await request.body(), state_type, lazy, eager_messages, message_cache)
+
+    return dependency
+
+
+def run_context(
+    *,
+    state_type: Any = None,
+    lazy: bool = False,
+    eager_messages: int = 0,
+    message_cache: Optional[MessageCache] = None,
+    event_ids: bool = False,
+) -> Callable[[Request], Awaitable[RunContext]]:
+    """
+    Returns a dependency that validates the request body as RunAgentInput
+    and negotiates the event encoding from the request headers.
+    """
+    async def dependency(request: Request) -> RunContext:
+        input_data = _parse(
+            await request.body(), state_type, lazy, eager_messages, message_cache
+        )
+        return RunContext(
+            input_data,
+            accept=request.headers.get("accept"),
+            accept_encoding=request.headers.get("accept-encoding"),
+            event_ids=event_ids,
+        )
+
+    return dependency
+
+
+def streaming_response(
+    context: RunContext, events: AsyncIterable[BaseEvent]
+) -> StreamingResponse:
+    """
+    Returns a response that streams the encoded events of the run.
+    """
+    return StreamingResponse(
+        context.stream(events),
+        media_type=context.get_content_type(),
+        headers=context.get_headers(),
+    )
@@ -0,0 +1,24 @@
+"""
+This module contains helpers for keeping agent state and sending it as
+STATE_SNAPSHOT and STATE_DELTA events.
+"""
+
+from ag_ui.state.compaction import compact_patches
+from ag_ui.state.emitter import StateEmitter
+from ag_ui.state.history import StateHistory
+from ag_ui.state.patch import PatchError, apply_patch, format_pointer, parse_pointer
+from ag_ui.state.tracker import Operation, StateTracker, TrackedDict, TrackedList
+
+__all__ = [
+    "Operation",
+    "PatchError",
+    "apply_patch",
+    "compact_patches",
+    "format_pointer",
+    "parse_pointer",
+    "StateEmitter",
+    "StateHistory",
+    "StateTracker",
+    "TrackedDict",
+    "TrackedList",
+]
@@ -0,0 +1,294 @@
+"""
+This module contains `compact_patches`, which merges a sequence of JSON
+Patches into one shorter patch with the same effect, e.g. to persist a run
+or to catch up a client with one delta instead of hundreds.
+
+The rules:
+
+- an operation that replaces or removes a path drops the earlier
+  operations on that path and below it;
+- replacing the value of an earlier add or replace updates that operation,
+  and changes below a value that an earlier operation added are applied to
+  that value;
+- removing the path of an earlier add drops both if the add created an
+  object key or inserted into a list, and only the add if it replaced the
+  value of a key. If that is not known, the add stays without its value so
+  that the remove applies.
+
+Operations that insert into or remove from a list end the search for
+earlier operations below that list, as they shift the indexes. `move` and
+`copy` end it as well. `test` operations are dropped, as the patches of a
+log are known to have applied.
+
+Given the document that the patches apply to, `compact_patches` follows
+the patches through a copy-on-write view of it to tell list indexes from
+object keys and new keys from existing ones. Without it, tokens that are
+numbers or "-" are taken for list indexes, and no key is known to be new.
+
+The earlier operations are indexed by path, so that each operation is only
+compared with the operations on its path, above and below it.
+"""
+
+import heapq
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ag_ui.state.patch import (
+    Operation,
+    PatchError,
+    _apply_operation,
+    _copy,
+    _get,
+    _Patcher,
+    apply_patch,
+    format_pointer,
+    parse_pointer,
+)
+
+# A compacted operation: its kind, path tokens, value, source ("from") and
+# what its last token addresses
+_Entry = List[Any]
+
+# What the last token of a path addresses: a list index, the end of a list,
+# an object key, or an object key that did not exist before the operation
+_INDEX, _END, _KEY, _NEW_KEY = range(4)
+
+
+def _guess_slot(tokens: Tuple[str, ...]) -> int:
+    if not tokens:
+        return _KEY
+    token = tokens[-1]
+    if token == "-":
+        return _END
+    return _INDEX if token.isdigit() else _KEY
+
+
+def _slot(document: Any, tokens: Tuple[str, ...]) -> int:
+    if not tokens:
+        return _KEY
+    parent = _get(document, tokens[:-1])
+    if type(parent) is list:
+        return _END if tokens[-1] == "-" else _INDEX
+    if type(parent) is dict and tokens[-1] not in parent:
+        return _NEW_KEY
+    return _KEY
+
+
+class _Node:
+    """
+    A path in the index: the operations on the path, the operations that
+    insert into or remove from it as a list, and the paths below it.
+    Positions are kept in the order of the operations.
+    """
+    __slots__ = ("positions", "shifting", "children")
+
+    def __init__(self):
+        self.positions: List[int] = []
+        self.shifting: List[int] = []
+        self.children: Dict[str, "_Node"] = {}
+
+
+def _fold(entry: _Entry, op: str, relative: Tuple[str, ...], value: Any) -> bool:
+    """
+    Applies an operation below the value of an earlier add or replace to
+    that value. Returns False if it does not apply.
+    """
+    operation = {"op": op, "path": format_pointer(relative)}
+    if op != "remove":
+        operation["value"] = value
+    try:
+        entry[2] = apply_patch(entry[2], [operation], in_place=True)
+    except PatchError:
+        return False
+    return True
+
+
+class _Compactor:
+    """
+    Merges operations into the operations before them.
+    """
+
+    def __init__(self, known: bool):
+        self.entries: List[Optional[_Entry]] = []
+        self.root = _Node()
+        # The position of the last move or copy, which nothing merges across
+        self.barrier = -1
+        # Whether the slots of the entries come from the document
+        self.known = known
+
+    def append(self, entry: _Entry) -> None:
+        position = len(self.entries)
+        self.entries.append(entry)
+        kind, tokens = entry[0], entry[1]
+        if kind in ("move", "copy"):
+            self.barrier = position
+            return
+        node = self.root
+        parent = node
+        for token in tokens:
+            parent = node
+            node = node.children.get(token) or node.children.setdefault(token, _Node())
+        node.positions.append(position)
+        if kind != "replace" and entry[4] == _INDEX:
+            parent.shifting.append(position)
+
+    def _below(self, node: _Node) -> List[int]:
+        """
+        Returns the positions of the operations below a path in order, and
+        drops the merged ones from the index.
+        """
+        entries = self.entries
+        positions: List[int] = []
+        stack = list(node.children.values())
+        while stack:
+            child = stack.pop()
+            child.positions = [p for p in child.positions if entries[p] is not None]
+            positions.extend(child.positions)
+            stack.extend(child.children.values())
+        positions.sort()
+        return positions
+
+    def candidates(self, tokens: Tuple[str, ...], shifts: bool) -> Iterator[int]:
+        """
+        Yields the positions of the earlier operations that may affect or
+        be affected by an operation on the path, last first.
+        """
+        sources: List[List[int]] = []
+        node: Optional[_Node] = self.root
+        parent: Optional[_Node] = None
+        for depth, token in enumerate(tokens, 1):
+            sources.append(node.positions)
+            sources.append(node.shifting)
+            if depth == len(tokens):
+                parent = node
+            node = node.children.get(token)
+            if node is None:
+                break
+        if node is not None:
+            sources.append(node.positions)
+            sources.append(self._below(node))
+        if shifts and parent is not None:
+            sources.append(self._below(parent))
+        last = None
+        for position in heapq.merge(*(reversed(source) for source in sources), reverse=True):
+            if position <= self.barrier:
+                return
+            if position != last:
+                last = position
+                yield position
+
+    def merge(self, op: str, tokens: Tuple[str, ...], value: Any, slot: int) -> bool:
+        """
+        Merges an add, replace or remove into the earlier operations,
+        searching back until one that may have moved the path. Returns
+        whether the operation was absorbed by an earlier one.
+        """
+        entries = self.entries
+        depth = len(tokens)
+        sets_path = op != "add" or slot >= _KEY
+        # Whether the operation inserts into or removes from a list at an index
+        shifts = op != "replace" and slot == _INDEX
+        for position in self.candidates(tokens, shifts):
+            entry = entries[position]
+            if entry is None:
+                continue
+            kind, path = entry[0], entry[1]
+            length = len(path)
+            if path == tokens:
+                if kind == "remove":
+                    if op == "add" and depth and slot >= _KEY:
+                        # Removing a key and adding it again replaces it
+                        entry[0], entry[2] = "replace", value
+                        return True
+                    return False
+                if op == "remove":
+                    if kind == "add" and self.known:
+                        entries[position] = None
+                        if entry[4] != _KEY:
+                            # The add created the key or inserted the value
+                            return True
+                        continue
+                    if kind == "add":
+                        # The key may not have existed before the add, and a
+                        # number may be a key rather than a list index, so the
+                        # add stays for the remove to apply, without its value
+                        entry[2] = None
+                        return False
+                    entries[position] = None
+                    continue
+                if sets_path:
+                    entry[2] = value
+                    return True
+                return False
+            if length < depth and path == tokens[:length]:
+                # Below the value of the entry
+                if kind == "remove" or not _fold(entry, op, tokens[length:], value):
+                    return False
+                return True
+            if depth < length and path[:depth] == tokens:
+                # The entry changed a value that the operation replaces
+                if not sets_path:
+                    return False
+                entries[position] = None
+                continue
+            if shifts and length >= depth and path[:depth - 1] == tokens[:depth - 1]:
+                # Moving the operation before the entry would shift its index
+                return False
+            if (
+                length <= depth
+                and path[:length - 1] == tokens[:length - 1]
+                and entry[4] == _INDEX
+                and kind != "replace"
+            ):
+                # An insert into or removal from a list that contains the path
+                return False
+        return False
+
+
+def compact_patches(
+    patches: Iterable[Iterable[Operation]], document: Any = None
+) -> List[Operation]:
+    """
+    Returns one patch with the effect of applying the patches in order.
+    Values are copied, so the result does not share them with the patches.
+
+    Given the document that the patches apply to, which is not changed, the
+    patch is shorter where the document tells list indexes from object keys
+    (see the module docstring), and PatchError is raised if the patches do
+    not apply to it.
+    """
+    patcher = None if document is None else _Patcher(document, False)
+    compactor = _Compactor(patcher is not None)
+    for patch in patches:
+        for operation in patch:
+            try:
+                op = operation["op"]
+                tokens = parse_pointer(operation["path"])
+            except (KeyError, TypeError):
+                raise PatchError(f"Invalid operation {operation!r}") from None
+            if patcher is None:
+                slot = _guess_slot(tokens)
+            else:
+                slot = _slot(patcher.document, tokens) if op != "test" else _KEY
+                _apply_operation(patcher, operation)
+            if op == "test":
+                continue
+            if op in ("move", "copy"):
+                compactor.append([op, tokens, None, parse_pointer(operation["from"]), slot])
+                continue
+            if op not in ("add", "replace", "remove"):
+                raise PatchError(f"Unknown operation {op!r}")
+            value = _copy(operation["value"]) if op != "remove" else None
+            if not compactor.merge(op, tokens, value, slot):
+                compactor.append([op, tokens, value, None, slot])
+    result: List[Operation] = []
+    for entry in compactor.entries:
+        if entry is None:
+            continue
+        op, tokens, value, source, _ = entry
+        operation: Operation = {"op": op, "path": format_pointer(tokens)}
+        if op in ("move", "copy"):
+            operation["from"] = format_pointer(source)
+        elif op != "remove":
+            operation["value"] = value
+        result.append(operation)
+    return result
@@ -0,0 +1,116 @@
+"""
+This module contains the StateEmitter, which decides for the changes of a
+StateTracker whether to send a STATE_DELTA or a STATE_SNAPSHOT event.
+
+A delta is sent unless the snapshot is smaller, which happens when most of
+the state changed. The size of the snapshot is estimated from the last
+encoded snapshot plus the deltas since; the state is only encoded to check
+when the patch is at least half the estimate, so that the check costs no
+more than encoding the patch. After `max_deltas` deltas or `max_delta_bytes`
+of deltas a snapshot is sent anyway, so that clients that join or resume
+late have few deltas to apply. By default that is once the deltas add up to
+the size of the snapshot, which at most doubles the bytes sent:
+
+    emitter = StateEmitter(StateTracker(state))
+    yield emitter.next_event()  # the first event is a snapshot
+    emitter.tracker.state["steps"][0]["status"] = "completed"
+    yield emitter.next_event()  # a delta
+"""
+
+from typing import Any, Dict, Optional, Union
+
+from ag_ui.core.events import EventType, StateDeltaEvent, StateSnapshotEvent
+from ag_ui.core.types import RawJSON
+from ag_ui.state.tracker import StateTracker
+
+
+class StateEmitter:
+    """
+    Turns the changes of a StateTracker into the smaller of a STATE_DELTA
+    and a STATE_SNAPSHOT event, with a snapshot at least every `max_deltas`
+    deltas or `max_delta_bytes` bytes of deltas. If `max_delta_bytes` is
+    None, it is the size of the last snapshot.
+    """
+
+    def __init__(
+        self,
+        tracker: StateTracker,
+        *,
+        max_deltas: int = 1000,
+        max_delta_bytes: Optional[int] = None,
+    ):
+        self.tracker = tracker
+        self.max_deltas = max_deltas
+        self.max_delta_bytes = max_delta_bytes
+        # The estimated size of a snapshot, None until one was sent
+        self._snapshot_bytes: Optional[int] = None
+        # The size of the last snapshot sent
+        self._sent_snapshot_bytes = 0
+        # The deltas sent since the last snapshot
+        self._deltas = 0
+        self._delta_bytes = 0
+        self.snapshots_sent = 0
+        self.deltas_sent = 0
+        self.bytes_sent = 0
+
+    def next_event(
+        self, **kwargs: Any
+    ) -> Union[StateDeltaEvent, StateSnapshotEvent, None]:
+        """
+        Returns the event for the changes since the last event, or None if
+        nothing changed. The first event is always a snapshot. Keyword
+        arguments are passed to the event.
+        """
+        tracker = self.tracker
+        if self._snapshot_bytes is None:
+            return self.snapshot_event(**kwargs)
+        if not tracker.has_changes:
+            return None
+        patch = tracker.patch()
+        size = len(RawJSON.dumps(patch).text)
+        max_delta_bytes = self.max_delta_bytes
+        if max_delta_bytes is None:
+            max_delta_bytes = self._sent_snapshot_bytes
+        if self._deltas >= self.max_deltas or self._delta_bytes + size > max_delta_bytes:
+            return self.snapshot_event(**kwargs)
+        if size * 2 >= self._snapshot_bytes:
+            snapshot = RawJSON.dumps(tracker.data)
+            if len(snapshot.text) <= size:
+                return self._send_snapshot(snapshot, kwargs)
+            self._snapshot_bytes = len(snapshot.text)
+        else:
+            self._snapshot_bytes += size
+        self._deltas += 1
+        self._delta_bytes += size
+        self.deltas_sent += 1
+        self.bytes_sent += size
+        return StateDeltaEvent.trusted(delta=patch, **kwargs)
+
+    def snapshot_event(self, **kwargs: Any) -> StateSnapshotEvent:
+        """
+        Returns a snapshot of the state and discards the recorded changes,
+        e.g. for a client that reconnects. The snapshot is encoded when the
+        event is made, so later changes of the state do not alter it.
+        """
+        self.tracker.patch()
+        return self._send_snapshot(RawJSON.dumps(self.tracker.data), kwargs)
+
+    def _send_snapshot(self, snapshot: RawJSON, kwargs: Dict[str, Any]) -> StateSnapshotEvent:
+        size = len(snapshot.text)
+        self._snapshot_bytes = self._sent_snapshot_bytes = size
+        self._deltas = 0
+        self._delta_bytes = 0
+        self.snapshots_sent += 1
+        self.bytes_sent += size
+        return StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=snapshot, **kwargs)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the number of snapshots and deltas sent and their size in
+        bytes of JSON.
+        """
+        return {
+            "snapshots": self.snapshots_sent,
+            "deltas": self.deltas_sent,
+            "bytes": self.bytes_sent,
+        }
@@ -0,0 +1,129 @@
+"""
+This module contains the StateHistory, a log of the state changes of a run
+with materialized checkpoints.
+
+Every `checkpoint_interval` entries, and at every snapshot, the history
+keeps a copy of the state, so that the state after any entry is rebuilt
+from the nearest checkpoint before it rather than from the start of the log:
+
+    history = StateHistory(initial_state)
+    for event in events:
+        history.append_event(event)
+    state = history.state_at(120)
+    catch_up = history.delta(100)  # one compacted patch from entry 100 to the end
+"""
+
+from bisect import bisect_right
+from itertools import chain
+from typing import Any, Iterable, List, Optional
+
+from ag_ui.core.events import StateDeltaEvent, StateSnapshotEvent
+from ag_ui.core.types import RawJSON
+from ag_ui.state.compaction import compact_patches
+from ag_ui.state.patch import Operation, _copy, apply_patch
+
+
+class StateHistory:
+    """
+    A log of JSON Patches and snapshots of the state, with a copy of the
+    state kept every `checkpoint_interval` entries.
+    """
+
+    def __init__(self, state: Any = None, *, checkpoint_interval: int = 50):
+        if checkpoint_interval < 1:
+            raise ValueError("checkpoint_interval must be at least 1")
+        self.checkpoint_interval = checkpoint_interval
+        self._current = _copy(state)
+        self._patches: List[List[Operation]] = []
+        self._checkpoint_offsets: List[int] = [0]
+        self._checkpoint_states: List[Any] = [_copy(state)]
+
+    def __len__(self) -> int:
+        return len(self._patches)
+
+    @property
+    def state(self) -> Any:
+        """
+        The state after the last entry. It is changed by later entries, so
+        copy it to keep it.
+        """
+        return self._current
+
+    def append(self, patch: Iterable[Operation]) -> int:
+        """
+        Appends a patch and returns its offset, the number of entries
+        before it. Raises PatchError and appends nothing if the patch does
+        not apply to the state. The history keeps the operations, so do not
+        change them afterwards.
+        """
+        patch = list(patch)
+        self._current = apply_patch(self._current, patch, in_place=True)
+        self._patches.append(patch)
+        if len(self._patches) - self._checkpoint_offsets[-1] >= self.checkpoint_interval:
+            self._checkpoint()
+        return len(self._patches) - 1
+
+    def append_snapshot(self, snapshot: Any) -> int:
+        """
+        Appends a snapshot of the state, which is also a checkpoint, and
+        returns its offset.
+        """
+        snapshot = snapshot.loads() if isinstance(snapshot, RawJSON) else _copy(snapshot)
+        self._current = _copy(snapshot)
+        self._patches.append([{"op": "replace", "path": "", "value": snapshot}])
+        # The snapshot is not changed after this, so the checkpoint shares it
+        self._checkpoint_offsets.append(len(self._patches))
+        self._checkpoint_states.append(snapshot)
+        return len(self._patches) - 1
+
+    def append_event(self, event: Any) -> Optional[int]:
+        """
+        Appends a STATE_SNAPSHOT or STATE_DELTA event and returns its
+        offset. Other events are ignored and return None.
+        """
+        if isinstance(event, StateDeltaEvent):
+            return self.append(event.delta)
+        if isinstance(event, StateSnapshotEvent):
+            return self.append_snapshot(event.snapshot)
+        return None
+
+    def _checkpoint(self) -> None:
+        self._checkpoint_offsets.append(len(self._patches))
+        self._checkpoint_states.append(_copy(self._current))
+
+    def _check_offset(self, offset: Optional[int]) -> int:
+        if offset is None:
+            return len(self._patches)
+        if not 0 <= offset <= len(self._patches):
+            raise IndexError(f"Offset {offset} out of range")
+        return offset
+
+    def state_at(self, offset: Optional[int] = None) -> Any:
+        """
+        Returns the state after the first `offset` entries, or after all of
+        them. The state is built from the nearest checkpoint by copying only
+        the containers that changed since, and shares the others with the
+        checkpoint, so treat it as read-only or copy it before changing it.
+        """
+        offset = self._check_offset(offset)
+        index = bisect_right(self._checkpoint_offsets, offset) - 1
+        start = self._checkpoint_offsets[index]
+        return apply_patch(
+            self._checkpoint_states[index],
+            chain.from_iterable(self._patches[start:offset]),
+        )
+
+    def patches(self, start: int = 0, end: Optional[int] = None) -> List[List[Operation]]:
+        """
+        Returns the patches of the entries from `start` to `end`.
+        """
+        return self._patches[self._check_offset(start):self._check_offset(end)]
+
+    def delta(self, start: int, end: Optional[int] = None) -> List[Operation]:
+        """
+        Returns one compacted patch that takes the state after `start`
+        entries to the state after `end` entries, or after all of them,
+        e.g. to catch up a client that resumes a run. The patches are
+        compacted against the state after `start` entries.
+        """
+        return compact_patches(self.patches(start, end), self.state_at(start))
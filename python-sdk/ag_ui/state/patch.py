@@ -0,0 +1,286 @@
+"""
+This module contains `apply_patch`, which applies the JSON Patch (RFC 6902)
+of a STATE_DELTA event to a state.
+
+A patch is applied atomically: if an operation fails, PatchError is raised
+and the state is left as it was. By default the state is not changed at all;
+the containers along the changed paths are copied and the result shares the
+unchanged parts with the state (copy-on-write), so applying a small patch to
+a large state is cheap. With `in_place=True` the state itself is changed,
+and undone if the patch fails:
+
+    state = apply_patch(state, event.delta)
+    state = apply_patch(state, event.delta, in_place=True)
+
+JSON Pointers are parsed once and cached, as the same paths recur across the
+deltas of a run.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+Operation = Dict[str, Any]
+
+# An undo step of an in-place patch: (action, container, key, value)
+_Undo = Tuple[str, Any, Any, Any]
+
+_MISSING = object()
+
+
+class PatchError(ValueError):
+    """
+    Raised when a JSON Patch cannot be applied. The state is left unchanged.
+    """
+
+
+@lru_cache(maxsize=4096)
+def parse_pointer(pointer: str) -> Tuple[str, ...]:
+    """
+    Returns the reference tokens of a JSON Pointer (RFC 6901).
+    """
+    if pointer == "":
+        return ()
+    if pointer[0] != "/":
+        raise PatchError(f"Invalid JSON Pointer {pointer!r}")
+    tokens = pointer[1:].split("/")
+    if "~" in pointer:
+        tokens = [token.replace("~1", "/").replace("~0", "~") for token in tokens]
+    return tuple(tokens)
+
+
+def format_pointer(tokens: Iterable[str]) -> str:
+    """
+    Returns the JSON Pointer of reference tokens, the inverse of
+    `parse_pointer`.
+    """
+    return "".join(
+        "/" + (token.replace("~", "~0").replace("/", "~1") if "~" in token or "/" in token else token)
+        for token in tokens
+    )
+
+
+def _index(token: str, length: int, allow_end: bool = False) -> int:
+    """
+    Returns the list index of a reference token. `allow_end` accepts the
+    index after the last item, which adds append to.
+    """
+    if token == "-" and allow_end:
+        return length
+    if not token.isdigit() or (token[0] == "0" and len(token) > 1):
+        raise PatchError(f"Invalid list index {token!r}")
+    index = int(token)
+    if index > length or (index == length and not allow_end):
+        raise PatchError(f"List index {index} out of range")
+    return index
+
+
+def _copy(value: Any) -> Any:
+    value_type = type(value)
+    if value_type is dict:
+        return {key: _copy(item) for key, item in value.items()}
+    if value_type is list:
+        return [_copy(item) for item in value]
+    return value
+
+
+def _equal(a: Any, b: Any) -> bool:
+    """
+    Compares JSON values as `test` does, which unlike Python does not
+    consider booleans equal to numbers.
+    """
+    a_type, b_type = type(a), type(b)
+    if a_type is dict:
+        return b_type is dict and a.keys() == b.keys() and all(
+            _equal(value, b[key]) for key, value in a.items()
+        )
+    if a_type is list:
+        return b_type is list and len(a) == len(b) and all(map(_equal, a, b))
+    if (a_type is bool) != (b_type is bool):
+        return False
+    return a == b
+
+
+def _get(document: Any, tokens: Tuple[str, ...]) -> Any:
+    value = document
+    for token in tokens:
+        value_type = type(value)
+        if value_type is dict:
+            value = value.get(token, _MISSING)
+            if value is _MISSING:
+                raise PatchError(f"Path /{'/'.join(tokens)} does not exist")
+        elif value_type is list:
+            value = value[_index(token, len(value))]
+        else:
+            raise PatchError(f"Path /{'/'.join(tokens)} does not exist")
+    return value
+
+
+class _Patcher:
+    """
+    Applies the operations of one patch, either copying containers before
+    changing them or changing them in place and recording how to undo it.
+    """
+    __slots__ = ("document", "owned", "undo")
+
+    def __init__(self, document: Any, in_place: bool):
+        self.document = document
+        # The containers that may be changed, if copy-on-write
+        self.owned: Optional[Set[int]] = None if in_place else set()
+        self.undo: Optional[List[_Undo]] = [] if in_place else None
+
+    def _own(self, container: Any) -> Any:
+        container = container.copy()
+        self.owned.add(id(container))
+        return container
+
+    def copy(self, value: Any) -> Any:
+        """
+        Returns a copy of a value to add, which the patch may change.
+        """
+        value = _copy(value)
+        if self.owned is not None and type(value) in (dict, list):
+            self.owned.add(id(value))
+        return value
+
+    def parent(self, tokens: Tuple[str, ...]) -> Any:
+        """
+        Returns the container of the last token, owned by the patch.
+        """
+        owned = self.owned
+        node = self.document
+        if owned is not None and id(node) not in owned and type(node) in (dict, list):
+            node = self.document = self._own(node)
+        for token in tokens[:-1]:
+            node_type = type(node)
+            if node_type is dict:
+                key = token
+                child = node.get(key, _MISSING)
+                if child is _MISSING:
+                    raise PatchError(f"Path /{'/'.join(tokens)} does not exist")
+            elif node_type is list:
+                key = _index(token, len(node))
+                child = node[key]
+            else:
+                raise PatchError(f"Path /{'/'.join(tokens)} does not exist")
+            if owned is not None and id(child) not in owned:
+                if type(child) in (dict, list):
+                    child = node[key] = self._own(child)
+            node = child
+        if type(node) not in (dict, list):
+            raise PatchError(f"Path /{'/'.join(tokens)} does not exist")
+        return node
+
+    def add(self, tokens: Tuple[str, ...], value: Any) -> None:
+        if not tokens:
+            self.document = value
+            return
+        parent = self.parent(tokens)
+        token = tokens[-1]
+        if type(parent) is dict:
+            if self.undo is not None:
+                old = parent.get(token, _MISSING)
+                self.undo.append(("delete", parent, token, None) if old is _MISSING
+                                 else ("set", parent, token, old))
+            parent[token] = value
+        else:
+            index = _index(token, len(parent), allow_end=True)
+            parent.insert(index, value)
+            if self.undo is not None:
+                self.undo.append(("delete", parent, index, None))
+
+    def remove(self, tokens: Tuple[str, ...]) -> Any:
+        if not tokens:
+            raise PatchError("Cannot remove the whole document")
+        parent = self.parent(tokens)
+        token = tokens[-1]
+        if type(parent) is dict:
+            value = parent.pop(token, _MISSING)
+            if value is _MISSING:
+                raise PatchError(f"Path /{'/'.join(tokens)} does not exist")
+        else:
+            token = _index(token, len(parent))
+            value = parent.pop(token)
+        if self.undo is not None:
+            self.undo.append(
+                ("set" if type(parent) is dict else "insert", parent, token, value)
+            )
+        return value
+
+    def replace(self, tokens: Tuple[str, ...], value: Any) -> None:
+        if not tokens:
+            self.document = value
+            return
+        parent = self.parent(tokens)
+        token = tokens[-1]
+        if type(parent) is dict:
+            if token not in parent:
+                raise PatchError(f"Path /{'/'.join(tokens)} does not exist")
+        else:
+            token = _index(token, len(parent))
+        if self.undo is not None:
+            self.undo.append(("set", parent, token, parent[token]))
+        parent[token] = value
+
+    def rollback(self) -> None:
+        """
+        Undoes the changes of an in-place patch, last first.
+        """
+        for action, container, key, value in reversed(self.undo):
+            if action == "set":
+                container[key] = value
+            elif action == "delete":
+                del container[key]
+            else:
+                container.insert(key, value)
+
+
+def _apply_operation(patcher: _Patcher, operation: Operation) -> None:
+    try:
+        op = operation["op"]
+        tokens = parse_pointer(operation["path"])
+    except (KeyError, TypeError):
+        raise PatchError(f"Invalid operation {operation!r}") from None
+    if op in ("add", "replace", "test"):
+        value = operation.get("value", _MISSING)
+        if value is _MISSING:
+            raise PatchError(f"Operation {op} requires a value")
+        if op == "test":
+            if not _equal(_get(patcher.document, tokens), value):
+                raise PatchError(f"Test of path {operation['path']!r} failed")
+            return
+        if op == "add":
+            patcher.add(tokens, patcher.copy(value))
+        else:
+            patcher.replace(tokens, patcher.copy(value))
+    elif op == "remove":
+        patcher.remove(tokens)
+    elif op in ("move", "copy"):
+        try:
+            source = parse_pointer(operation["from"])
+        except KeyError:
+            raise PatchError(f"Operation {op} requires from") from None
+        if op == "copy":
+            patcher.add(tokens, patcher.copy(_get(patcher.document, source)))
+        elif source != tokens:
+            if tokens[:len(source)] == source:
+                raise PatchError("Cannot move a value into itself")
+            patcher.add(tokens, patcher.remove(source))
+    else:
+        raise PatchError(f"Unknown operation {op!r}")
+
+
+def apply_patch(document: Any, patch: Iterable[Operation], *, in_place: bool = False) -> Any:
+    """
+    Applies a JSON Patch to a document and returns the result. The document
+    is not changed unless `in_place` is set; either way it is unchanged if
+    the patch fails with PatchError. Values added by the patch are copied.
+    """
+    patcher = _Patcher(document, in_place)
+    try:
+        for operation in patch:
+            _apply_operation(patcher, operation)
+    except Exception:
+        if in_place:
+            patcher.rollback()
+        raise
+    return patcher.document
@@ -0,0 +1,382 @@
+"""
+This module contains the StateTracker, which records changes to the agent
+state as JSON Patch (RFC 6902) operations while they are made.
+
+The state is accessed through proxies for its dicts and lists. Every
+mutation through a proxy is applied to the underlying object and recorded as
+an operation, so a delta costs time in the size of the change rather than a
+copy and a diff of the whole state:
+
+    tracker = StateTracker({"steps": [{"status": "pending"}]})
+    tracker.state["steps"][0]["status"] = "completed"
+    event = tracker.delta_event()
+    # [{"op": "replace", "path": "/steps/0/status", "value": "completed"}]
+
+Objects that are mutated directly rather than through `tracker.state` are
+not tracked.
+"""
+
+from collections.abc import MutableMapping, MutableSequence
+from typing import Any, Iterator, List, Optional, Union
+
+from ag_ui.core.events import EventType, StateDeltaEvent, StateSnapshotEvent
+from ag_ui.state.patch import Operation
+
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def _copy(value: Any) -> Any:
+    """
+    Copies the containers of a JSON value, so that a recorded operation is
+    not changed by later mutations of the value it added.
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return {key: _copy(item) for key, item in value.items()}
+    if value_type is list:
+        return [_copy(item) for item in value]
+    if isinstance(value, _Proxy):
+        return _copy(value._target)
+    return value
+
+
+def _unwrap(value: Any) -> Any:
+    if isinstance(value, _Proxy):
+        return value._target
+    return value
+
+
+def _escape(key: str) -> str:
+    """
+    Escapes a key as a JSON Pointer reference token (RFC 6901).
+    """
+    if "~" in key or "/" in key:
+        return key.replace("~", "~0").replace("/", "~1")
+    return key
+
+
+class _Proxy:
+    """
+    A proxy for a dict or list of the tracked state, which knows the
+    container it was accessed from.
+    """
+    __slots__ = ("_tracker", "_target", "_parent", "_key")
+
+    def __init__(
+        self,
+        tracker: "StateTracker",
+        target: Any,
+        parent: Optional["_Proxy"],
+        key: Union[str, int, None],
+    ):
+        self._tracker = tracker
+        self._target = target
+        self._parent = parent
+        self._key = key
+
+    def _wrap(self, value: Any, key: Union[str, int]) -> Any:
+        value_type = type(value)
+        if value_type is dict:
+            return TrackedDict(self._tracker, value, self, key)
+        if value_type is list:
+            return TrackedList(self._tracker, value, self, key)
+        return value
+
+    def _path(self) -> str:
+        """
+        Returns the JSON Pointer of the container. List indexes are checked
+        and found again if items were inserted or removed since the access.
+        """
+        tokens: List[str] = []
+        node = self
+        while node._parent is not None:
+            parent = node._parent._target
+            key = node._key
+            if type(parent) is list:
+                if not (0 <= key < len(parent) and parent[key] is node._target):
+                    for index, item in enumerate(parent):
+                        if item is node._target:
+                            node._key = key = index
+                            break
+                    else:
+                        raise ValueError("The container is no longer part of the state")
+                tokens.append(str(key))
+            else:
+                if parent.get(key) is not node._target:
+                    raise ValueError("The container is no longer part of the state")
+                tokens.append(_escape(key))
+            node = node._parent
+        if node._target is not self._tracker._data:
+            raise ValueError("The container is no longer part of the state")
+        tokens.append("")
+        return "/".join(reversed(tokens))
+
+    def __len__(self) -> int:
+        return len(self._target)
+
+    def __eq__(self, other: Any) -> bool:
+        return self._target == _unwrap(other)
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._target!r})"
+
+
+class TrackedDict(_Proxy, MutableMapping):
+    """
+    A proxy for a dict of the tracked state that records its changes.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        return self._wrap(self._target[key], key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if not isinstance(key, str):
+            raise TypeError(f"State keys must be strings, not {type(key).__name__}")
+        value = _unwrap(value)
+        if key in self._target:
+            if self._target[key] is value and type(value) in (dict, list):
+                return  # e.g. the assignment of `state[key] += [item]`
+            op = "replace"
+        else:
+            op = "add"
+        path = f"{self._path()}/{_escape(key)}"
+        self._target[key] = value
+        self._tracker._record(op, path, value)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self._target:
+            raise KeyError(key)
+        path = f"{self._path()}/{_escape(key)}"
+        del self._target[key]
+        self._tracker._record("remove", path)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._target)
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key not in self._target and default:
+            return default[0]
+        value = self._target[key]
+        del self[key]
+        return value
+
+    def popitem(self) -> Any:
+        if not self._target:
+            raise KeyError("popitem(): dictionary is empty")
+        key = next(reversed(self._target))
+        return key, self.pop(key)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self._target:
+            self[key] = default
+        return self[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._target
+
+    def clear(self) -> None:
+        if self._target:
+            self._tracker._replace(self, {})
+
+
+class TrackedList(_Proxy, MutableSequence):
+    """
+    A proxy for a list of the tracked state that records its changes.
+    """
+    __slots__ = ()
+
+    def _index(self, index: int) -> int:
+        length = len(self._target)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("list index out of range")
+        return index
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [
+                self._wrap(self._target[i], i)
+                for i in range(*index.indices(len(self._target)))
+            ]
+        index = self._index(index)
+        return self._wrap(self._target[index], index)
+
+    def __setitem__(self, index: Union[int, slice], value: Any) -> None:
+        if isinstance(index, slice):
+            items = list(self._target)
+            items[index] = [_unwrap(item) for item in value]
+            self._tracker._replace(self, items)
+            return
+        index = self._index(index)
+        value = _unwrap(value)
+        if self._target[index] is value and type(value) in (dict, list):
+            return
+        path = f"{self._path()}/{index}"
+        self._target[index] = value
+        self._tracker._record("replace", path, value)
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        if isinstance(index, slice):
+            for i in sorted(range(*index.indices(len(self._target))), reverse=True):
+                del self[i]
+            return
+        index = self._index(index)
+        path = f"{self._path()}/{index}"
+        del self._target[index]
+        self._tracker._record("remove", path)
+
+    def insert(self, index: int, value: Any) -> None:
+        length = len(self._target)
+        if index < 0:
+            index = max(index + length, 0)
+        if index >= length:
+            self.append(value)
+            return
+        path = f"{self._path()}/{index}"
+        value = _unwrap(value)
+        self._target.insert(index, value)
+        self._tracker._record("add", path, value)
+
+    def append(self, value: Any) -> None:
+        path = f"{self._path()}/-"
+        value = _unwrap(value)
+        self._target.append(value)
+        self._tracker._record("add", path, value)
+
+    def pop(self, index: int = -1) -> Any:
+        index = self._index(index)
+        value = self._target[index]
+        del self[index]
+        return value
+
+    def __iter__(self) -> Iterator[Any]:
+        for index, item in enumerate(self._target):
+            yield self._wrap(item, index)
+
+    def __contains__(self, value: object) -> bool:
+        return _unwrap(value) in self._target
+
+    def clear(self) -> None:
+        if self._target:
+            self._tracker._replace(self, [])
+
+    def reverse(self) -> None:
+        self._tracker._replace(self, self._target[::-1])
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Sorts the list in place, recorded as a replacement of the list.
+        """
+        self._tracker._replace(self, sorted(self._target, *args, **kwargs))
+
+
+class StateTracker:
+    """
+    Tracks the changes to an agent state and turns them into state events.
+
+    The tracker takes the state as is, without copying it. Mutate it through
+    `state`, then send the recorded changes with `delta_event()`, or the
+    whole state with `snapshot_event()`.
+    """
+
+    def __init__(self, state: Any = None):
+        self._data = {} if state is None else state
+        self._operations: List[Operation] = []
+
+    @property
+    def state(self) -> Any:
+        """
+        The state, with its dicts and lists wrapped in change-recording
+        proxies. Containers found through a proxy are proxies as well.
+        """
+        data_type = type(self._data)
+        if data_type is dict:
+            return TrackedDict(self, self._data, None, None)
+        if data_type is list:
+            return TrackedList(self, self._data, None, None)
+        return self._data
+
+    @state.setter
+    def state(self, state: Any) -> None:
+        state = _unwrap(state)
+        if state is self._data:
+            return
+        self._data = state
+        self._record("replace", "", self._data)
+
+    @property
+    def data(self) -> Any:
+        """
+        The untracked state, e.g. for snapshots and persistence.
+        """
+        return self._data
+
+    @property
+    def has_changes(self) -> bool:
+        """
+        Whether changes were recorded since the last patch.
+        """
+        return bool(self._operations)
+
+    def _record(self, op: str, path: str, value: Any = None) -> None:
+        operations = self._operations
+        if op == "remove":
+            operations.append({"op": "remove", "path": path})
+            return
+        if type(value) not in _JSON_SCALARS:
+            value = _copy(value)
+        # A replace of the path changed by the previous operation updates it
+        if op == "replace" and operations:
+            last = operations[-1]
+            if last["path"] == path and last["op"] != "remove":
+                last["value"] = value
+                return
+        operations.append({"op": op, "path": path, "value": value})
+
+    def _replace(self, proxy: _Proxy, value: Any) -> None:
+        """
+        Replaces the contents of a container with a value of the same type,
+        recorded as one replace operation.
+        """
+        path = proxy._path()
+        target = proxy._target
+        if type(target) is dict:
+            target.clear()
+            target.update(value)
+        else:
+            target[:] = value
+        self._record("replace", path, target)
+
+    def patch(self) -> List[Operation]:
+        """
+        Returns the operations recorded since the last patch, and starts a
+        new one.
+        """
+        operations = self._operations
+        self._operations = []
+        return operations
+
+    def delta_event(self, **kwargs: Any) -> Optional[StateDeltaEvent]:
+        """
+        Returns a STATE_DELTA event with the changes since the last patch,
+        or None if nothing changed. Keyword arguments are passed to the event.
+        """
+        if not self._operations:
+            return None
+        return StateDeltaEvent.trusted(delta=self.patch(), **kwargs)
+
+    def snapshot_event(self, **kwargs: Any) -> StateSnapshotEvent:
+        """
+        Returns a STATE_SNAPSHOT event with the state and discards the
+        recorded changes, which the snapshot includes. The event refers to
+        the state itself, so encode it before changing the state again.
+        """
+        self._operations = []
+        return StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=self._data, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"StateTracker({self._data!r}, pending={len(self._operations)})"
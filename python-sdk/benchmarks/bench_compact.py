@@ -0,0 +1,70 @@
+"""
+Compares the memory held by buffered events as pydantic models and as the
+compact records of `ag_ui.core.compact`, measured with tracemalloc. Field
+values (ids and deltas) are shared between both representations, so only the
+per-event overhead is counted.
+
+Run from the python-sdk directory:
+
+    python -m benchmarks.bench_compact
+"""
+
+import gc
+import timeit
+import tracemalloc
+
+from ag_ui.core import EventType, TextMessageContentEvent, ToolCallArgsEvent, compact
+from ag_ui.encoder import EventEncoder
+
+COUNT = 100_000
+
+
+def allocated(build) -> float:
+    """Returns the bytes per event allocated by build()."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / COUNT
+
+
+def main() -> None:
+    """Prints bytes per event and encode time for both representations."""
+    message_id = "5f2a7c1e-9d4b-4b6e-8f3a-2c1d0e9b8a7f"
+    deltas = [f" token{i % 100}" for i in range(COUNT)]
+    cases = {
+        "TextMessageContentEvent": (
+            lambda delta: TextMessageContentEvent(
+                type=EventType.TEXT_MESSAGE_CONTENT, message_id=message_id, delta=delta
+            ),
+            lambda delta: compact.TextMessageContentEvent(message_id=message_id, delta=delta),
+        ),
+        "ToolCallArgsEvent": (
+            lambda delta: ToolCallArgsEvent(
+                type=EventType.TOOL_CALL_ARGS, tool_call_id=message_id, delta=delta
+            ),
+            lambda delta: compact.ToolCallArgsEvent(tool_call_id=message_id, delta=delta),
+        ),
+    }
+    encoder = EventEncoder()
+    print(f"{'event':<26}{'model B':>9}{'record B':>10}{'saved':>8}{'model us':>10}{'record us':>11}")
+    for name, (model, record) in cases.items():
+        model_bytes = allocated(lambda: [model(delta) for delta in deltas])
+        record_bytes = allocated(lambda: [record(delta) for delta in deltas])
+        event, compact_event = model(deltas[0]), record(deltas[0])
+        model_time = min(timeit.repeat(lambda: encoder.encode(event), number=20000, repeat=5))
+        record_time = min(timeit.repeat(
+            lambda: encoder.encode(compact_event), number=20000, repeat=5
+        ))
+        print(
+            f"{name:<26}{model_bytes:>9.0f}{record_bytes:>10.0f}"
+            f"{1 - record_bytes / model_bytes:>8.0%}"
+            f"{model_time / 20000 * 1e6:>10.2f}{record_time / 20000 * 1e6:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
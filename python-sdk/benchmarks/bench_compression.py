@@ -0,0 +1,103 @@
+"""
+Measures bandwidth and flush latency of the streaming compression on a
+recorded-style stream: a 2,000 token assistant message followed by a tool call
+whose arguments are streamed in small fragments.
+
+Batching N frames per flush saves bytes but holds back up to N - 1 frames,
+which at the given token interval adds up to (N - 1) * interval of latency.
+
+Run from the python-sdk directory:
+
+    python -m benchmarks.bench_compression
+"""
+
+import json
+import random
+import time
+
+from ag_ui.core import (
+    EventType,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+)
+from ag_ui.encoder import EventEncoder
+from ag_ui.encoder.compression import SUPPORTED_ENCODINGS
+
+TOKEN_INTERVAL_MS = 20.0
+WORDS = (
+    "the agent will now search for the latest weather report and summarize the "
+    "results for the user in a short and friendly paragraph with some details"
+).split()
+
+
+def recorded_stream():
+    """Builds the events of a typical streamed run."""
+    rng = random.Random(0)
+    message_id = "5f2a7c1e-9d4b-4b6e-8f3a-2c1d0e9b8a7f"
+    events = [
+        TextMessageStartEvent(
+            type=EventType.TEXT_MESSAGE_START, message_id=message_id, role="assistant"
+        )
+    ]
+    for _ in range(2000):
+        events.append(TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id=message_id,
+            delta=" " + rng.choice(WORDS),
+        ))
+    events.append(TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id=message_id))
+
+    tool_call_id = "call_Qm3x9a0bZk4LwP1c"
+    arguments = json.dumps({"document": " ".join(rng.choice(WORDS) for _ in range(300))})
+    events.append(ToolCallStartEvent(
+        type=EventType.TOOL_CALL_START, tool_call_id=tool_call_id, tool_call_name="write_document"
+    ))
+    for start in range(0, len(arguments), 4):
+        events.append(ToolCallArgsEvent(
+            type=EventType.TOOL_CALL_ARGS,
+            tool_call_id=tool_call_id,
+            delta=arguments[start:start + 4],
+        ))
+    events.append(ToolCallEndEvent(type=EventType.TOOL_CALL_END, tool_call_id=tool_call_id))
+    return events
+
+
+def measure(events, accept_encoding, batch_size):
+    """Returns total bytes and encode time per flush for one configuration."""
+    encoder = EventEncoder(accept_encoding=accept_encoding)
+    total = 0
+    start = time.perf_counter()
+    for index in range(0, len(events), batch_size):
+        batch = events[index:index + batch_size]
+        if batch_size == 1:
+            total += len(encoder.encode_binary(batch[0]))
+        else:
+            total += len(encoder.encode_batch(batch))
+    total += len(encoder.finish())
+    elapsed = time.perf_counter() - start
+    flushes = (len(events) + batch_size - 1) // batch_size
+    return total, elapsed / flushes * 1e6
+
+
+def main() -> None:
+    """Prints bytes, ratio and latency for every coding and batch size."""
+    events = recorded_stream()
+    baseline, _ = measure(events, None, 1)
+    print(f"{len(events)} events, {baseline} bytes uncompressed\n")
+    print(f"{'encoding':<10}{'batch':>6}{'bytes':>10}{'ratio':>8}{'us/flush':>10}{'added ms':>10}")
+    for encoding in (None,) + SUPPORTED_ENCODINGS:
+        for batch_size in (1, 4, 16):
+            total, per_flush = measure(events, encoding, batch_size)
+            print(
+                f"{encoding or 'identity':<10}{batch_size:>6}{total:>10}"
+                f"{baseline / total:>8.1f}{per_flush:>10.1f}"
+                f"{(batch_size - 1) * TOKEN_INTERVAL_MS:>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Measures the construction cost per event type: the validating constructor,
+pydantic's `model_construct`, and `BaseEvent.trusted` in trusted and strict
+mode. Every timing is the best of five runs.
+
+Flat events gain little, as pydantic validates a few strings about as fast
+as the trusted path copies them. The gain is in events that carry models
+built by the agent, such as a snapshot of a long conversation, which the
+constructor validates again message by message.
+
+Run from the python-sdk directory:
+
+    python -m benchmarks.bench_construction
+"""
+
+import timeit
+from typing import Callable
+
+from ag_ui.core import (
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageChunkEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+    MessagesSnapshotEvent,
+    RunStartedEvent,
+    UserMessage,
+    AssistantMessage,
+    set_strict_construction,
+)
+
+CASES = [
+    (TextMessageStartEvent, {"message_id": "msg_1", "role": "assistant"}),
+    (TextMessageContentEvent, {"message_id": "msg_1", "delta": " token"}),
+    (TextMessageChunkEvent, {"message_id": "msg_1", "delta": " token"}),
+    (ToolCallStartEvent, {"tool_call_id": "call_1", "tool_call_name": "search"}),
+    (ToolCallArgsEvent, {"tool_call_id": "call_1", "delta": '{"query": "wea'}),
+    (StateSnapshotEvent, {"snapshot": {"steps": [{"status": "pending"}] * 20}}),
+    (StateDeltaEvent, {"delta": [{"op": "replace", "path": "/steps/3/status", "value": "done"}]}),
+    (MessagesSnapshotEvent, {"messages": [
+        UserMessage(id="u1", role="user", content="hi"),
+        AssistantMessage(id="a1", role="assistant", content="hello"),
+    ]}),
+    (MessagesSnapshotEvent, {"messages": [
+        UserMessage(id=f"u{i}", role="user", content="hi " * 20) if i % 2 else
+        AssistantMessage(id=f"a{i}", role="assistant", content="hello " * 20)
+        for i in range(100)
+    ]}),
+    (RunStartedEvent, {"thread_id": "thread_1", "run_id": "run_1"}),
+]
+
+
+def best(function: Callable[[], object], number: int) -> float:
+    """Returns the best time of five runs in microseconds per call."""
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def main(number: int = 20000) -> None:
+    """Prints the construction time per event in microseconds."""
+    print(
+        f"{'event':<30}{'validated':>10}{'construct':>10}{'strict':>8}{'trusted':>9}{'speedup':>9}"
+    )
+    for cls, values in CASES:
+        event_type = cls.trusted(**values).type
+        name = cls.__name__
+        if "messages" in values:
+            name += f" ({len(values['messages'])})"
+        timings = [
+            best(lambda: cls(type=event_type, **values), number),
+            best(lambda: cls.model_construct(type=event_type, **values), number),
+        ]
+        set_strict_construction(True)
+        timings.append(best(lambda: cls.trusted(**values), number))
+        set_strict_construction(False)
+        timings.append(best(lambda: cls.trusted(**values), number))
+        print(
+            f"{name:<30}"
+            + "".join(
+                f"{timing:>{width}.2f}" for timing, width in zip(timings, (10, 10, 8, 9))
+            )
+            + f"{timings[0] / timings[3]:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Compares the request handling time of a FastAPI endpoint that declares
+`input_data: RunAgentInput` (the signature of the example servers) with the
+`run_agent_input()` dependency, for large states and long histories. The
+app is called directly through ASGI, without a network round-trip.
+
+Requires fastapi. Run from the python-sdk directory:
+
+    python -m benchmarks.bench_fastapi
+"""
+
+import asyncio
+import gc
+import json
+import time
+
+from fastapi import Depends, FastAPI
+
+from ag_ui.core import RunAgentInput
+from ag_ui.server.fastapi import run_agent_input
+
+from benchmarks.bench_parsing import thread
+
+
+def make_app() -> FastAPI:
+    """Returns an app with both endpoint signatures."""
+    app = FastAPI()
+
+    @app.post("/model")
+    async def model_endpoint(input_data: RunAgentInput):
+        return input_data.run_id
+
+    @app.post("/raw")
+    async def raw_endpoint(input_data: RunAgentInput = Depends(run_agent_input())):
+        return input_data.run_id
+
+    @app.post("/lazy")
+    async def lazy_endpoint(input_data: RunAgentInput = Depends(run_agent_input(lazy=True))):
+        return input_data.run_id
+
+    return app
+
+
+async def call(app: FastAPI, path: str, body: bytes) -> None:
+    """Posts the body to the app and checks the status."""
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "POST",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "scheme": "http",
+        "server": ("test", 80),
+        "headers": [(b"content-type", b"application/json")],
+    }
+    sent = False
+    status = []
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    assert status == [200], status
+
+
+async def best(app: FastAPI, path: str, body: bytes, number: int) -> float:
+    """Returns the best time per request in milliseconds."""
+    times = []
+    for _ in range(5):
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(number):
+            await call(app, path, body)
+        times.append((time.perf_counter() - start) / number * 1e3)
+    return min(times)
+
+
+async def run() -> None:
+    """Prints the time per request for each endpoint."""
+    app = make_app()
+    state = {"rows": [{"id": i, "name": f"row {i}", "tags": ["a", "b"]} for i in range(20000)]}
+    payloads = {
+        "100 messages": thread(100),
+        "2000 messages": thread(2000),
+        "10000 messages": thread(10000),
+        "1 MB state": json.dumps({**json.loads(thread(10)), "state": state}).encode("utf-8"),
+    }
+    print(f"{'payload':<16}{'KB':>6}{'RunAgentInput':>16}{'validate_json':>16}{'lazy':>10}")
+    for name, body in payloads.items():
+        number = max(int(2e6 // len(body)), 3)
+        times = [await best(app, path, body, number) for path in ("/model", "/raw", "/lazy")]
+        print(
+            f"{name:<16}{len(body) / 1024:>6.0f}"
+            f"{times[0]:>14.2f}ms{times[1]:>14.2f}ms{times[2]:>8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
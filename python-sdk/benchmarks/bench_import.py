@@ -0,0 +1,83 @@
+"""
+Measures the cold start of the SDK with `python -X importtime`: the import
+time of common entry points, the time from the first import to the first
+encoded event, and the time of the first event after `ag_ui.core.warmup()`.
+Each scenario runs in a fresh interpreter; the median of seven runs is shown.
+
+Run from the python-sdk directory:
+
+    python -m benchmarks.bench_import
+"""
+
+import statistics
+import subprocess
+import sys
+
+RUNS = 7
+
+SCENARIOS = {
+    "import pydantic": "import pydantic",
+    "import ag_ui.core": "import ag_ui.core",
+    "from ag_ui.core import RunAgentInput": "from ag_ui.core import RunAgentInput",
+    "from ag_ui.core import TextMessageContentEvent":
+        "from ag_ui.core import TextMessageContentEvent",
+    "import ag_ui.encoder": "import ag_ui.encoder",
+}
+
+FIRST_EVENT = """
+import time
+{setup}
+start = time.perf_counter()
+from ag_ui.core import EventType, TextMessageContentEvent
+from ag_ui.encoder import EventEncoder
+EventEncoder().encode(TextMessageContentEvent(
+    type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="hi"
+))
+print((time.perf_counter() - start) * 1000)
+"""
+
+WARMUP = """
+import ag_ui.core
+import ag_ui.encoder
+ag_ui.core.warmup()
+"""
+
+
+def import_time(statement: str) -> float:
+    """Returns the total import time of a statement in milliseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True, check=True,
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # only top-level imports, their cumulative time includes the rest
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+    return total / 1000
+
+
+def first_event_time(warmup: bool) -> float:
+    """Returns the milliseconds until the first event is encoded."""
+    code = FIRST_EVENT.format(setup=WARMUP if warmup else "")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(result.stdout)
+
+
+def main() -> None:
+    """Prints the median import and first event times."""
+    print(f"{'scenario':<50}{'ms':>8}")
+    for name, statement in SCENARIOS.items():
+        median = statistics.median(import_time(statement) for _ in range(RUNS))
+        print(f"{name:<50}{median:>8.1f}")
+    for warmup in (False, True):
+        median = statistics.median(first_event_time(warmup) for _ in range(RUNS))
+        label = "first encoded event after warmup()" if warmup else "first encoded event"
+        print(f"{label:<50}{median:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
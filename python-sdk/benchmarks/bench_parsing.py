@@ -0,0 +1,69 @@
+"""
+Compares full validation of a RunAgentInput with lazy message validation
+for long threads, where the agent only reads the most recent messages, and
+with a warm MessageCache that already holds the thread's messages.
+
+Run from the python-sdk directory:
+
+    python -m benchmarks.bench_parsing
+"""
+
+import json
+import timeit
+
+from ag_ui.core import MessageCache, parse_run_agent_input
+
+
+def thread(count: int) -> bytes:
+    """Returns a RunAgentInput body with a thread of count messages."""
+    messages = []
+    for i in range(count // 4):
+        messages.extend([
+            {"id": f"u{i}", "role": "user", "content": f"Please look up item {i}."},
+            {
+                "id": f"a{i}",
+                "role": "assistant",
+                "toolCalls": [{
+                    "id": f"c{i}",
+                    "type": "function",
+                    "function": {"name": "lookup", "arguments": json.dumps({"item": i})},
+                }],
+            },
+            {"id": f"t{i}", "role": "tool", "content": json.dumps({"item": i}), "toolCallId": f"c{i}"},
+            {"id": f"r{i}", "role": "assistant", "content": f"Item {i} is in stock."},
+        ])
+    return json.dumps({
+        "threadId": "t1",
+        "runId": "r1",
+        "state": {"cart": list(range(20))},
+        "messages": messages,
+        "tools": [{"name": "lookup", "description": "Look up an item", "parameters": {}}],
+        "context": [],
+        "forwardedProps": {},
+    }).encode("utf-8")
+
+
+def main() -> None:
+    """Prints the parse time per request for each policy."""
+    cache = MessageCache(max_messages=100_000)
+    policies = {
+        "full": lambda data: parse_run_agent_input(data),
+        "lazy": lambda data: parse_run_agent_input(data, lazy=True),
+        "lazy, last 20 eager": lambda data: parse_run_agent_input(
+            data, lazy=True, eager_messages=20
+        ),
+        "warm cache": lambda data: parse_run_agent_input(data, message_cache=cache),
+    }
+    print(f"{'messages':>8}{'KB':>7}" + "".join(f"{name:>22}" for name in policies))
+    for count in (100, 2000, 10000):
+        data = thread(count)
+        number = max(2000 // count, 3)
+        times = [
+            min(timeit.repeat(lambda: parse(data), number=number, repeat=5)) / number * 1e3
+            for parse in policies.values()
+        ]
+        print(f"{count:>8}{len(data) / 1024:>7.0f}" + "".join(f"{t:>20.2f}ms" for t in times))
+
+
+if __name__ == "__main__":
+    main()
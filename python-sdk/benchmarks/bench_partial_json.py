@@ -0,0 +1,110 @@
+"""
+Compares two ways to preview the arguments of a streamed tool call after
+every TOOL_CALL_ARGS delta: parsing the accumulated buffer again, closing
+the open strings and brackets first, and feeding each delta to
+`PartialJSONParser`.
+
+The arguments are a list of steps, or one long string. Re-parsing costs
+the length of the buffer for every delta, so the total is quadratic in the
+size of the arguments; the parser reads each delta once.
+
+Run from the python-sdk directory:
+
+    python -m benchmarks.bench_partial_json
+"""
+
+import json
+import time
+
+from ag_ui.decoder import PartialJSONParser
+
+
+def arguments(steps: int) -> str:
+    """Returns the arguments of a generative UI tool call with the given number of steps."""
+    return json.dumps({
+        "steps": [
+            {"description": f"Step {i + 1}: " + "do something useful " * 3, "status": "pending"}
+            for i in range(steps)
+        ],
+    })
+
+
+def story(paragraphs: int) -> str:
+    """Returns the arguments of a tool call with one long string, e.g. a document to write."""
+    return json.dumps({"title": "A story", "story": "Once upon a \"time\", there was a dragon.\n" * paragraphs})
+
+
+def deltas(text: str, size: int = 4) -> list:
+    """Splits the text into deltas of about the size of a token."""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def close_buffer(buffer: str) -> str:
+    """Closes the open strings and brackets of a JSON prefix, as re-parsing previews do."""
+    closers = []
+    in_string = escape = False
+    for char in buffer:
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+        elif char in "}]":
+            closers.pop()
+    text = buffer.rstrip("\\") if escape else buffer
+    if in_string:
+        text += '"'
+    return text + "".join(reversed(closers))
+
+
+def reparse(chunks: list) -> None:
+    """Parses the accumulated buffer after every delta."""
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        try:
+            json.loads(close_buffer(buffer))
+        except ValueError:
+            pass  # e.g. a buffer that ends after a key or a comma
+
+
+def incremental(chunks: list) -> None:
+    """Feeds every delta to the parser and reads the partial value."""
+    parser = PartialJSONParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+        parser.value  # pylint: disable=pointless-statement
+    parser.close()
+
+
+def measure(function, chunks: list, repeat: int) -> float:
+    """Returns the best time in milliseconds of repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(chunks)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    print(f"{'arguments':>12} {'deltas':>8} {'re-parse':>12} {'incremental':>14}")
+    cases = [(arguments(steps), steps) for steps in (5, 50, 500)]
+    cases += [(story(paragraphs), paragraphs) for paragraphs in (10, 100, 1000)]
+    for text, count in cases:
+        chunks = deltas(text)
+        repeat = 20 if count < 500 else 1
+        reparse_ms = measure(reparse, chunks, repeat)
+        incremental_ms = measure(incremental, chunks, repeat)
+        size = sum(len(chunk) for chunk in chunks)
+        print(f"{size:>10} B {len(chunks):>8} {reparse_ms:>9.2f} ms {incremental_ms:>11.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compares bytes per event and encode time of the SSE and protobuf encodings.
+
+Run from the python-sdk directory:
+
+    python -m benchmarks.bench_proto
+"""
+
+import timeit
+
+from ag_ui.core import (
+    EventType,
+    TextMessageContentEvent,
+    ToolCallArgsEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+)
+from ag_ui.encoder import EventEncoder, AGUI_MEDIA_TYPE
+
+EVENTS = {
+    "TEXT_MESSAGE_CONTENT": TextMessageContentEvent(
+        type=EventType.TEXT_MESSAGE_CONTENT,
+        message_id="5f2a7c1e-9d4b-4b6e-8f3a-2c1d0e9b8a7f",
+        delta=" token",
+    ),
+    "TOOL_CALL_ARGS": ToolCallArgsEvent(
+        type=EventType.TOOL_CALL_ARGS,
+        tool_call_id="call_Qm3x9a0bZk4LwP1c",
+        delta='{"query": "wea',
+    ),
+    "STATE_SNAPSHOT": StateSnapshotEvent(
+        type=EventType.STATE_SNAPSHOT,
+        snapshot={
+            "steps": [
+                {"description": f"Step {i}", "status": "completed" if i % 2 else "pending"}
+                for i in range(20)
+            ]
+        },
+    ),
+    "STATE_DELTA": StateDeltaEvent(
+        type=EventType.STATE_DELTA,
+        delta=[{"op": "replace", "path": "/steps/3/status", "value": "completed"}],
+    ),
+}
+
+
+def main(number: int = 20000) -> None:
+    """Prints a table with size and encode time per event type."""
+    sse = EventEncoder()
+    proto = EventEncoder(accept=AGUI_MEDIA_TYPE, binary=True)
+
+    print(f"{'event':<22}{'sse bytes':>10}{'proto bytes':>12}{'sse us':>9}{'proto us':>10}")
+    for name, event in EVENTS.items():
+        sse_bytes = len(sse.encode_binary(event))
+        proto_bytes = len(proto.encode_binary(event))
+        sse_time = timeit.timeit(lambda: sse.encode_binary(event), number=number)
+        proto_time = timeit.timeit(lambda: proto.encode_binary(event), number=number)
+        print(
+            f"{name:<22}{sse_bytes:>10}{proto_bytes:>12}"
+            f"{sse_time / number * 1e6:>9.2f}{proto_time / number * 1e6:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
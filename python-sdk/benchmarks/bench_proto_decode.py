@@ -0,0 +1,70 @@
+"""
+Measures decoding of STATE_SNAPSHOT events of growing size: the protobuf
+decoder, which converts google.protobuf.Value straight into Python objects,
+against the SSE decoder and, when the protobuf runtime is installed,
+against parsing the snapshot with `Value.FromString` and `MessageToDict`.
+
+Run from the python-sdk directory:
+
+    python -m benchmarks.bench_proto_decode
+"""
+
+import timeit
+
+from ag_ui.core import EventType, StateSnapshotEvent
+from ag_ui.decoder import ProtoDecoder, SSEDecoder
+from ag_ui.encoder import EventEncoder, AGUI_MEDIA_TYPE
+from ag_ui.proto.proto import _encode_value
+
+try:
+    from google.protobuf import json_format, struct_pb2
+except ImportError:  # pragma: no cover
+    struct_pb2 = None
+
+
+def snapshot_event(rows: int) -> StateSnapshotEvent:
+    """Builds a snapshot with `rows` table rows of mixed value types."""
+    return StateSnapshotEvent(
+        type=EventType.STATE_SNAPSHOT,
+        snapshot={
+            "rows": [
+                {
+                    "id": i,
+                    "title": f"Document {i}",
+                    "score": i / 7,
+                    "done": i % 2 == 0,
+                    "tags": ["a", "b", None],
+                }
+                for i in range(rows)
+            ]
+        },
+    )
+
+
+def main() -> None:
+    """Prints the decode time per event for every snapshot size."""
+    print(f"{'rows':>6}{'proto KB':>10}{'proto ms':>10}{'sse ms':>9}{'MessageToDict ms':>18}")
+    for rows in (10, 1000, 20000):
+        event = snapshot_event(rows)
+        proto_frame = EventEncoder(accept=AGUI_MEDIA_TYPE, binary=True).encode_binary(event)
+        sse_frame = EventEncoder().encode_binary(event)
+        number = max(1, 2000 // rows)
+
+        proto_time = timeit.timeit(lambda: ProtoDecoder().feed(proto_frame), number=number)
+        sse_time = timeit.timeit(lambda: SSEDecoder().feed(sse_frame), number=number)
+        runtime = "n/a"
+        if struct_pb2 is not None:
+            value = bytes(_encode_value(event.snapshot))
+            runtime_time = timeit.timeit(
+                lambda: json_format.MessageToDict(struct_pb2.Value.FromString(value)),
+                number=number,
+            )
+            runtime = f"{runtime_time / number * 1e3:.3f}"
+        print(
+            f"{rows:>6}{len(proto_frame) / 1024:>10.1f}"
+            f"{proto_time / number * 1e3:>10.3f}{sse_time / number * 1e3:>9.3f}{runtime:>18}"
+        )
+
+
+if __name__ == "__main__":
+    main()
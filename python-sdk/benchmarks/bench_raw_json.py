@@ -0,0 +1,45 @@
+"""
+Compares encoding a large state snapshot from Python objects with encoding
+it from pre-encoded JSON wrapped in RawJSON.
+
+Run from the python-sdk directory:
+
+    python -m benchmarks.bench_raw_json
+"""
+
+import timeit
+
+from ag_ui.core import EventType, RawJSON, StateSnapshotEvent
+from ag_ui.encoder import EventEncoder
+
+
+def state(rows: int) -> dict:
+    """Returns a state with the given number of rows."""
+    return {
+        "rows": [
+            {"id": i, "name": f"row {i}", "done": i % 3 == 0, "tags": ["a", "b"], "score": i / 7}
+            for i in range(rows)
+        ]
+    }
+
+
+def main() -> None:
+    """Prints the encode time per snapshot for both representations."""
+    encoder = EventEncoder()
+    print(f"{'KB':>6}{'objects':>12}{'RawJSON':>12}")
+    for rows in (100, 1000, 6000):
+        value = state(rows)
+        raw = RawJSON.dumps(value)
+        event = StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=value)
+        raw_event = StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=raw)
+        number = max(30000 // rows, 5)
+        times = [
+            min(timeit.repeat(lambda e=e: encoder.encode_binary(e), number=number, repeat=5))
+            / number * 1e3
+            for e in (event, raw_event)
+        ]
+        print(f"{len(raw.text) / 1024:>6.0f}{times[0]:>10.3f}ms{times[1]:>10.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Compares the precompiled event serializers with `model_dump_json` for every
+event class, and the encoder's byte output for a large STATE_SNAPSHOT with
+SSE written from the JSON bytes of pydantic-core.
+
+Run from the python-sdk directory:
+
+    python -m benchmarks.bench_serializers
+"""
+
+import timeit
+
+from ag_ui.core import EventType, StateSnapshotEvent, UserMessage
+from ag_ui.encoder import EventEncoder
+from ag_ui.encoder.serializers import event_classes, get_serializer
+
+MESSAGE_ID = "5f2a7c1e-9d4b-4b6e-8f3a-2c1d0e9b8a7f"
+TOOL_CALL_ID = "call_Qm3x9a0bZk4LwP1c"
+
+FIELD_VALUES = {
+    "message_id": MESSAGE_ID,
+    "tool_call_id": TOOL_CALL_ID,
+    "tool_call_name": "search",
+    "delta": " token",
+    "role": "assistant",
+    "content": "The weather is sunny.",
+    "thread_id": "thread_1",
+    "run_id": "run_1",
+    "step_name": "plan",
+    "name": "PredictState",
+    "message": "Something went wrong",
+    "snapshot": {"steps": [{"description": "Step 1", "status": "pending"}]},
+    "value": {"tool": "write_document"},
+    "event": {"type": "upstream"},
+    "messages": [UserMessage(id="u1", role="user", content="Hi")],
+}
+
+
+def make_event(cls):
+    """Builds an event of the given class with its required fields set."""
+    kwargs = {}
+    for name, field in cls.model_fields.items():
+        if name == "type":
+            continue
+        if name == "delta" and cls.__name__ == "StateDeltaEvent":
+            kwargs[name] = [{"op": "replace", "path": "/steps/0/status", "value": "done"}]
+        elif field.is_required() or name in ("delta", "message_id", "tool_call_id"):
+            kwargs[name] = FIELD_VALUES[name]
+    if cls.__name__ == "ToolCallResultEvent":
+        kwargs["role"] = "tool"
+    event_type = cls.model_fields["type"].annotation.__args__[0]
+    return cls(type=EventType(event_type), **kwargs)
+
+
+def main(number: int = 20000) -> None:
+    """Prints the serialization time per event class for both paths."""
+    print(f"{'event':<34}{'pydantic us':>12}{'fast us':>10}{'speedup':>9}")
+    for cls in event_classes():
+        if cls.__name__ == "BaseEvent":
+            continue
+        event = make_event(cls)
+        serializer = get_serializer(cls)
+        assert serializer(event) == event.model_dump_json(by_alias=True, exclude_none=True)
+        generic = timeit.timeit(
+            lambda: event.model_dump_json(by_alias=True, exclude_none=True), number=number
+        )
+        fast = timeit.timeit(lambda: serializer(event), number=number)
+        print(
+            f"{cls.__name__:<34}{generic / number * 1e6:>12.2f}"
+            f"{fast / number * 1e6:>10.2f}{generic / fast:>8.1f}x"
+        )
+    large_snapshot()
+
+
+def large_snapshot(number: int = 20) -> None:
+    """Prints the time to encode a snapshot of about 1 MB as SSE bytes."""
+    snapshot = {
+        "steps": [
+            {"description": f"Step {i + 1} " + "x" * 60, "status": "pending", "index": i}
+            for i in range(8000)
+        ],
+    }
+    event = StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=snapshot)
+    encoder = EventEncoder()
+    size = len(encoder.encode_binary(event))
+
+    def pydantic_bytes():
+        return b"".join((
+            b"data: ",
+            event.__pydantic_serializer__.to_json(event, by_alias=True, exclude_none=True),
+            b"\n\n",
+        ))
+
+    assert encoder.encode_binary(event) == pydantic_bytes()
+    generic = min(timeit.repeat(pydantic_bytes, number=number, repeat=5))
+    fast = min(timeit.repeat(lambda: encoder.encode_binary(event), number=number, repeat=5))
+    name = f"STATE_SNAPSHOT {size / 1e6:.1f} MB, ms"
+    print(
+        f"{name:<34}{generic / number * 1e3:>12.2f}"
+        f"{fast / number * 1e3:>10.2f}{generic / fast:>8.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
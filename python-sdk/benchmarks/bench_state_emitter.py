@@ -0,0 +1,72 @@
+"""
+Compares the bytes sent and the time spent for a generative UI run when
+every update is sent as a snapshot, as a delta, or as chosen by the
+StateEmitter.
+
+The run updates the steps of a plan one by one and replans from time to
+time, which replaces every step.
+
+Run from the python-sdk directory:
+
+    python -m benchmarks.bench_state_emitter
+"""
+
+import time
+
+from ag_ui.core import RawJSON
+from ag_ui.encoder import EventEncoder
+from ag_ui.state import StateEmitter, StateTracker
+
+
+def plan(steps: int, version: int) -> list:
+    """Returns a plan with the given number of steps."""
+    return [
+        {"description": f"Step {i + 1} of plan {version}", "status": "pending", "detail": "x" * 40}
+        for i in range(steps)
+    ]
+
+
+def run(steps: int, mode: str) -> tuple:
+    """Returns the bytes encoded and the seconds spent for one run."""
+    encoder = EventEncoder()
+    tracker = StateTracker({"steps": plan(steps, 0)})
+    emitter = StateEmitter(tracker)
+    sent = len(encoder.encode_binary(emitter.next_event()))
+    start = time.perf_counter()
+    for version in range(1, 6):
+        for i in range(steps):
+            tracker.state["steps"][i]["status"] = "completed"
+            if mode == "snapshot":
+                tracker.patch()
+                event = tracker.snapshot_event()
+            elif mode == "delta":
+                event = tracker.delta_event()
+            else:
+                event = emitter.next_event()
+            sent += len(encoder.encode_binary(event))
+        tracker.state["steps"] = plan(steps, version)
+        if mode == "snapshot":
+            tracker.patch()
+            event = tracker.snapshot_event()
+        elif mode == "delta":
+            event = tracker.delta_event()
+        else:
+            event = emitter.next_event()
+        sent += len(encoder.encode_binary(event))
+    return sent, time.perf_counter() - start
+
+
+def main() -> None:
+    """Prints the bytes and time per run for each mode."""
+    print(f"{'state KB':>9}" + "".join(f"{mode:>22}" for mode in ("snapshot", "delta", "emitter")))
+    for steps in (10, 100, 1000):
+        size = len(RawJSON.dumps({"steps": plan(steps, 0)}).text) / 1024
+        results = [min((run(steps, mode) for _ in range(3)), key=lambda r: r[1])
+                   for mode in ("snapshot", "delta", "emitter")]
+        print(f"{size:>9.0f}" + "".join(
+            f"{sent / 1024:>10.0f}KB{seconds * 1e3:>8.1f}ms" for sent, seconds in results
+        ))
+
+
+if __name__ == "__main__":
+    main()
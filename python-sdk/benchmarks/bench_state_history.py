@@ -0,0 +1,68 @@
+"""
+Measures patch compaction and checkpointed reconstruction on the log of a
+generative UI run, where every step of a plan goes through a few statuses
+and log lines are appended.
+
+For each plan size it prints the operations in the log and after
+compaction, the time to compact the log without and with the initial
+state (which tells list indexes from object keys), the time to rebuild
+the final state by applying every operation or the compacted patch to the
+initial state, and the time to rebuild the state before the last entry
+from the nearest checkpoint.
+
+Run from the python-sdk directory:
+
+    python -m benchmarks.bench_state_history
+"""
+
+import copy
+import timeit
+
+from ag_ui.state import StateHistory, StateTracker, apply_patch, compact_patches
+
+
+def run_log(steps: int) -> tuple:
+    """Returns the initial state and the patches of a run."""
+    tracker = StateTracker({
+        "steps": [{"description": f"Step {i + 1}", "status": "pending"} for i in range(steps)],
+        "log": [],
+    })
+    initial = copy.deepcopy(tracker.data)
+    patches = []
+    for i in range(steps):
+        for status in ("running", "checking", "completed"):
+            tracker.state["steps"][i]["status"] = status
+            patches.append(tracker.patch())
+        tracker.state["log"].append(f"Finished step {i + 1}")
+        patches.append(tracker.patch())
+    return initial, patches
+
+
+def best(func, number: int = 5) -> float:
+    """Returns the best time per call in milliseconds."""
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e3
+
+
+def main() -> None:
+    """Prints the compaction and reconstruction results."""
+    print(f"{'steps':>6}{'ops':>8}{'compacted':>11}{'compact':>11}{'w/ state':>11}{'apply all':>11}"
+          f"{'compacted':>11}{'checkpoint':>12}")
+    for steps in (25, 100, 500):
+        initial, patches = run_log(steps)
+        compacted = compact_patches(patches)
+        history = StateHistory(initial, checkpoint_interval=50)
+        for patch in patches:
+            history.append(patch)
+        operations = [op for patch in patches for op in patch]
+        print(
+            f"{steps:>6}{len(operations):>8}{len(compacted):>11}"
+            f"{best(lambda: compact_patches(patches)):>9.2f}ms"
+            f"{best(lambda: compact_patches(patches, initial)):>9.2f}ms"
+            f"{best(lambda: apply_patch(initial, operations)):>9.2f}ms"
+            f"{best(lambda: apply_patch(initial, compacted)):>9.2f}ms"
+            f"{best(lambda: history.state_at(len(patches) - 1)):>10.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
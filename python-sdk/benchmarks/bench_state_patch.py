@@ -0,0 +1,87 @@
+"""
+Compares applying a stream of STATE_DELTA patches with `jsonpatch` and with
+`ag_ui.state.apply_patch`, both copying (the default of each) and in place.
+
+The stream is what a generative UI agent sends: steps are updated one by
+one, with an occasional step added or a log line appended.
+
+Run from the python-sdk directory (the comparison requires jsonpatch):
+
+    python -m benchmarks.bench_state_patch
+"""
+
+import copy
+import json
+import time
+
+from ag_ui.state import apply_patch
+
+try:
+    import jsonpatch
+except ImportError:
+    jsonpatch = None
+
+
+def state(steps: int) -> dict:
+    """Returns a generative UI state with the given number of steps."""
+    return {
+        "steps": [
+            {"description": f"Step {i + 1}", "status": "pending", "detail": "x" * 40}
+            for i in range(steps)
+        ],
+        "log": [],
+    }
+
+
+def stream(steps: int, count: int) -> list:
+    """Returns count patches of the kind an agent sends while it works."""
+    patches = []
+    for i in range(count):
+        index = i % steps
+        patch = [
+            {"op": "test", "path": f"/steps/{index}/description", "value": f"Step {index + 1}"},
+            {"op": "replace", "path": f"/steps/{index}/status", "value": "completed"},
+        ]
+        if i % 10 == 0:
+            patch.append({"op": "add", "path": "/log/-", "value": {"step": index, "text": "done"}})
+        patches.append(patch)
+    return patches
+
+
+def run(apply, document, patches) -> float:
+    """Returns the best time per patch in microseconds over three runs."""
+    times = []
+    for _ in range(3):
+        value = copy.deepcopy(document)
+        start = time.perf_counter()
+        for patch in patches:
+            value = apply(value, patch)
+        times.append(time.perf_counter() - start)
+    return min(times) / len(patches) * 1e6
+
+
+def main() -> None:
+    """Prints the time per patch for each applier."""
+    appliers = {
+        "apply_patch": apply_patch,
+        "in place": lambda document, patch: apply_patch(document, patch, in_place=True),
+    }
+    if jsonpatch is not None:
+        appliers = {
+            "jsonpatch": jsonpatch.apply_patch,
+            "jsonpatch in place": lambda document, patch: jsonpatch.apply_patch(
+                document, patch, in_place=True
+            ),
+            **appliers,
+        }
+    print(f"{'KB':>8}" + "".join(f"{name:>20}" for name in appliers))
+    for steps in (10, 100, 1000, 10000):
+        document = state(steps)
+        size = len(json.dumps(document)) / 1024
+        patches = stream(steps, max(200000 // steps, 200))
+        times = [run(apply, document, patches) for apply in appliers.values()]
+        print(f"{size:>8.0f}" + "".join(f"{t:>18.1f}us" for t in times))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Compares the per-update cost of producing a state delta with
+`jsonpatch.make_patch` plus `copy.deepcopy`, as the generative UI examples
+do, with recording the change through a StateTracker.
+
+Run from the python-sdk directory (the baseline requires jsonpatch):
+
+    python -m benchmarks.bench_state_tracker
+"""
+
+import copy
+import json
+import timeit
+
+from ag_ui.state import StateTracker
+
+try:
+    import jsonpatch
+except ImportError:
+    jsonpatch = None
+
+
+def state(steps: int) -> dict:
+    """Returns a generative UI state with the given number of steps."""
+    return {
+        "steps": [
+            {"description": f"Step {i + 1}", "status": "pending", "detail": "x" * 40}
+            for i in range(steps)
+        ]
+    }
+
+
+def best(func, number: int) -> float:
+    """Returns the best time per call in milliseconds."""
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e3
+
+
+def main() -> None:
+    """Prints the time per update for both approaches."""
+    print(f"{'KB':>8}{'diff+deepcopy':>16}{'tracker':>12}")
+    for steps in (10, 100, 1000, 10000, 100000):
+        value = state(steps)
+        size = len(json.dumps(value)) / 1024
+        number = max(100000 // steps, 3)
+
+        baseline = "n/a"
+        if jsonpatch is not None:
+            previous = [copy.deepcopy(value)]
+
+            def diff(value=value, previous=previous):
+                value["steps"][steps // 2]["status"] = "completed"
+                jsonpatch.make_patch(previous[0], value)
+                previous[0] = copy.deepcopy(value)
+
+            baseline = f"{best(diff, number):.3f}ms"
+
+        tracker = StateTracker(value)
+
+        def track(tracker=tracker):
+            tracker.state["steps"][steps // 2]["status"] = "completed"
+            tracker.delta_event()
+
+        print(f"{size:>8.0f}{baseline:>16}{best(track, number * 100):>10.4f}ms")
+
+
+if __name__ == "__main__":
+    main()
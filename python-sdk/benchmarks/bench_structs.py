@@ -0,0 +1,85 @@
+"""
+Compares decoding (with validation) and encoding of AG-UI JSON with the
+pydantic models and with the msgspec structs of `ag_ui.core.structs`.
+
+Requires msgspec. Run from the python-sdk directory:
+
+    python -m benchmarks.bench_structs
+"""
+
+import json
+import timeit
+
+from pydantic import TypeAdapter
+
+from ag_ui.core import Event, RunAgentInput, structs
+
+
+def run_agent_input(count: int) -> bytes:
+    """Returns a RunAgentInput with a conversation of count messages."""
+    messages = []
+    for i in range(count // 2):
+        messages.append({"id": f"u{i}", "role": "user", "content": f"Question {i} " * 20})
+        messages.append({
+            "id": f"a{i}",
+            "role": "assistant",
+            "content": f"Answer {i} " * 40,
+            "toolCalls": [{
+                "id": f"c{i}",
+                "type": "function",
+                "function": {"name": "search", "arguments": json.dumps({"q": i})},
+            }],
+        })
+    return json.dumps({
+        "threadId": "t1",
+        "runId": "r1",
+        "state": {"items": list(range(50))},
+        "messages": messages,
+        "tools": [{"name": "search", "description": "Search", "parameters": {"type": "object"}}],
+        "context": [],
+        "forwardedProps": {},
+    }).encode("utf-8")
+
+
+def best(func, number: int) -> float:
+    """Returns the best time per call in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    """Prints decode and encode times for both backends."""
+    event_adapter = TypeAdapter(Event)
+    cases = {
+        "TEXT_MESSAGE_CONTENT": (
+            b'{"type":"TEXT_MESSAGE_CONTENT","messageId":"m1","delta":" token"}',
+            event_adapter, structs.decode_event, 20000,
+        ),
+        "STATE_SNAPSHOT 10 KB": (
+            json.dumps({
+                "type": "STATE_SNAPSHOT",
+                "snapshot": {"rows": [{"id": i, "name": f"row {i}", "done": False}
+                                      for i in range(250)]},
+            }).encode("utf-8"),
+            event_adapter, structs.decode_event, 500,
+        ),
+        "RunAgentInput 100 msgs": (
+            run_agent_input(100),
+            TypeAdapter(RunAgentInput), structs.decode_run_agent_input, 200,
+        ),
+    }
+    print(f"{'payload':<24}{'pydantic dec':>14}{'struct dec':>12}"
+          f"{'pydantic enc':>14}{'struct enc':>12}")
+    for name, (data, adapter, decode, number) in cases.items():
+        model = adapter.validate_json(data)
+        struct = decode(data)
+        print(
+            f"{name:<24}"
+            f"{best(lambda: adapter.validate_json(data), number):>12.1f}us"
+            f"{best(lambda: decode(data), number):>10.1f}us"
+            f"{best(lambda: adapter.dump_json(model, by_alias=True, exclude_none=True), number):>12.1f}us"
+            f"{best(lambda: structs.encode(struct), number):>10.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
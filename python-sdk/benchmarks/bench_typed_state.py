@@ -0,0 +1,68 @@
+"""
+Compares a state model sent through the untyped `StateSnapshotEvent` with
+`StateSnapshotEvent[MyState]`, and parsing a RunAgentInput whose state is
+validated as a model with `parse_run_agent_input(state_type=MyState)`
+against validating the dict tree afterwards.
+
+Run from the python-sdk directory:
+
+    python -m benchmarks.bench_typed_state
+"""
+
+import json
+import timeit
+from typing import List
+
+from pydantic import BaseModel
+
+from ag_ui.core import EventType, RunAgentInput, StateSnapshotEvent, parse_run_agent_input
+from ag_ui.encoder import EventEncoder
+
+
+class Item(BaseModel):
+    """An item of the state."""
+    id: int
+    name: str
+    done: bool = False
+    tags: List[str] = []
+
+
+class FlowState(BaseModel):
+    """A flow state like the ones crewai flows keep."""
+    items: List[Item] = []
+    count: int = 0
+
+
+def best(func, number: int) -> float:
+    """Returns the best time per call in milliseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e3
+
+
+def main() -> None:
+    """Prints encode and parse times for untyped and typed state."""
+    encoder = EventEncoder()
+    print(f"{'items':>6}{'encode Any':>13}{'encode typed':>15}{'parse+validate':>17}"
+          f"{'state_type':>13}")
+    for count in (10, 1000, 10000):
+        state = FlowState(
+            items=[Item(id=i, name=f"item {i}", tags=["a", "b"]) for i in range(count)],
+            count=count,
+        )
+        untyped = StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=state)
+        typed = StateSnapshotEvent[FlowState](type=EventType.STATE_SNAPSHOT, snapshot=state)
+        body = json.dumps({
+            "threadId": "t1", "runId": "r1", "state": state.model_dump(), "messages": [],
+            "tools": [], "context": [], "forwardedProps": {},
+        }).encode("utf-8")
+        number = max(20000 // count, 5)
+        print(
+            f"{count:>6}"
+            f"{best(lambda: encoder.encode_binary(untyped), number):>11.3f}ms"
+            f"{best(lambda: encoder.encode_binary(typed), number):>13.3f}ms"
+            f"{best(lambda: FlowState.model_validate(RunAgentInput.model_validate_json(body).state), number):>15.3f}ms"
+            f"{best(lambda: parse_run_agent_input(body, state_type=FlowState), number):>11.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""
+Helpers shared by the tests of the encoder.
+"""
+
+from ag_ui.core.events import EventType, TextMessageContentEvent
+
+
+def content_event(delta: str) -> TextMessageContentEvent:
+    """Creates a text message content event"""
+    return TextMessageContentEvent(
+        type=EventType.TEXT_MESSAGE_CONTENT,
+        message_id="5f2a7c1e-9d4b-4b6e-8f3a-2c1d0e9b8a7f",
+        delta=delta,
+    )
@@ -0,0 +1,13 @@
+"""
+Helpers shared by the tests of `ag_ui.state`.
+"""
+
+
+def make_state(steps: int = 3) -> dict:
+    """Returns a state like the generative UI examples keep"""
+    return {
+        "steps": [
+            {"description": f"Step {i + 1}", "status": "pending", "tags": []} for i in range(steps)
+        ],
+        "meta": {"title": "Plan", "tags": ["a"]},
+    }
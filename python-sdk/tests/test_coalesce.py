@@ -0,0 +1,157 @@
+import asyncio
+import unittest
+
+from ag_ui.core.events import (
+    EventType,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageChunkEvent,
+    ToolCallArgsEvent,
+    ToolCallChunkEvent,
+)
+from ag_ui.encoder.coalesce import EventCoalescer, coalesce_events
+
+
+class FakeClock:
+    """A manually advanced clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def content(delta: str, message_id: str = "m1") -> TextMessageContentEvent:
+    """Creates a text message content event"""
+    return TextMessageContentEvent(
+        type=EventType.TEXT_MESSAGE_CONTENT, message_id=message_id, delta=delta
+    )
+
+
+class TestEventCoalescer(unittest.TestCase):
+    """Test suite for the delta coalescer"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.coalescer = EventCoalescer(max_latency=0.015, max_bytes=10, clock=self.clock)
+
+    def test_merges_adjacent_deltas(self):
+        """Test that deltas of the same message are merged"""
+        self.assertEqual(self.coalescer.push(content("He")), [])
+        self.assertEqual(self.coalescer.push(content("ll")), [])
+        self.assertEqual(self.coalescer.push(content("o")), [])
+        flushed = self.coalescer.flush()
+        self.assertEqual(len(flushed), 1)
+        self.assertEqual(flushed[0].delta, "Hello")
+        self.assertEqual(flushed[0].message_id, "m1")
+
+    def test_other_events_force_flush(self):
+        """Test that other event types flush the pending delta first"""
+        self.coalescer.push(content("Hi"))
+        end = TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="m1")
+        ready = self.coalescer.push(end)
+        self.assertEqual([event.type for event in ready], [
+            EventType.TEXT_MESSAGE_CONTENT, EventType.TEXT_MESSAGE_END
+        ])
+        self.assertEqual(self.coalescer.flush(), [])
+
+    def test_different_ids_are_not_merged(self):
+        """Test that deltas of different messages are kept apart"""
+        self.coalescer.push(content("a", "m1"))
+        ready = self.coalescer.push(content("b", "m2"))
+        self.assertEqual([event.delta for event in ready], ["a"])
+        self.assertEqual([event.message_id for event in self.coalescer.flush()], ["m2"])
+
+    def test_max_bytes(self):
+        """Test that the pending delta is released at max_bytes"""
+        self.coalescer.push(content("12345"))
+        ready = self.coalescer.push(content("67890"))
+        self.assertEqual([event.delta for event in ready], ["1234567890"])
+
+    def test_max_latency(self):
+        """Test that the pending delta is released after max_latency"""
+        self.coalescer.push(content("a"))
+        self.assertEqual(self.coalescer.poll(), [])
+        self.clock.now = 0.01
+        self.assertAlmostEqual(self.coalescer.time_until_flush(), 0.005)
+        self.assertEqual(self.coalescer.push(content("b")), [])
+        self.clock.now = 0.02
+        self.assertEqual([event.delta for event in self.coalescer.poll()], ["ab"])
+        self.assertIsNone(self.coalescer.time_until_flush())
+
+    def test_tool_call_args(self):
+        """Test that tool call argument deltas are merged"""
+        for delta in ['{"a', '": ', '1}']:
+            self.coalescer.push(ToolCallArgsEvent(
+                type=EventType.TOOL_CALL_ARGS, tool_call_id="c1", delta=delta
+            ))
+        self.assertEqual(self.coalescer.flush()[0].delta, '{"a": 1}')
+
+    def test_chunk_continuations(self):
+        """Test that chunks without identifying fields continue the pending chunk"""
+        self.coalescer.push(ToolCallChunkEvent(
+            type=EventType.TOOL_CALL_CHUNK, tool_call_id="c1", tool_call_name="search"
+        ))
+        self.coalescer.push(ToolCallChunkEvent(
+            type=EventType.TOOL_CALL_CHUNK, tool_call_id="c1", delta="{}"
+        ))
+        ready = self.coalescer.push(ToolCallChunkEvent(
+            type=EventType.TOOL_CALL_CHUNK, tool_call_id="c2", tool_call_name="other"
+        ))
+        self.assertEqual(len(ready), 1)
+        self.assertEqual(ready[0].tool_call_name, "search")
+        self.assertEqual(ready[0].delta, "{}")
+
+    def test_raw_events_are_not_merged(self):
+        """Test that events carrying a raw event pass through unchanged"""
+        self.coalescer.push(content("a"))
+        raw = TextMessageChunkEvent(
+            type=EventType.TEXT_MESSAGE_CHUNK, message_id="m1", delta="b", raw_event={"x": 1}
+        )
+        ready = self.coalescer.push(raw)
+        self.assertEqual(ready[1], raw)
+
+
+class TestCoalesceEvents(unittest.IsolatedAsyncioTestCase):
+    """Test suite for the async coalescing stage"""
+
+    async def test_coalesces_stream(self):
+        """Test that a token stream is merged while keeping order"""
+        async def events():
+            yield TextMessageStartEvent(
+                type=EventType.TEXT_MESSAGE_START, message_id="m1", role="assistant"
+            )
+            for token in ["Hel", "lo", ", ", "wor", "ld"]:
+                yield content(token)
+            yield TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="m1")
+
+        result = [event async for event in coalesce_events(events(), max_latency=10)]
+        self.assertEqual([event.type for event in result], [
+            EventType.TEXT_MESSAGE_START,
+            EventType.TEXT_MESSAGE_CONTENT,
+            EventType.TEXT_MESSAGE_END,
+        ])
+        self.assertEqual(result[1].delta, "Hello, world")
+
+    async def test_flushes_on_latency_without_new_events(self):
+        """Test that a pending delta is sent when the source stalls"""
+        release = asyncio.Event()
+
+        async def events():
+            yield content("a")
+            yield content("b")
+            await release.wait()
+            yield content("c")
+
+        stream = coalesce_events(events(), max_latency=0.01)
+        first = await asyncio.wait_for(stream.__anext__(), timeout=1)
+        self.assertEqual(first.delta, "ab")
+        release.set()
+        rest = [event async for event in stream]
+        self.assertEqual([event.delta for event in rest], ["c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
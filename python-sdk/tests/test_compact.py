@@ -0,0 +1,107 @@
+import pickle
+import unittest
+
+from ag_ui.core import compact
+from ag_ui.core.events import (
+    BaseEvent,
+    EventType,
+    TextMessageContentEvent,
+    ToolCallStartEvent,
+)
+from ag_ui.encoder.encoder import EventEncoder, AGUI_MEDIA_TYPE, NDJSON_MEDIA_TYPE
+from ag_ui.encoder.serializers import event_classes
+from ag_ui.proto.proto import EVENT_SPECS
+
+from tests.test_serializers import SAMPLES
+
+
+class TestCompactRecords(unittest.TestCase):
+    """Test suite for the compact event records"""
+
+    def test_every_event_class_has_a_record(self):
+        """Test that every event class is mirrored by a record class of the same name"""
+        for cls in event_classes():
+            record_class = getattr(compact, cls.__name__)
+            self.assertIs(record_class.model_class, cls)
+            self.assertEqual(record_class._fields, tuple(cls.model_fields))
+            self.assertFalse(hasattr(record_class(**_required_values(cls)), "__dict__"))
+
+    def test_lossless_round_trip(self):
+        """Test that events convert to records and back without loss"""
+        for cls, samples in SAMPLES.items():
+            for event in samples:
+                with self.subTest(event=event):
+                    record = compact.from_event(event)
+                    self.assertIsInstance(record, getattr(compact, cls.__name__))
+                    self.assertEqual(record.to_event(), event)
+                    self.assertEqual(compact.from_event(record.to_event()), record)
+
+    def test_encoder_output_matches_models(self):
+        """Test that records encode byte-identically to their models"""
+        encoders = [
+            EventEncoder(),
+            EventEncoder(accept=NDJSON_MEDIA_TYPE),
+            EventEncoder(accept=AGUI_MEDIA_TYPE, binary=True),
+        ]
+        for samples in SAMPLES.values():
+            for event in samples:
+                record = compact.from_event(event)
+                for encoder in encoders:
+                    # the protobuf schema has no message for these events
+                    if encoder.accepts_protobuf and (
+                        event.type not in EVENT_SPECS or type(event) is BaseEvent
+                    ):
+                        continue
+                    with self.subTest(event=event, content_type=encoder.get_content_type()):
+                        self.assertEqual(encoder.encode_binary(record), encoder.encode_binary(event))
+
+    def test_construction_defaults(self):
+        """Test that records fill in the event type and optional fields"""
+        record = compact.ToolCallStartEvent(tool_call_id="c", tool_call_name="search")
+        self.assertEqual(record.type, EventType.TOOL_CALL_START)
+        self.assertIsNone(record.parent_message_id)
+        self.assertEqual(
+            record.to_event(),
+            ToolCallStartEvent(
+                type=EventType.TOOL_CALL_START, tool_call_id="c", tool_call_name="search"
+            ),
+        )
+        with self.assertRaises(TypeError):
+            compact.ToolCallStartEvent(tool_call_id="c")
+        with self.assertRaises(TypeError):
+            compact.ToolCallStartEvent(tool_call_id="c", tool_call_name="s", unknown=1)
+        with self.assertRaises(TypeError):
+            compact.ToolCallStartEvent.from_event(
+                TextMessageContentEvent(
+                    type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="x"
+                )
+            )
+
+    def test_immutable_hashable_and_picklable(self):
+        """Test that records are immutable values"""
+        record = compact.TextMessageContentEvent(message_id="m", delta="x")
+        with self.assertRaises(AttributeError):
+            record.delta = "y"
+        with self.assertRaises(AttributeError):
+            del record.delta
+        changed = record.replace(delta="y")
+        self.assertEqual((record.delta, changed.delta), ("x", "y"))
+        self.assertEqual(record, compact.TextMessageContentEvent(message_id="m", delta="x"))
+        self.assertNotEqual(record, changed)
+        self.assertEqual(len({record, record.replace(), changed}), 2)
+        self.assertEqual(pickle.loads(pickle.dumps(record)), record)
+
+
+def _required_values(cls):
+    """Returns placeholder values for the required fields of an event class"""
+    values = {
+        name: "x" for name, field in cls.model_fields.items()
+        if field.is_required() and name != "type"
+    }
+    if "type" in values or cls.__name__ == "BaseEvent":
+        values["type"] = EventType.RAW
+    return values
+
+
+if __name__ == "__main__":
+    unittest.main()
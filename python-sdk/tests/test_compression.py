@@ -0,0 +1,116 @@
+import unittest
+import zlib
+
+from ag_ui.encoder.encoder import EventEncoder
+from ag_ui.encoder.compression import (
+    StreamCompressor,
+    negotiate_content_encoding,
+    parse_accept_encoding,
+    SUPPORTED_ENCODINGS,
+)
+from tests.event_helpers import content_event
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class TestContentEncodingNegotiation(unittest.TestCase):
+    """Test suite for Accept-Encoding negotiation"""
+
+    def test_no_header_means_identity(self):
+        """Test that streams are not compressed without a header"""
+        self.assertIsNone(negotiate_content_encoding(None))
+        self.assertIsNone(negotiate_content_encoding(""))
+        self.assertIsNone(negotiate_content_encoding("br"))
+
+    def test_quality_values(self):
+        """Test that the coding with the highest quality is selected"""
+        self.assertEqual(negotiate_content_encoding("gzip;q=0.5, deflate"), "deflate")
+        self.assertEqual(negotiate_content_encoding("deflate, gzip"), "gzip")
+        self.assertIsNone(negotiate_content_encoding("gzip;q=0"))
+        self.assertIsNone(negotiate_content_encoding("gzip;q=0.5, identity"))
+
+    def test_wildcard(self):
+        """Test that * selects the preferred supported coding"""
+        self.assertEqual(negotiate_content_encoding("*"), SUPPORTED_ENCODINGS[0])
+        self.assertEqual(
+            negotiate_content_encoding("*;q=0.1, deflate"), "deflate"
+        )
+
+    def test_parse_accept_encoding(self):
+        """Test parsing of the Accept-Encoding header"""
+        self.assertEqual(
+            parse_accept_encoding("GZIP, deflate;q=0.5, br;q=abc"),
+            {"gzip": 1.0, "deflate": 0.5, "br": 0.0}
+        )
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_zstd_selected_by_quality(self):
+        """Test that zstd is used when the client prefers it"""
+        self.assertEqual(negotiate_content_encoding("gzip;q=0.5, zstd"), "zstd")
+        self.assertEqual(negotiate_content_encoding("gzip, zstd"), "gzip")
+
+
+class TestStreamCompressor(unittest.TestCase):
+    """Test suite for the streaming compressor"""
+
+    def assert_frames_decodable(self, encoding: str, decompressor):
+        """Every flushed chunk must decode to exactly the frames written so far"""
+        compressor = StreamCompressor(encoding)
+        for index in range(20):
+            frame = f"data: frame {index}\n\n".encode()
+            self.assertEqual(decompressor(compressor.compress(frame)), frame)
+        compressor.finish()
+
+    def test_deflate_sync_flush(self):
+        """Test that deflate output is decodable after every frame"""
+        decompressor = zlib.decompressobj(15)
+        self.assert_frames_decodable("deflate", decompressor.decompress)
+
+    def test_gzip_sync_flush(self):
+        """Test that gzip output is decodable after every frame"""
+        decompressor = zlib.decompressobj(31)
+        self.assert_frames_decodable("gzip", decompressor.decompress)
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_zstd_block_flush(self):
+        """Test that zstd output is decodable after every frame"""
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+        self.assert_frames_decodable("zstd", decompressor.decompress)
+
+    def test_unsupported_encoding(self):
+        """Test that unknown codings are rejected"""
+        with self.assertRaises(ValueError):
+            StreamCompressor("br")
+
+
+class TestCompressedEncoder(unittest.TestCase):
+    """Test suite for compression in the EventEncoder"""
+
+    def test_uncompressed_by_default(self):
+        """Test that the encoder does not compress without Accept-Encoding"""
+        encoder = EventEncoder()
+        self.assertIsNone(encoder.get_content_encoding())
+        self.assertEqual(encoder.finish(), b"")
+
+    def test_compressed_stream_round_trip(self):
+        """Test that the compressed stream decodes to the uncompressed frames"""
+        events = [content_event(f" token{index}") for index in range(50)]
+        plain = EventEncoder()
+        compressed = EventEncoder(accept_encoding="gzip")
+        self.assertEqual(compressed.get_content_encoding(), "gzip")
+
+        expected = b"".join(plain.encode_binary(event) for event in events)
+        chunks = [compressed.encode_binary(event) for event in events[:10]]
+        chunks.append(compressed.encode_batch(events[10:]))
+        chunks.append(compressed.finish())
+        stream = b"".join(chunks)
+
+        self.assertEqual(zlib.decompress(stream, 31), expected)
+        self.assertLess(len(stream), len(expected) / 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+import unittest
+
+from pydantic import ValidationError
+
+from ag_ui.core.events import (
+    EventType,
+    RunStartedEvent,
+    TextMessageContentEvent,
+    StateSnapshotEvent,
+)
+from ag_ui.decoder import (
+    SSEDecoder,
+    decode_sse_stream,
+    iter_sse_events,
+    ProtoDecoder,
+    decode_proto_stream,
+    iter_proto_events,
+    NDJSONDecoder,
+    decode_ndjson_stream,
+    iter_ndjson_events,
+)
+from ag_ui.encoder.encoder import EventEncoder, NDJSON_MEDIA_TYPE
+from ag_ui.proto import AGUI_MEDIA_TYPE
+
+
+def sample_events():
+    """Creates a few events of different types"""
+    return [
+        RunStartedEvent(type=EventType.RUN_STARTED, thread_id="thread_1", run_id="run_1"),
+        TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT, message_id="msg_1", delta="Grüße 👋"
+        ),
+        StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"lines": "a\nb"}),
+    ]
+
+
+async def async_chunks(chunks):
+    """Yields the given chunks asynchronously"""
+    for chunk in chunks:
+        yield chunk
+
+
+class TestSSEDecoder(unittest.TestCase):
+    """Test suite for the incremental SSE decoder"""
+
+    def test_round_trip(self):
+        """Test that encoded events decode to equal typed events"""
+        encoder = EventEncoder()
+        events = sample_events()
+        stream = b"".join(encoder.encode_binary(event) for event in events)
+        decoded = SSEDecoder().feed(stream)
+        self.assertEqual(decoded, events)
+        self.assertIsInstance(decoded[0], RunStartedEvent)
+
+    def test_every_split_point(self):
+        """Test that chunk boundaries anywhere, including inside UTF-8
+        sequences and CRLF pairs, do not change the result"""
+        events = sample_events()
+        stream = "".join(EventEncoder().encode(event) for event in events)
+        stream = stream.replace("\n", "\r\n").encode("utf-8")
+        for split in range(len(stream) + 1):
+            decoder = SSEDecoder()
+            decoded = decoder.feed(stream[:split]) + decoder.feed(stream[split:])
+            self.assertEqual(decoded, events, split)
+
+    def test_single_byte_chunks(self):
+        """Test decoding a stream delivered one byte at a time"""
+        events = sample_events()
+        stream = b"".join(EventEncoder().encode_binary(event) for event in events)
+        decoded = list(iter_sse_events(stream[i:i + 1] for i in range(len(stream))))
+        self.assertEqual(decoded, events)
+
+    def test_multi_line_data_and_comments(self):
+        """Test that data lines are joined with newlines and comments,
+        unknown fields and empty events are ignored"""
+        stream = (
+            b": keep-alive\n\n"
+            b"event: message\n"
+            b"retry: 1000\n"
+            b'data: {"type": "RUN_STARTED",\n'
+            b': a comment between data lines\n'
+            b'data:"threadId": "t",\n'
+            b'data: "runId": "r"}\n\n'
+            b"data\n\n"
+        )
+        decoded = SSEDecoder().feed(stream)
+        self.assertEqual(
+            decoded,
+            [RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r")],
+        )
+
+    def test_last_event_id(self):
+        """Test that the id of the latest event is kept"""
+        encoder = EventEncoder(event_ids=True)
+        decoder = SSEDecoder()
+        for event in sample_events():
+            decoder.feed(encoder.encode_binary(event))
+        self.assertEqual(decoder.last_event_id, "3")
+
+    def test_close_flushes_unterminated_event(self):
+        """Test that an event without the trailing blank line is returned by close"""
+        decoder = SSEDecoder()
+        frame = EventEncoder().encode(sample_events()[0]).rstrip("\n")
+        self.assertEqual(decoder.feed(frame.encode("utf-8")), [])
+        self.assertEqual(decoder.close(), [sample_events()[0]])
+        self.assertEqual(decoder.close(), [])
+
+    def test_invalid_payload(self):
+        """Test that invalid payloads raise a ValidationError"""
+        with self.assertRaises(ValidationError):
+            SSEDecoder().feed(b'data: {"type": "UNKNOWN"}\n\n')
+
+
+class TestProtoDecoder(unittest.TestCase):
+    """Test suite for the incremental protobuf decoder"""
+
+    def setUp(self):
+        encoder = EventEncoder(accept=AGUI_MEDIA_TYPE, binary=True)
+        self.events = sample_events()
+        self.stream = b"".join(encoder.encode_binary(event) for event in self.events)
+
+    def test_every_split_point(self):
+        """Test that frames split at any point are reassembled"""
+        for split in range(len(self.stream) + 1):
+            decoder = ProtoDecoder()
+            decoded = decoder.feed(self.stream[:split]) + decoder.feed(self.stream[split:])
+            self.assertEqual(decoded, self.events, split)
+            self.assertEqual(decoder.close(), [])
+
+    def test_single_byte_chunks(self):
+        """Test decoding a stream delivered one byte at a time"""
+        chunks = (self.stream[i:i + 1] for i in range(len(self.stream)))
+        self.assertEqual(list(iter_proto_events(chunks)), self.events)
+
+    def test_truncated_stream(self):
+        """Test that a stream ending inside a frame raises ValueError"""
+        decoder = ProtoDecoder()
+        decoder.feed(self.stream[:-1])
+        with self.assertRaises(ValueError):
+            decoder.close()
+
+    def test_decoder_continues_after_invalid_frame(self):
+        """Test that an invalid frame is consumed and later frames still decode"""
+        decoder = ProtoDecoder()
+        with self.assertRaises(ValueError):
+            decoder.feed(b"\x00\x00\x00\x01\xff" + self.stream)
+        self.assertEqual(decoder.feed(b""), self.events)
+
+
+class TestNDJSONDecoder(unittest.TestCase):
+    """Test suite for the incremental NDJSON decoder"""
+
+    def setUp(self):
+        encoder = EventEncoder(accept=NDJSON_MEDIA_TYPE)
+        self.events = sample_events()
+        self.stream = b"".join(encoder.encode_binary(event) for event in self.events)
+
+    def test_every_split_point(self):
+        """Test that lines split at any point are reassembled"""
+        for split in range(len(self.stream) + 1):
+            decoder = NDJSONDecoder()
+            decoded = decoder.feed(self.stream[:split]) + decoder.feed(self.stream[split:])
+            self.assertEqual(decoded, self.events, split)
+
+    def test_blank_lines_and_crlf(self):
+        """Test that blank lines are skipped and CRLF line ends are accepted"""
+        stream = b"\n" + self.stream.replace(b"\n", b"\r\n\r\n")
+        self.assertEqual(list(iter_ndjson_events([stream])), self.events)
+
+    def test_single_byte_chunks(self):
+        """Test decoding a stream with blank lines delivered one byte at a time"""
+        stream = self.stream.replace(b"\n", b"\r\n \n")
+        decoded = list(iter_ndjson_events(stream[i:i + 1] for i in range(len(stream))))
+        self.assertEqual(decoded, self.events)
+
+    def test_unterminated_last_line(self):
+        """Test that close returns the event on an unterminated last line"""
+        decoder = NDJSONDecoder()
+        self.assertEqual(decoder.feed(self.stream[:-1]), self.events[:-1])
+        self.assertEqual(decoder.close(), self.events[-1:])
+
+
+class TestDecodeStreams(unittest.IsolatedAsyncioTestCase):
+    """Test suite for decoding async byte streams"""
+
+    async def test_decode_stream(self):
+        """Test decoding an async stream of arbitrary chunks"""
+        events = sample_events()
+        stream = b"".join(EventEncoder().encode_binary(event) for event in events)
+        chunks = [stream[i:i + 7] for i in range(0, len(stream), 7)]
+        decoded = [event async for event in decode_sse_stream(async_chunks(chunks))]
+        self.assertEqual(decoded, events)
+
+    async def test_decode_proto_stream(self):
+        """Test decoding an async protobuf stream of arbitrary chunks"""
+        encoder = EventEncoder(accept=AGUI_MEDIA_TYPE, binary=True)
+        events = sample_events()
+        stream = b"".join(encoder.encode_binary(event) for event in events)
+        chunks = [stream[i:i + 5] for i in range(0, len(stream), 5)]
+        decoded = [event async for event in decode_proto_stream(async_chunks(chunks))]
+        self.assertEqual(decoded, events)
+
+    async def test_decode_ndjson_stream(self):
+        """Test decoding an async NDJSON stream of arbitrary chunks"""
+        encoder = EventEncoder(accept=NDJSON_MEDIA_TYPE)
+        events = sample_events()
+        stream = b"".join(encoder.encode_binary(event) for event in events)
+        chunks = [stream[i:i + 3] for i in range(0, len(stream), 3)]
+        decoded = [event async for event in decode_ndjson_stream(async_chunks(chunks))]
+        self.assertEqual(decoded, events)
+
+
+if __name__ == "__main__":
+    unittest.main()
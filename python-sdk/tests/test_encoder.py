@@ -1,9 +1,11 @@
 import unittest
+import gzip
 import json
 from datetime import datetime
 
-from ag_ui.encoder.encoder import EventEncoder, AGUI_MEDIA_TYPE
+from ag_ui.encoder.encoder import EventEncoder, AGUI_MEDIA_TYPE, NDJSON_MEDIA_TYPE
 from ag_ui.core.events import BaseEvent, EventType, TextMessageContentEvent, ToolCallStartEvent
+from ag_ui.proto import encode as encode_proto
 
 
 class TestEventEncoder(unittest.TestCase):
@@ -15,7 +17,7 @@ class TestEventEncoder(unittest.TestCase):
         self.assertIsInstance(encoder, EventEncoder)
 
         # Test with accept parameter
-        encoder_with_accept = EventEncoder(accept=AGUI_MEDIA_TYPE)
+        encoder_with_accept = EventEncoder(accept=AGUI_MEDIA_TYPE, binary=True)
         self.assertIsInstance(encoder_with_accept, EventEncoder)
 
     def test_encode_method(self):
@@ -186,3 +188,119 @@ class TestEventEncoder(unittest.TestCase):
             original_event.model_dump(), 
             deserialized_event.model_dump()
         )
+
+    def test_protobuf_negotiation(self):
+        """Test that the protobuf media type is selected through the Accept header"""
+        self.assertEqual(EventEncoder().get_content_type(), "text/event-stream")
+        self.assertEqual(
+            EventEncoder(accept="text/event-stream").get_content_type(),
+            "text/event-stream"
+        )
+        self.assertEqual(
+            EventEncoder(accept=f"{AGUI_MEDIA_TYPE}, text/event-stream", binary=True).get_content_type(),
+            AGUI_MEDIA_TYPE
+        )
+        self.assertEqual(
+            EventEncoder(accept=f"{AGUI_MEDIA_TYPE};q=0, text/event-stream", binary=True).get_content_type(),
+            "text/event-stream"
+        )
+
+    def test_text_endpoint_never_gets_protobuf(self):
+        """Test the endpoint pattern of encode() with get_content_type() for a protobuf client"""
+        event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT, message_id="msg_123", delta="Hello"
+        )
+        for accept in (AGUI_MEDIA_TYPE, f"{AGUI_MEDIA_TYPE}, text/event-stream;q=0.5"):
+            with self.subTest(accept=accept):
+                encoder = EventEncoder(accept=accept)
+                body = encoder.encode(event)
+                self.assertEqual(encoder.get_content_type(), "text/event-stream")
+                self.assertTrue(body.startswith("data: "))
+        encoder = EventEncoder(accept=AGUI_MEDIA_TYPE, binary=True)
+        with self.assertRaises(ValueError):
+            encoder.encode(event)
+
+    def test_encode_binary_protobuf(self):
+        """Test that encode_binary returns a length-prefixed protobuf message"""
+        event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_123",
+            delta="Hello, world!",
+            timestamp=1648214400000
+        )
+        encoder = EventEncoder(accept=AGUI_MEDIA_TYPE, binary=True)
+        encoded = encoder.encode_binary(event)
+
+        self.assertIsInstance(encoded, bytes)
+        length = int.from_bytes(encoded[:4], "big")
+        self.assertEqual(length, len(encoded) - 4)
+        self.assertEqual(encoded[4:], encode_proto(event))
+
+    def test_encode_binary_sse(self):
+        """Test that encode_binary falls back to UTF-8 encoded SSE"""
+        event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_123",
+            delta="Hello ✓",
+        )
+        encoder = EventEncoder(accept="text/event-stream")
+        self.assertEqual(encoder.encode_binary(event), encoder.encode(event).encode("utf-8"))
+
+    def test_encode_ndjson(self):
+        """Test that NDJSON writes one line of JSON per event"""
+        events = [
+            TextMessageContentEvent(
+                type=EventType.TEXT_MESSAGE_CONTENT,
+                message_id="msg_123",
+                delta="line one\nline two ✓",
+            ),
+            BaseEvent(type=EventType.RAW, raw_event={"nested": [1, None]}),
+        ]
+        encoder = EventEncoder(accept=NDJSON_MEDIA_TYPE, event_ids=True)
+        self.assertTrue(encoder.accepts_ndjson)
+        for event in events:
+            line = encoder.encode(event)
+            self.assertTrue(line.endswith("}\n"))
+            self.assertEqual(line.count("\n"), 1)
+            self.assertEqual(encoder.encode_binary(event), line.encode("utf-8"))
+            self.assertEqual(
+                json.loads(line),
+                json.loads(event.model_dump_json(by_alias=True, exclude_none=True))
+            )
+        self.assertEqual(encoder.last_event_id, 4)
+
+    def test_compressed_ndjson_archive(self):
+        """Test that a gzip compressed NDJSON stream is a valid .jsonl.gz file"""
+        encoder = EventEncoder(accept=NDJSON_MEDIA_TYPE, accept_encoding="gzip")
+        events = [
+            TextMessageContentEvent(
+                type=EventType.TEXT_MESSAGE_CONTENT, message_id="msg_123", delta=str(i)
+            )
+            for i in range(3)
+        ]
+        archive = encoder.encode_batch(events[:2]) + encoder.encode_binary(events[2])
+        archive += encoder.finish()
+        lines = gzip.decompress(archive).decode("utf-8").splitlines()
+        self.assertEqual([json.loads(line)["delta"] for line in lines], ["0", "1", "2"])
+
+    def test_encode_sse_bytes_matches_str_path(self):
+        """Test that the bytes-native SSE path is byte-identical to the str path"""
+        encoder = EventEncoder()
+        events = [
+            TextMessageContentEvent(
+                type=EventType.TEXT_MESSAGE_CONTENT,
+                message_id="msg_123",
+                delta="Hello ✓ \"quoted\"\n",
+                timestamp=1648214400000
+            ),
+            ToolCallStartEvent(
+                type=EventType.TOOL_CALL_START,
+                tool_call_id="call_123",
+                tool_call_name="test_tool",
+            ),
+            BaseEvent(type=EventType.RAW, raw_event={"nested": [1, None, "ü"]}),
+        ]
+        for event in events:
+            encoded = encoder._encode_sse_bytes(event)
+            self.assertIsInstance(encoded, bytes)
+            self.assertEqual(encoded, encoder._encode_sse(event).encode("utf-8"))
@@ -23,8 +23,11 @@ from ag_ui.core.events import (
     RunErrorEvent,
     StepStartedEvent,
     StepFinishedEvent,
-    Event
+    Event,
+    set_strict_construction,
+    is_strict_construction,
 )
+from ag_ui.encoder import EventEncoder
 
 
 class TestEvents(unittest.TestCase):
@@ -569,5 +572,64 @@ class TestEvents(unittest.TestCase):
         self.assertEqual(deserialized.delta, text)
 
 
+class TestTrustedConstruction(unittest.TestCase):
+    """Test suite for trusted event construction"""
+
+    def setUp(self):
+        self.strict = is_strict_construction()
+        set_strict_construction(False)
+
+    def tearDown(self):
+        set_strict_construction(self.strict)
+
+    def test_trusted_matches_validated(self):
+        """Test that trusted events equal validated events"""
+        cases = [
+            (TextMessageContentEvent, {"message_id": "m", "delta": "hi"}),
+            (ToolCallStartEvent, {"tool_call_id": "c", "tool_call_name": "search"}),
+            (StateSnapshotEvent, {"snapshot": {"a": 1}, "timestamp": 5}),
+            (MessagesSnapshotEvent, {
+                "messages": [UserMessage(id="u", role="user", content="hi")],
+            }),
+            (RunFinishedEvent, {"thread_id": "t", "run_id": "r"}),
+        ]
+        encoder = EventEncoder()
+        for cls, values in cases:
+            trusted = cls.trusted(**values)
+            validated = cls(type=trusted.type, **values)
+            self.assertIs(type(trusted), cls)
+            self.assertEqual(trusted, validated)
+            self.assertEqual(trusted.model_fields_set, validated.model_fields_set)
+            self.assertEqual(list(trusted.__dict__), list(validated.__dict__))
+            self.assertEqual(encoder.encode(trusted), encoder.encode(validated))
+
+    def test_trusted_skips_validation(self):
+        """Test that trusted construction skips validation and post-init checks"""
+        event = TextMessageContentEvent.trusted(message_id="m", delta="")
+        self.assertEqual(event.delta, "")
+        self.assertEqual(BaseEvent.trusted(type=EventType.RAW).type, EventType.RAW)
+
+    def test_trusted_rejects_unknown_fields(self):
+        """Test that trusted construction rejects names that are not fields"""
+        with self.assertRaisesRegex(TypeError, "unknown fields: messageId"):
+            TextMessageContentEvent.trusted(messageId="m", delta="hi")
+        with self.assertRaisesRegex(TypeError, "unknown fields: bogus, extra"):
+            TextMessageEndEvent.trusted(message_id="m", extra=1, bogus=2)
+        set_strict_construction(True)
+        with self.assertRaises(ValidationError):
+            TextMessageEndEvent.trusted(message_id="m", bogus=2)
+
+    def test_strict_construction(self):
+        """Test that strict construction validates like the constructor"""
+        set_strict_construction(True)
+        self.assertTrue(is_strict_construction())
+        with self.assertRaises(ValueError):
+            TextMessageContentEvent.trusted(message_id="m", delta="")
+        with self.assertRaises(ValidationError):
+            TextMessageStartEvent.trusted(message_id="m", role="user")
+        event = TextMessageEndEvent.trusted(message_id="m")
+        self.assertEqual(event.type, EventType.TEXT_MESSAGE_END)
+
+
 if __name__ == "__main__":
     unittest.main()
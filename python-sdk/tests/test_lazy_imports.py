@@ -0,0 +1,67 @@
+import subprocess
+import sys
+import unittest
+
+import ag_ui.core
+
+
+def run_python(code: str) -> str:
+    """Runs code in a fresh interpreter and returns its output"""
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+class TestLazyImports(unittest.TestCase):
+    """Test suite for the lazy imports of ag_ui.core"""
+
+    def test_import_loads_no_models(self):
+        """Test that importing the package does not import the model modules"""
+        output = run_python(
+            "import sys, ag_ui.core; "
+            "print(sorted(m for m in sys.modules if m.startswith('ag_ui.core.')))"
+        )
+        self.assertEqual(output, "[]")
+
+    def test_types_do_not_load_events(self):
+        """Test that importing a type does not import the event models"""
+        output = run_python(
+            "import sys; from ag_ui.core import UserMessage; "
+            "print('ag_ui.core.events' in sys.modules, UserMessage.__pydantic_complete__)"
+        )
+        self.assertEqual(output, "False False")
+
+    def test_all_names_resolve(self):
+        """Test that every name in __all__ resolves and is listed by dir()"""
+        for name in ag_ui.core.__all__:
+            self.assertIsNotNone(getattr(ag_ui.core, name), name)
+            self.assertIn(name, dir(ag_ui.core))
+        with self.assertRaises(AttributeError):
+            getattr(ag_ui.core, "NoSuchEvent")
+
+    def test_warmup_builds_all_models(self):
+        """Test that warmup builds the validators of all models"""
+        output = run_python(
+            "import ag_ui.core; from pydantic import BaseModel; ag_ui.core.warmup(); "
+            "from ag_ui.core import events, types; "
+            "print(all(v.__pydantic_complete__ for m in (events, types) "
+            "for v in vars(m).values() "
+            "if isinstance(v, type) and issubclass(v, BaseModel) and v is not BaseModel))"
+        )
+        self.assertEqual(output, "True")
+
+    def test_warmup_builds_adapters(self):
+        """Test that warmup builds the cached adapters used to parse events and input"""
+        output = run_python(
+            "import ag_ui.core; ag_ui.core.warmup(); "
+            "from ag_ui.core import parsing, registry; "
+            "print(registry._union_adapter.cache_info().currsize, "
+            "parsing._input_models.cache_info().currsize, "
+            "parsing._message_adapter.cache_info().currsize)"
+        )
+        self.assertEqual(output, "1 1 1")
+
+
+if __name__ == "__main__":
+    unittest.main()
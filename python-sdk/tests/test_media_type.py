@@ -0,0 +1,166 @@
+import unittest
+
+from ag_ui.encoder.encoder import (
+    EventEncoder,
+    negotiate_content_type,
+    SSE_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+)
+from ag_ui.encoder.media_type import parse_accept, preferred_media_types
+from ag_ui.proto import AGUI_MEDIA_TYPE
+
+
+class TestPreferredMediaTypes(unittest.TestCase):
+    """Test suite for the Accept header negotiation"""
+
+    def test_no_header_accepts_everything(self):
+        """Test that a missing header is treated as */*"""
+        self.assertEqual(
+            preferred_media_types(None, ["text/html", "application/json"]),
+            ["text/html", "application/json"]
+        )
+
+    def test_empty_header_accepts_nothing(self):
+        """Test that an empty header accepts no media types"""
+        self.assertEqual(preferred_media_types("", ["text/html"]), [])
+
+    def test_quality_ordering(self):
+        """Test that media types are ordered by quality"""
+        accept = "text/html;q=0.5, application/json, text/plain;q=0.8"
+        self.assertEqual(
+            preferred_media_types(accept, ["text/html", "text/plain", "application/json"]),
+            ["application/json", "text/plain", "text/html"]
+        )
+
+    def test_zero_quality_excludes(self):
+        """Test that q=0 marks a media type as not acceptable"""
+        self.assertEqual(
+            preferred_media_types("text/html;q=0, */*", ["text/html", "application/json"]),
+            ["application/json"]
+        )
+
+    def test_wildcards_and_specificity(self):
+        """Test that more specific media ranges take precedence"""
+        accept = "text/*;q=0.3, text/html;q=0.7, */*;q=0.1"
+        self.assertEqual(
+            preferred_media_types(accept, ["image/png", "text/plain", "text/html"]),
+            ["text/html", "text/plain", "image/png"]
+        )
+
+    def test_parameters(self):
+        """Test that parameters must match when present in the Accept header"""
+        accept = "text/html;level=1, text/html;level=2;q=0.4"
+        self.assertEqual(
+            preferred_media_types(accept, ["text/html;level=2", "text/html;level=3"]),
+            ["text/html;level=2"]
+        )
+
+    def test_quoted_values(self):
+        """Test that commas and semicolons inside quotes do not split media ranges"""
+        accept = 'text/html;foo="bar,baz;qux";q=0.5, application/json'
+        parsed = parse_accept(accept)
+        self.assertEqual(len(parsed), 2)
+        self.assertEqual(parsed[0].params, (("foo", "bar,baz;qux"),))
+        self.assertEqual(parsed[0].q, 0.5)
+
+    def test_without_provided_types(self):
+        """Test listing the acceptable media types of a header"""
+        self.assertEqual(
+            preferred_media_types("text/html;q=0.5, application/json"),
+            ["application/json", "text/html"]
+        )
+
+    def test_invalid_entries_are_ignored(self):
+        """Test that malformed media ranges and quality values are skipped"""
+        self.assertEqual(
+            preferred_media_types("garbage, text/html;q=abc, application/json", [
+                "text/html", "application/json"
+            ]),
+            ["application/json"]
+        )
+
+    def test_parse_cache(self):
+        """Test that parsed headers are served from the cache"""
+        parse_accept.cache_clear()
+        parse_accept("text/event-stream")
+        parse_accept("text/event-stream")
+        info = parse_accept.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 1)
+
+
+class TestContentTypeNegotiation(unittest.TestCase):
+    """Test suite for the EventEncoder content type selection"""
+
+    def test_defaults_to_sse(self):
+        """Test that SSE is used without an explicit request for another type"""
+        self.assertEqual(negotiate_content_type(None), SSE_MEDIA_TYPE)
+        self.assertEqual(negotiate_content_type("*/*"), SSE_MEDIA_TYPE)
+        self.assertEqual(negotiate_content_type("application/*"), SSE_MEDIA_TYPE)
+        self.assertEqual(negotiate_content_type("application/json"), SSE_MEDIA_TYPE)
+
+    def test_explicit_protobuf(self):
+        """Test that an explicitly listed protobuf media type is selected"""
+        self.assertEqual(negotiate_content_type(AGUI_MEDIA_TYPE), AGUI_MEDIA_TYPE)
+        self.assertEqual(
+            negotiate_content_type(f"{AGUI_MEDIA_TYPE}, text/event-stream"),
+            AGUI_MEDIA_TYPE
+        )
+
+    def test_ties_follow_header_order(self):
+        """Test that on equal quality the media type listed first wins"""
+        self.assertEqual(
+            negotiate_content_type(f"text/event-stream, {NDJSON_MEDIA_TYPE}"), SSE_MEDIA_TYPE
+        )
+        self.assertEqual(
+            negotiate_content_type(f"{NDJSON_MEDIA_TYPE}, text/event-stream"), NDJSON_MEDIA_TYPE
+        )
+        self.assertEqual(
+            negotiate_content_type(f"text/event-stream, {AGUI_MEDIA_TYPE}"), SSE_MEDIA_TYPE
+        )
+        # an explicit media type is more specific than a wildcard
+        self.assertEqual(negotiate_content_type(f"*/*, {NDJSON_MEDIA_TYPE}"), NDJSON_MEDIA_TYPE)
+
+    def test_quality_overrides_compactness(self):
+        """Test that a lower quality for protobuf keeps SSE"""
+        self.assertEqual(
+            negotiate_content_type(f"{AGUI_MEDIA_TYPE};q=0.5, text/event-stream"),
+            SSE_MEDIA_TYPE
+        )
+        self.assertEqual(
+            negotiate_content_type(f"{AGUI_MEDIA_TYPE}, text/event-stream;q=0.5"),
+            AGUI_MEDIA_TYPE
+        )
+
+    def test_explicit_ndjson(self):
+        """Test that NDJSON is selected when requested"""
+        self.assertEqual(negotiate_content_type(NDJSON_MEDIA_TYPE), NDJSON_MEDIA_TYPE)
+        self.assertEqual(
+            negotiate_content_type(f"text/event-stream;q=0.9, {NDJSON_MEDIA_TYPE}"),
+            NDJSON_MEDIA_TYPE
+        )
+        self.assertEqual(
+            negotiate_content_type(f"{NDJSON_MEDIA_TYPE}, {AGUI_MEDIA_TYPE}"),
+            NDJSON_MEDIA_TYPE
+        )
+        self.assertEqual(
+            negotiate_content_type(f"{AGUI_MEDIA_TYPE}, {NDJSON_MEDIA_TYPE}"),
+            AGUI_MEDIA_TYPE
+        )
+        self.assertEqual(
+            negotiate_content_type(f"{NDJSON_MEDIA_TYPE}, {AGUI_MEDIA_TYPE};q=0.5"),
+            NDJSON_MEDIA_TYPE
+        )
+
+    def test_encoder_uses_negotiated_type(self):
+        """Test that the encoder exposes the negotiated content type"""
+        encoder = EventEncoder(accept=f"{AGUI_MEDIA_TYPE}, */*;q=0.1", binary=True)
+        self.assertEqual(encoder.get_content_type(), AGUI_MEDIA_TYPE)
+        self.assertTrue(encoder.accepts_protobuf)
+        encoder = EventEncoder(accept=f"{AGUI_MEDIA_TYPE}, */*;q=0.1")
+        self.assertEqual(encoder.get_content_type(), "text/event-stream")
+        self.assertFalse(encoder.accepts_protobuf)
+
+
+if __name__ == "__main__":
+    unittest.main()
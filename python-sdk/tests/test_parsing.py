@@ -0,0 +1,194 @@
+import json
+import unittest
+
+from pydantic import ValidationError
+
+from ag_ui.core import (
+    AssistantMessage,
+    LazyMessages,
+    MessageCache,
+    RunAgentInput,
+    UserMessage,
+    parse_run_agent_input,
+)
+
+
+def make_body(count: int, **overrides) -> dict:
+    """Returns a RunAgentInput body with count alternating messages"""
+    messages = []
+    for i in range(count):
+        if i % 2:
+            messages.append({
+                "id": f"m{i}",
+                "role": "assistant",
+                "toolCalls": [{
+                    "id": f"c{i}",
+                    "type": "function",
+                    "function": {"name": "search", "arguments": "{}"},
+                }],
+            })
+        else:
+            messages.append({"id": f"m{i}", "role": "user", "content": f"Question {i}"})
+    body = {
+        "threadId": "t1",
+        "runId": "r1",
+        "state": {"count": 1},
+        "messages": messages,
+        "tools": [],
+        "context": [{"description": "user", "value": "admin"}],
+        "forwardedProps": {},
+    }
+    body.update(overrides)
+    return body
+
+
+class TestParseRunAgentInput(unittest.TestCase):
+    """Test suite for parse_run_agent_input"""
+
+    def test_eager_matches_model(self):
+        """Test that the default parse validates everything like the model"""
+        body = make_body(6)
+        expected = RunAgentInput.model_validate(body)
+        self.assertEqual(parse_run_agent_input(json.dumps(body)), expected)
+        self.assertEqual(parse_run_agent_input(json.dumps(body).encode("utf-8")), expected)
+        self.assertEqual(parse_run_agent_input(body), expected)
+
+    def test_large_bodies(self):
+        """Test that large untyped bodies decoded with json.loads parse the same"""
+        body = make_body(6, state={"rows": [{"id": i, "name": f"row {i}"} for i in range(5000)]})
+        data = json.dumps(body)
+        self.assertGreater(len(data), 64 * 1024)
+        expected = RunAgentInput.model_validate(body)
+        self.assertEqual(parse_run_agent_input(data), expected)
+        self.assertEqual(parse_run_agent_input(data.encode("utf-8")), expected)
+        self.assertEqual(parse_run_agent_input(memoryview(data.encode("utf-8"))), expected)
+        self.assertEqual(parse_run_agent_input(data, lazy=True), expected)
+        with self.assertRaises(ValidationError):
+            parse_run_agent_input(data[:-1])
+        with self.assertRaises(ValidationError):
+            parse_run_agent_input(json.dumps(make_body(6, runId=None, state=body["state"])))
+
+    def test_lazy_validates_on_access(self):
+        """Test that lazy messages are validated on first access only"""
+        body = make_body(6)
+        input_data = parse_run_agent_input(json.dumps(body), lazy=True)
+        messages = input_data.messages
+        self.assertIsInstance(input_data, RunAgentInput)
+        self.assertIsInstance(messages, LazyMessages)
+        self.assertEqual(input_data.thread_id, "t1")
+        self.assertEqual(input_data.context[0].value, "admin")
+        self.assertEqual(messages.validated_count, 0)
+        self.assertEqual(len(messages), 6)
+
+        last = messages[-1]
+        self.assertIsInstance(last, AssistantMessage)
+        self.assertIs(messages[5], last)
+        self.assertEqual(messages.validated_count, 1)
+        self.assertEqual([message.id for message in messages[:2]], ["m0", "m1"])
+        self.assertIsInstance(messages[0], UserMessage)
+        self.assertEqual(messages.validated_count, 3)
+        with self.assertRaises(IndexError):
+            messages[6]  # pylint: disable=pointless-statement
+
+        expected = RunAgentInput.model_validate(body)
+        self.assertEqual(messages.validate_all(), expected.messages)
+        self.assertEqual(messages.validated_count, 6)
+        self.assertEqual(input_data, expected)
+
+    def test_eager_tail(self):
+        """Test that the last messages can be validated up front"""
+        input_data = parse_run_agent_input(make_body(10), lazy=True, eager_messages=3)
+        self.assertEqual(input_data.messages.validated_count, 3)
+        input_data.messages[-3]  # pylint: disable=pointless-statement
+        self.assertEqual(input_data.messages.validated_count, 3)
+        input_data = parse_run_agent_input(make_body(2), lazy=True, eager_messages=5)
+        self.assertEqual(input_data.messages.validated_count, 2)
+
+    def test_lazy_errors(self):
+        """Test that invalid messages fail on access and invalid envelopes up front"""
+        body = make_body(4)
+        body["messages"][0] = {"id": "x", "role": "robot", "content": "?"}
+        input_data = parse_run_agent_input(json.dumps(body), lazy=True)
+        self.assertEqual(input_data.messages[-1].id, "m3")
+        with self.assertRaises(ValidationError):
+            input_data.messages[0]  # pylint: disable=pointless-statement
+        with self.assertRaises(ValidationError):
+            input_data.messages.validate_all()
+        with self.assertRaises(ValidationError):
+            parse_run_agent_input(json.dumps(body), lazy=True, eager_messages=4)
+        with self.assertRaises(ValidationError):
+            parse_run_agent_input(json.dumps(make_body(2, messages=[1])), lazy=True)
+        with self.assertRaises(ValidationError):
+            parse_run_agent_input(json.dumps(make_body(2, runId=None)), lazy=True)
+
+    def test_lazy_serialization(self):
+        """Test that a lazily parsed input serializes like a validated one"""
+        body = make_body(4)
+        input_data = parse_run_agent_input(body, lazy=True)
+        expected = RunAgentInput.model_validate(body)
+        self.assertEqual(
+            input_data.model_dump_json(by_alias=True, exclude_none=True),
+            expected.model_dump_json(by_alias=True, exclude_none=True),
+        )
+        self.assertEqual(input_data.model_dump(), expected.model_dump())
+
+
+class TestMessageCache(unittest.TestCase):
+    """Test suite for MessageCache"""
+
+    def test_reuses_validated_messages(self):
+        """Test that resent messages are reused and new ones validated"""
+        cache = MessageCache()
+        body = make_body(4)
+        first = parse_run_agent_input(json.dumps(body), message_cache=cache)
+        self.assertEqual(first, RunAgentInput.model_validate(body))
+        self.assertEqual(cache.stats()["misses"], 4)
+
+        second = parse_run_agent_input(json.dumps(make_body(6)), message_cache=cache)
+        self.assertEqual(len(second.messages), 6)
+        for cached, message in zip(first.messages, second.messages):
+            self.assertIs(cached, message)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (4, 6, 6))
+
+        lazy = parse_run_agent_input(make_body(6), lazy=True, message_cache=cache)
+        self.assertIs(lazy.messages[-1], second.messages[-1])
+        self.assertEqual(cache.hits, 5)
+
+    def test_changed_content_is_validated_again(self):
+        """Test that a message with a known id but new content is a miss"""
+        cache = MessageCache()
+        body = make_body(2)
+        first = parse_run_agent_input(body, message_cache=cache)
+        body["messages"][0]["content"] = "Edited"
+        second = parse_run_agent_input(body, message_cache=cache)
+        self.assertEqual(second.messages[0].content, "Edited")
+        self.assertIsNot(second.messages[0], first.messages[0])
+        self.assertIs(second.messages[1], first.messages[1])
+        self.assertEqual(len(cache), 2)
+
+    def test_invalid_messages_are_not_cached(self):
+        """Test that validation errors are raised and invalid messages are not cached"""
+        cache = MessageCache()
+        body = make_body(2)
+        body["messages"][1] = {"id": "x", "role": "robot"}
+        with self.assertRaises(ValidationError):
+            parse_run_agent_input(body, message_cache=cache)
+        self.assertEqual(len(cache), 1)
+
+    def test_limits(self):
+        """Test that the least recently used messages are evicted"""
+        cache = MessageCache(max_messages=3)
+        parse_run_agent_input(make_body(5), message_cache=cache)
+        self.assertEqual(cache.stats()["messages"], 3)
+        self.assertEqual(cache.evictions, 2)
+
+        cache = MessageCache(max_bytes=200)
+        parse_run_agent_input(make_body(10), message_cache=cache)
+        self.assertLessEqual(cache.size_bytes, 200)
+        self.assertGreater(cache.evictions, 0)
+        cache.clear()
+        self.assertEqual((len(cache), cache.size_bytes), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import json
+import random
+import unittest
+
+from ag_ui.decoder import PartialJSONParser
+
+DOCUMENTS = [
+    '{"city": "Paris", "days": 3, "budget": 1250.5, "flexible": true, "notes": null}',
+    '{"steps": [{"description": "Plan the trip", "status": "pending"}, '
+    '{"description": "Book", "status": "completed"}], "count": 2}',
+    '[1, -2, 3.5e-3, [], {}, [[]], "", false]',
+    '{"text": "line\\nbreak \\"quoted\\" tab\\t slash\\/ back\\\\slash \\u00e9 \\ud83d\\udc4b"}',
+    ' { "nested" : { "a" : [ { "b" : [ 0 , 10 ] } ] } } ',
+    '"just a string"',
+    '[true, false, null]',
+    '{"emoji": "Grüße 👋", "empty": {}, "list": []}',
+]
+
+
+def feed_all(parser, fragments):
+    """Feeds the fragments and returns the completed values"""
+    completed = []
+    for fragment in fragments:
+        completed.extend(parser.feed(fragment))
+    return completed
+
+
+class TestPartialJSONParser(unittest.TestCase):
+    """Test suite for PartialJSONParser"""
+
+    def test_split_at_every_position(self):
+        """Test that documents split anywhere parse to what json.loads returns"""
+        for document in DOCUMENTS:
+            for split in range(len(document) + 1):
+                with self.subTest(document=document, split=split):
+                    parser = PartialJSONParser()
+                    feed_all(parser, [document[:split], document[split:]])
+                    self.assertEqual(parser.close(), json.loads(document))
+
+    def test_one_character_at_a_time(self):
+        """Test feeding one character at a time, reading the value after each"""
+        for document in DOCUMENTS:
+            with self.subTest(document=document):
+                parser = PartialJSONParser()
+                for char in document:
+                    parser.feed(char)
+                    parser.value  # pylint: disable=pointless-statement
+                self.assertTrue(parser.done)
+                self.assertEqual(parser.value, json.loads(document))
+                self.assertEqual(parser.close(), json.loads(document))
+
+    def test_random_fragments(self):
+        """Test random fragments of generated documents"""
+        generator = random.Random(7)
+
+        def make(depth):
+            kind = generator.randrange(7 if depth < 4 else 4)
+            if kind == 0:
+                return generator.randint(-1000, 1000)
+            if kind == 1:
+                return generator.random() * 100
+            if kind == 2:
+                return "".join(generator.choice('ab "\\\n/é👋') for _ in range(generator.randrange(8)))
+            if kind == 3:
+                return generator.choice([True, False, None])
+            if kind in (4, 5):
+                return [make(depth + 1) for _ in range(generator.randrange(4))]
+            return {f"k{i}": make(depth + 1) for i in range(generator.randrange(4))}
+
+        for _ in range(200):
+            document = json.dumps(make(0), ensure_ascii=generator.random() < 0.5)
+            fragments = []
+            position = 0
+            while position < len(document):
+                size = generator.randint(1, 6)
+                fragments.append(document[position:position + size])
+                position += size
+            with self.subTest(document=document, fragments=fragments):
+                parser = PartialJSONParser()
+                for fragment in fragments:
+                    parser.feed(fragment)
+                    if generator.random() < 0.5:
+                        parser.value  # pylint: disable=pointless-statement
+                self.assertEqual(parser.close(), json.loads(document))
+
+    def test_completions(self):
+        """Test that values are reported with their path as soon as they are complete"""
+        parser = PartialJSONParser()
+        self.assertEqual(parser.feed('{"steps": [{"description": "Pla'), [])
+        self.assertEqual(
+            parser.feed('n", "status": "pending"}, {"desc'),
+            [
+                (("steps", 0, "description"), "Plan"),
+                (("steps", 0, "status"), "pending"),
+                (("steps", 0), {"description": "Plan", "status": "pending"}),
+            ],
+        )
+        self.assertEqual(parser.feed('ription": "Book"}], "count": 2'), [
+            (("steps", 1, "description"), "Book"),
+            (("steps", 1), {"description": "Book"}),
+            (("steps",), [{"description": "Plan", "status": "pending"}, {"description": "Book"}]),
+        ])
+        self.assertFalse(parser.done)
+        completed = parser.feed("}")
+        self.assertEqual([path for path, _ in completed], [("count",), ()])
+        self.assertTrue(parser.done)
+
+    def test_partial_value(self):
+        """Test the best-effort value of an incomplete document"""
+        parser = PartialJSONParser()
+        self.assertIsNone(parser.value)
+        parser.feed('{"story": "Once upon a ti')
+        self.assertEqual(parser.value, {"story": "Once upon a ti"})
+        parser.feed('me", "tags": ["a", "b')
+        self.assertEqual(parser.value, {"story": "Once upon a time", "tags": ["a", "b"]})
+        parser.feed('c", 12')
+        self.assertEqual(parser.value, {"story": "Once upon a time", "tags": ["a", "bc", 12]})
+        parser.feed('.')
+        self.assertEqual(parser.value["tags"], ["a", "bc", 12])
+        parser.feed('5, tr')
+        self.assertEqual(parser.value["tags"], ["a", "bc", 12.5])
+        parser.feed('ue], "ke')
+        self.assertEqual(parser.value, {"story": "Once upon a time", "tags": ["a", "bc", 12.5, True]})
+
+    def test_partial_escapes(self):
+        """Test that an escape sequence split across fragments is left out of the partial string"""
+        parser = PartialJSONParser()
+        parser.feed('{"a": "x\\')
+        self.assertEqual(parser.value, {"a": "x"})
+        parser.feed("u00")
+        self.assertEqual(parser.value, {"a": "x"})
+        parser.feed("e9\\ud83d")
+        self.assertEqual(parser.value, {"a": "xé\ud83d"})
+        parser.feed("\\udc4b")
+        self.assertEqual(parser.value, {"a": "xé👋"})
+        parser.feed('"}')
+        self.assertEqual(parser.close(), {"a": "xé👋"})
+
+    def test_top_level_scalars(self):
+        """Test that a number at the top level only completes at close"""
+        parser = PartialJSONParser()
+        self.assertEqual(parser.feed("12"), [])
+        self.assertEqual(parser.value, 12)
+        self.assertFalse(parser.done)
+        self.assertEqual(parser.close(), 12)
+        parser = PartialJSONParser()
+        self.assertEqual(parser.feed('"ab'), [])
+        self.assertEqual(parser.value, "ab")
+        self.assertEqual(parser.feed('c" '), [((), "abc")])
+        self.assertTrue(parser.done)
+
+    def test_invalid(self):
+        """Test that invalid documents raise ValueError"""
+        invalid = [
+            "{,}", '{"a" 1}', '{"a": 1,}', "[1,]", "[1 2]", "tru3", "nul", "01", "1.", "-",
+            '{"a": 1}}', '{"a": 1} 2', "{1: 2}", '"a\x01"', "]", '{"a": 1]', "[1}",
+        ]
+        for document in invalid:
+            with self.subTest(document=document):
+                with self.assertRaises(ValueError):
+                    parser = PartialJSONParser()
+                    parser.feed(document)
+                    parser.close()
+        for document in ["", "[1, 2", '{"a": "b', "{", "tr"]:
+            with self.subTest(document=document):
+                parser = PartialJSONParser()
+                parser.feed(document)
+                with self.assertRaisesRegex(ValueError, "Incomplete"):
+                    parser.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
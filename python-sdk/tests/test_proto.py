@@ -0,0 +1,302 @@
+import unittest
+import os
+import shutil
+import subprocess
+
+from ag_ui.core.events import (
+    EventType,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageChunkEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallChunkEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+    MessagesSnapshotEvent,
+    CustomEvent,
+    RunFinishedEvent,
+    RunErrorEvent,
+    ThinkingStartEvent,
+)
+from ag_ui.core.types import AssistantMessage, UserMessage, ToolMessage, ToolCall, FunctionCall
+from ag_ui.proto import encode, decode
+
+PROTO_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "..", "typescript-sdk", "packages", "proto", "src", "proto"
+)
+PROTOC = shutil.which("protoc")
+
+
+def _protoc(mode: str, data: bytes) -> bytes:
+    """Runs protoc --encode/--decode against the shared .proto schemas"""
+    result = subprocess.run(
+        [PROTOC, f"--{mode}=ag_ui.Event", "-I", PROTO_DIR, "events.proto"],
+        input=data,
+        capture_output=True,
+        check=True,
+    )
+    return result.stdout
+
+
+class TestProtoEncoding(unittest.TestCase):
+    """Test suite for the protobuf encoding"""
+
+    def test_text_message_content_bytes(self):
+        """Test the exact wire bytes of a small event"""
+        event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="m",
+            delta="hi",
+        )
+        # oneof field 2 { base_event { type: 1 } message_id: "m" delta: "hi" }
+        self.assertEqual(encode(event), bytes.fromhex("120b0a02080112016d1a026869"))
+
+    def test_oneof_field_numbers_above_15(self):
+        """Test that oneof tags above field 15 are varint encoded"""
+        event = ToolCallChunkEvent(type=EventType.TOOL_CALL_CHUNK, delta="x")
+        encoded = encode(event)
+        # field 18, wire type 2 -> 0x92 0x01
+        self.assertEqual(encoded[:2], b"\x92\x01")
+
+    def test_default_values_are_omitted(self):
+        """Test that empty strings and the zero enum value are not written"""
+        event = TextMessageStartEvent(
+            type=EventType.TEXT_MESSAGE_START,
+            message_id="",
+            role="assistant",
+        )
+        # base_event is empty, message_id is omitted, role is optional and written
+        self.assertEqual(encode(event), bytes.fromhex("0a0d0a001a09617373697374616e74"))
+
+    def test_negative_timestamp(self):
+        """Test that negative int64 values use ten byte varints"""
+        event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="m",
+            delta="d",
+            timestamp=-1,
+        )
+        self.assertIn(b"\x10" + b"\xff" * 9 + b"\x01", encode(event))
+
+    def test_unsupported_event_type(self):
+        """Test that events without a protobuf schema raise a ValueError"""
+        event = ThinkingStartEvent(type=EventType.THINKING_START)
+        with self.assertRaises(ValueError):
+            encode(event)
+
+    def test_invalid_patch_operation(self):
+        """Test that unknown JSON Patch operations raise a ValueError"""
+        event = StateDeltaEvent(
+            type=EventType.STATE_DELTA,
+            delta=[{"op": "merge", "path": "/a"}],
+        )
+        with self.assertRaises(ValueError):
+            encode(event)
+
+
+class TestProtoDecoding(unittest.TestCase):
+    """Test suite for the protobuf decoding"""
+
+    def test_round_trip(self):
+        """Test that every supported event type decodes to an equal event"""
+        events = [
+            TextMessageStartEvent(
+                type=EventType.TEXT_MESSAGE_START, message_id="m", role="assistant", timestamp=-1
+            ),
+            TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, delta="x"),
+            ToolCallChunkEvent(type=EventType.TOOL_CALL_CHUNK, tool_call_id="c", delta=""),
+            StateSnapshotEvent(
+                type=EventType.STATE_SNAPSHOT,
+                snapshot={"a": [1, 2.5, None, True, "ü", {}], "b": {"c": -3}},
+                raw_event={"source": "test"},
+            ),
+            StateDeltaEvent(
+                type=EventType.STATE_DELTA,
+                delta=[
+                    {"op": "add", "path": "", "value": None},
+                    {"op": "copy", "from": "/a", "path": "/b"},
+                ],
+            ),
+            CustomEvent(type=EventType.CUSTOM, name="n", value=None),
+            RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t", run_id="r"),
+        ]
+        for event in events:
+            decoded = decode(encode(event))
+            self.assertIs(type(decoded), type(event))
+            self.assertEqual(decoded, event)
+
+    def test_numbers(self):
+        """Test that integral doubles decode as int and other doubles as float"""
+        event = StateSnapshotEvent(
+            type=EventType.STATE_SNAPSHOT,
+            snapshot=[3, 3.0, 0.5, 2 ** 53 + 2, -0.0],
+        )
+        snapshot = decode(encode(event)).snapshot
+        self.assertEqual([type(value) for value in snapshot], [int, int, float, float, int])
+
+    def test_decode_slice(self):
+        """Test decoding a message inside a larger buffer"""
+        event = ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c", delta="{}")
+        message = encode(event)
+        data = bytearray(b"xx" + message + b"yy")
+        self.assertEqual(decode(data, 2, 2 + len(message)), event)
+        self.assertEqual(decode(memoryview(message)), event)
+
+    def test_malformed_messages(self):
+        """Test that malformed messages raise ValueError"""
+        message = encode(TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="hi"
+        ))
+        for data in (message[:-1], b"", b"\xfa\x01\x00", b"\x12\x02\x1a\x01"):
+            with self.assertRaises(ValueError):
+                decode(data)
+
+
+@unittest.skipUnless(PROTOC and os.path.isdir(PROTO_DIR), "protoc or proto schemas not available")
+class TestProtoConformance(unittest.TestCase):
+    """Checks the encoding against protoc and the schemas shared with the TypeScript SDK"""
+
+    def assert_conforms(self, event, text_format: str):
+        """The encoded event must equal what protoc produces for the text format"""
+        expected = _protoc("encode", text_format.encode("utf-8"))
+        self.assertEqual(encode(event), expected)
+        # protoc must also be able to decode the message without errors
+        _protoc("decode", encode(event))
+        # and the message written by protoc must decode to the same event
+        self.assertEqual(decode(expected), event)
+
+    def test_text_message_events(self):
+        """Test text message events"""
+        self.assert_conforms(
+            TextMessageStartEvent(
+                type=EventType.TEXT_MESSAGE_START,
+                message_id="msg_1",
+                role="assistant",
+                timestamp=1648214400000,
+            ),
+            'text_message_start { base_event { timestamp: 1648214400000 } '
+            'message_id: "msg_1" role: "assistant" }',
+        )
+        self.assert_conforms(
+            TextMessageContentEvent(
+                type=EventType.TEXT_MESSAGE_CONTENT,
+                message_id="msg_1",
+                delta="Hello ✓ \"world\"\n",
+            ),
+            'text_message_content { base_event { type: TEXT_MESSAGE_CONTENT } '
+            'message_id: "msg_1" delta: "Hello \\342\\234\\223 \\"world\\"\\n" }',
+        )
+        self.assert_conforms(
+            TextMessageChunkEvent(
+                type=EventType.TEXT_MESSAGE_CHUNK,
+                message_id="msg_1",
+                delta="",
+            ),
+            'text_message_chunk { base_event { } message_id: "msg_1" delta: "" }',
+        )
+
+    def test_tool_call_events(self):
+        """Test tool call events"""
+        self.assert_conforms(
+            ToolCallStartEvent(
+                type=EventType.TOOL_CALL_START,
+                tool_call_id="call_1",
+                tool_call_name="search",
+                parent_message_id="msg_1",
+            ),
+            'tool_call_start { base_event { type: TOOL_CALL_START } '
+            'tool_call_id: "call_1" tool_call_name: "search" parent_message_id: "msg_1" }',
+        )
+        self.assert_conforms(
+            ToolCallArgsEvent(
+                type=EventType.TOOL_CALL_ARGS,
+                tool_call_id="call_1",
+                delta='{"query": ',
+            ),
+            'tool_call_args { base_event { type: TOOL_CALL_ARGS } '
+            'tool_call_id: "call_1" delta: "{\\"query\\": " }',
+        )
+
+    def test_state_events(self):
+        """Test state snapshot and delta events"""
+        self.assert_conforms(
+            StateSnapshotEvent(
+                type=EventType.STATE_SNAPSHOT,
+                snapshot={"count": 3, "items": ["a", None, False], "nested": {"ratio": 0.5}},
+            ),
+            'state_snapshot { base_event { type: STATE_SNAPSHOT } snapshot { struct_value { '
+            'fields { key: "count" value { number_value: 3 } } '
+            'fields { key: "items" value { list_value { values { string_value: "a" } '
+            'values { null_value: NULL_VALUE } values { bool_value: false } } } } '
+            'fields { key: "nested" value { struct_value { fields { key: "ratio" '
+            'value { number_value: 0.5 } } } } } } } }',
+        )
+        self.assert_conforms(
+            StateDeltaEvent(
+                type=EventType.STATE_DELTA,
+                delta=[
+                    {"op": "add", "path": "/foo", "value": "bar"},
+                    {"op": "remove", "path": "/baz"},
+                    {"op": "move", "from": "/a", "path": "/b"},
+                ],
+            ),
+            'state_delta { base_event { type: STATE_DELTA } '
+            'delta { op: ADD path: "/foo" value { string_value: "bar" } } '
+            'delta { op: REMOVE path: "/baz" } '
+            'delta { op: MOVE path: "/b" from: "/a" } }',
+        )
+
+    def test_messages_snapshot_event(self):
+        """Test messages snapshot events"""
+        self.assert_conforms(
+            MessagesSnapshotEvent(
+                type=EventType.MESSAGES_SNAPSHOT,
+                messages=[
+                    UserMessage(id="u1", role="user", content="hi"),
+                    AssistantMessage(
+                        id="a1",
+                        role="assistant",
+                        tool_calls=[
+                            ToolCall(
+                                id="call_1",
+                                type="function",
+                                function=FunctionCall(name="search", arguments="{}"),
+                            )
+                        ],
+                    ),
+                    ToolMessage(id="t1", role="tool", content="ok", tool_call_id="call_1"),
+                ],
+            ),
+            'messages_snapshot { base_event { type: MESSAGES_SNAPSHOT } '
+            'messages { id: "u1" role: "user" content: "hi" } '
+            'messages { id: "a1" role: "assistant" tool_calls { id: "call_1" type: "function" '
+            'function { name: "search" arguments: "{}" } } } '
+            'messages { id: "t1" role: "tool" content: "ok" tool_call_id: "call_1" } }',
+        )
+
+    def test_run_and_custom_events(self):
+        """Test run lifecycle and custom events"""
+        self.assert_conforms(
+            RunFinishedEvent(
+                type=EventType.RUN_FINISHED,
+                thread_id="t",
+                run_id="r",
+                result=[1, 2],
+            ),
+            'run_finished { base_event { type: RUN_FINISHED } thread_id: "t" run_id: "r" '
+            'result { list_value { values { number_value: 1 } values { number_value: 2 } } } }',
+        )
+        self.assert_conforms(
+            RunErrorEvent(type=EventType.RUN_ERROR, message="boom", code="E1"),
+            'run_error { base_event { type: RUN_ERROR } code: "E1" message: "boom" }',
+        )
+        self.assert_conforms(
+            CustomEvent(type=EventType.CUSTOM, name="PredictState", value={"tool": "write"}),
+            'custom { base_event { type: CUSTOM } name: "PredictState" value { struct_value { '
+            'fields { key: "tool" value { string_value: "write" } } } } }',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
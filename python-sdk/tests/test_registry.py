@@ -0,0 +1,88 @@
+import inspect
+import os
+import re
+import unittest
+
+from ag_ui.core import events
+from ag_ui.core.events import (
+    BaseEvent,
+    EventType,
+    ThinkingStartEvent,
+    ThinkingTextMessageContentEvent,
+    ToolCallArgsEvent,
+)
+from ag_ui.core.registry import (
+    EVENT_CLASSES,
+    EVENT_TYPES_BY_WIRE_CODE,
+    EVENT_WIRE_CODES,
+    get_event_adapter,
+    get_event_class,
+)
+from ag_ui.decoder import iter_sse_events
+from ag_ui.encoder import EventEncoder
+
+from tests.test_proto import PROTO_DIR
+
+
+class TestEventRegistry(unittest.TestCase):
+    """Test suite for the event registry"""
+
+    def test_union_is_exhaustive(self):
+        """Test that every event class is in the Event union, once per type"""
+        classes = {
+            cls for _, cls in inspect.getmembers(events, inspect.isclass)
+            if issubclass(cls, BaseEvent) and cls is not BaseEvent
+        }
+        self.assertEqual(set(EVENT_CLASSES.values()), classes)
+        self.assertEqual(set(EVENT_CLASSES), set(EventType))
+        for event_type, cls in EVENT_CLASSES.items():
+            self.assertEqual(cls.model_fields["type"].annotation.__args__, (event_type,))
+
+    def test_wire_codes(self):
+        """Test that the wire codes are dense and match events.proto"""
+        self.assertEqual(sorted(EVENT_WIRE_CODES.values()), list(range(len(EventType))))
+        self.assertEqual(
+            {code: event_type for event_type, code in EVENT_WIRE_CODES.items()},
+            EVENT_TYPES_BY_WIRE_CODE,
+        )
+        path = os.path.join(PROTO_DIR, "events.proto")
+        if not os.path.exists(path):
+            self.skipTest("proto schemas not available")
+        with open(path, encoding="utf-8") as f:
+            enum = re.search(r"enum EventType \{(.*?)\}", f.read(), re.S).group(1)
+        for name, code in re.findall(r"(\w+) = (\d+);", enum):
+            self.assertEqual(EVENT_WIRE_CODES[EventType(name)], int(code), name)
+
+    def test_lookup(self):
+        """Test that classes are found by type, type value and wire code"""
+        self.assertIs(get_event_class(EventType.TOOL_CALL_ARGS), ToolCallArgsEvent)
+        self.assertIs(get_event_class("TOOL_CALL_ARGS"), ToolCallArgsEvent)
+        self.assertIs(get_event_class(4), ToolCallArgsEvent)
+        with self.assertRaises(ValueError):
+            get_event_class("UNKNOWN")
+        with self.assertRaises(ValueError):
+            get_event_class(len(EventType))
+
+    def test_adapters(self):
+        """Test that the class adapters validate without the union and are cached"""
+        data = b'{"type":"THINKING_START","title":"Plan"}'
+        adapter = get_event_adapter(EventType.THINKING_START)
+        self.assertIs(adapter, get_event_adapter(EVENT_WIRE_CODES[EventType.THINKING_START]))
+        self.assertEqual(
+            adapter.validate_json(data),
+            ThinkingStartEvent(type=EventType.THINKING_START, title="Plan"),
+        )
+        self.assertEqual(get_event_adapter().validate_json(data), adapter.validate_json(data))
+        with self.assertRaises(ValueError):
+            get_event_adapter(EventType.THINKING_END).validate_json(data)
+
+    def test_decoding_thinking_events(self):
+        """Test that thinking events decode through the Event union"""
+        event = ThinkingTextMessageContentEvent(
+            type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta="Let me think"
+        )
+        self.assertEqual(list(iter_sse_events([EventEncoder().encode_binary(event)])), [event])
+
+
+if __name__ == "__main__":
+    unittest.main()
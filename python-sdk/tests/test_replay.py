@@ -0,0 +1,206 @@
+import asyncio
+import unittest
+
+from ag_ui.core.events import EventType, RunStartedEvent
+from ag_ui.encoder.encoder import EventEncoder
+from ag_ui.encoder.replay import (
+    ReplayBuffer,
+    ReplayUnavailableError,
+    ResumableRun,
+    ResumableRunRegistry,
+    RunCancelledError,
+    parse_last_event_id,
+)
+from tests.event_helpers import content_event
+
+
+class TestEventIds(unittest.TestCase):
+    """Test suite for SSE event ids"""
+
+    def test_event_ids_disabled_by_default(self):
+        """Test that no id field is written by default"""
+        encoder = EventEncoder()
+        self.assertTrue(encoder.encode(content_event("a")).startswith("data: "))
+        self.assertEqual(encoder.last_event_id, 0)
+
+    def test_monotonic_event_ids(self):
+        """Test that event ids increase with every encoded event"""
+        encoder = EventEncoder(event_ids=True)
+        first = encoder.encode(content_event("a"))
+        second = encoder.encode_binary(content_event("b"))
+        self.assertTrue(first.startswith("id: 1\ndata: {"))
+        self.assertTrue(second.startswith(b"id: 2\ndata: {"))
+        self.assertEqual(encoder.last_event_id, 2)
+
+    def test_parse_last_event_id(self):
+        """Test parsing of Last-Event-ID header values"""
+        self.assertEqual(parse_last_event_id(" 12 "), 12)
+        self.assertIsNone(parse_last_event_id(None))
+        self.assertIsNone(parse_last_event_id("abc"))
+
+
+class TestReplayBuffer(unittest.IsolatedAsyncioTestCase):
+    """Test suite for the replay buffer"""
+
+    def test_frames_after(self):
+        """Test replaying frames after an event id"""
+        buffer = ReplayBuffer(max_events=3)
+        for event_id in range(1, 5):
+            buffer.append(event_id, f"frame {event_id}".encode())
+        self.assertEqual(buffer.last_event_id, 4)
+        self.assertEqual(buffer.frames_after(2), [b"frame 3", b"frame 4"])
+        self.assertEqual(buffer.frames_after(4), [])
+        with self.assertRaises(ReplayUnavailableError):
+            buffer.frames_after(0)
+
+    def test_non_contiguous_ids_are_rejected(self):
+        """Test that event ids must be contiguous"""
+        buffer = ReplayBuffer()
+        buffer.append(1, b"a")
+        with self.assertRaises(ValueError):
+            buffer.append(3, b"c")
+
+    async def test_subscribe_follows_live_tail(self):
+        """Test that subscribers receive missed frames and then new frames"""
+        buffer = ReplayBuffer()
+        buffer.append(1, b"a")
+        buffer.append(2, b"b")
+
+        async def consume():
+            return [frame async for frame in buffer.subscribe(1)]
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+        buffer.append(3, b"c")
+        await asyncio.sleep(0)
+        buffer.append(4, b"d")
+        buffer.close()
+        self.assertEqual(await task, [b"b", b"c", b"d"])
+
+    async def test_subscribe_reraises_run_errors(self):
+        """Test that errors of the run are raised to subscribers"""
+        buffer = ReplayBuffer()
+        buffer.append(1, b"a")
+        buffer.close(RuntimeError("boom"))
+        with self.assertRaises(RuntimeError):
+            async for _ in buffer.subscribe():
+                pass
+
+
+class TestResumableRun(unittest.IsolatedAsyncioTestCase):
+    """Test suite for resumable runs"""
+
+    async def test_reconnect_receives_only_missed_frames(self):
+        """Test that a reconnecting client resumes after its last event id"""
+        release = asyncio.Event()
+
+        async def events():
+            yield RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r")
+            yield content_event("a")
+            await release.wait()
+            yield content_event("b")
+            yield content_event("c")
+
+        registry = ResumableRunRegistry()
+        run = registry.start("r", events())
+
+        # first connection reads two frames and drops
+        stream = run.stream()
+        received = [await stream.__anext__(), await stream.__anext__()]
+        await stream.aclose()
+        self.assertTrue(received[1].startswith(b"id: 2\n"))
+
+        # the run continues without a client
+        release.set()
+        await asyncio.sleep(0.01)
+        self.assertTrue(run.done)
+
+        resumed = [frame async for frame in registry.get("r").stream("2")]
+        self.assertEqual(len(resumed), 2)
+        self.assertTrue(resumed[0].startswith(b"id: 3\n"))
+        self.assertIn(b'"delta":"c"', resumed[1])
+
+    async def test_evicted_frames_raise_before_streaming(self):
+        """Test that stream raises right away when frames were evicted"""
+        async def events():
+            for delta in "abcde":
+                yield content_event(delta)
+
+        run = ResumableRun(events(), max_events=2)
+        run.start()
+        await asyncio.sleep(0.01)
+        with self.assertRaises(ReplayUnavailableError):
+            run.stream("1")
+        self.assertEqual(len([frame async for frame in run.stream("3")]), 2)
+
+    async def test_registry_retention(self):
+        """Test that finished runs expire after the retention period"""
+        async def events():
+            yield content_event("a")
+
+        registry = ResumableRunRegistry(retention=0)
+        run = registry.start("r", events())
+        await asyncio.sleep(0.01)
+        self.assertTrue(run.done)
+        self.assertIsNone(registry.get("r"))
+
+    async def test_registry_limit(self):
+        """Test that finished runs make room first and dropped live runs are cancelled"""
+        consumed = []
+
+        async def live(name):
+            while True:
+                consumed.append(name)
+                yield content_event(name)
+                await asyncio.sleep(0.001)
+
+        async def short():
+            yield content_event("done")
+
+        registry = ResumableRunRegistry(max_runs=2)
+        first = registry.start("live_1", live("live_1"))
+        registry.start("finished", short())
+        await asyncio.sleep(0.01)
+        # the finished run is dropped although the live run is older
+        registry.start("live_2", live("live_2"))
+        self.assertIsNone(registry.get("finished"))
+        self.assertIs(registry.get("live_1"), first)
+        # with only live runs left, the oldest one is cancelled
+        registry.start("live_3", live("live_3"))
+        self.assertIsNone(registry.get("live_1"))
+        await asyncio.sleep(0.01)
+        self.assertTrue(first.done)
+        count = consumed.count("live_1")
+        await asyncio.sleep(0.01)
+        self.assertEqual(consumed.count("live_1"), count)
+        self.assertGreater(consumed.count("live_3"), 0)
+        for run_id in ("live_2", "live_3"):
+            registry.get(run_id).cancel()
+
+    async def test_subscribers_of_evicted_runs_get_an_error(self):
+        """Test that a subscriber of a cancelled run gets RunCancelledError, not a clean end"""
+        async def live():
+            while True:
+                yield content_event("a")
+                await asyncio.sleep(0.001)
+
+        registry = ResumableRunRegistry(max_runs=1)
+        stream = registry.start("r1", live()).stream()
+        received = [await stream.__anext__() for _ in range(4)]
+        self.assertEqual(len(received), 4)
+        registry.start("r2", live())
+        with self.assertRaises(RunCancelledError):
+            async for _ in stream:
+                pass
+        # a run cancelled before its task ran ends its subscribers as well
+        registry.start("r3", live())
+        stream = registry.start("r3", live()).stream()
+        registry.start("r4", live())
+        with self.assertRaises(RunCancelledError):
+            async for _ in stream:
+                pass
+        registry.get("r4").cancel()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,309 @@
+import json
+import unittest
+
+from pydantic import BaseModel
+
+from ag_ui.core.events import (
+    EventType,
+    BaseEvent,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageChunkEvent,
+    ThinkingTextMessageStartEvent,
+    ThinkingTextMessageContentEvent,
+    ThinkingTextMessageEndEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    ToolCallChunkEvent,
+    ToolCallResultEvent,
+    ThinkingStartEvent,
+    ThinkingEndEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+    MessagesSnapshotEvent,
+    RawEvent,
+    CustomEvent,
+    RunStartedEvent,
+    RunFinishedEvent,
+    RunErrorEvent,
+    StepStartedEvent,
+    StepFinishedEvent,
+)
+from ag_ui.core.types import (
+    AssistantMessage,
+    UserMessage,
+    ToolMessage,
+    ToolCall,
+    FunctionCall,
+    RawJSON,
+)
+from ag_ui.decoder import iter_ndjson_events, iter_sse_events
+from ag_ui.encoder.encoder import EventEncoder, AGUI_MEDIA_TYPE, NDJSON_MEDIA_TYPE
+from ag_ui.encoder.serializers import get_binary_serializer, get_serializer, event_classes
+from ag_ui.proto import decode
+
+TRICKY_TEXT = 'Hello "world" \\ / \n\t\r\x00\x1f\x7f ✓   😀'
+
+
+class _Payload(BaseModel):
+    """A nested model with snake_case fields and None values"""
+    some_field: int = 1
+    optional_field: object = None
+
+
+SAMPLES = {
+    BaseEvent: [
+        BaseEvent(type=EventType.RAW, timestamp=1648214400000),
+        BaseEvent(type=EventType.RAW, raw_event={"a": None, "b": [1, 2.5, True]}),
+    ],
+    TextMessageStartEvent: [
+        TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id="m1", role="assistant"),
+    ],
+    TextMessageContentEvent: [
+        TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m1", delta="x"),
+        TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id=TRICKY_TEXT,
+            delta=TRICKY_TEXT,
+            timestamp=-5,
+            raw_event=_Payload(),
+        ),
+    ],
+    TextMessageEndEvent: [
+        TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="m1"),
+    ],
+    TextMessageChunkEvent: [
+        TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK),
+        TextMessageChunkEvent(
+            type=EventType.TEXT_MESSAGE_CHUNK, message_id="m1", role="assistant", delta=""
+        ),
+    ],
+    ThinkingTextMessageStartEvent: [
+        ThinkingTextMessageStartEvent(type=EventType.THINKING_TEXT_MESSAGE_START),
+    ],
+    ThinkingTextMessageContentEvent: [
+        ThinkingTextMessageContentEvent(
+            type=EventType.THINKING_TEXT_MESSAGE_CONTENT, delta=TRICKY_TEXT
+        ),
+    ],
+    ThinkingTextMessageEndEvent: [
+        ThinkingTextMessageEndEvent(type=EventType.THINKING_TEXT_MESSAGE_END),
+    ],
+    ToolCallStartEvent: [
+        ToolCallStartEvent(
+            type=EventType.TOOL_CALL_START, tool_call_id="c1", tool_call_name="search"
+        ),
+        ToolCallStartEvent(
+            type=EventType.TOOL_CALL_START,
+            tool_call_id="c1",
+            tool_call_name="search",
+            parent_message_id="m1",
+        ),
+    ],
+    ToolCallArgsEvent: [
+        ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c1", delta='{"q": "'),
+    ],
+    ToolCallEndEvent: [
+        ToolCallEndEvent(type=EventType.TOOL_CALL_END, tool_call_id="c1"),
+    ],
+    ToolCallChunkEvent: [
+        ToolCallChunkEvent(type=EventType.TOOL_CALL_CHUNK, tool_call_id="c1", delta="{"),
+    ],
+    ToolCallResultEvent: [
+        ToolCallResultEvent(
+            type=EventType.TOOL_CALL_RESULT,
+            message_id="m2",
+            tool_call_id="c1",
+            content=TRICKY_TEXT,
+            role="tool",
+        ),
+    ],
+    ThinkingStartEvent: [
+        ThinkingStartEvent(type=EventType.THINKING_START),
+        ThinkingStartEvent(type=EventType.THINKING_START, title="Planning"),
+    ],
+    ThinkingEndEvent: [
+        ThinkingEndEvent(type=EventType.THINKING_END),
+    ],
+    StateSnapshotEvent: [
+        StateSnapshotEvent(
+            type=EventType.STATE_SNAPSHOT,
+            snapshot={"steps": [{"status": "pending", "note": None}], "count": 2, "ratio": 0.1},
+        ),
+        StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=_Payload(optional_field="x")),
+        StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=[1, "two", False]),
+    ],
+    StateDeltaEvent: [
+        StateDeltaEvent(
+            type=EventType.STATE_DELTA,
+            delta=[{"op": "replace", "path": "/a", "value": None}],
+        ),
+    ],
+    MessagesSnapshotEvent: [
+        MessagesSnapshotEvent(
+            type=EventType.MESSAGES_SNAPSHOT,
+            messages=[
+                UserMessage(id="u1", role="user", content=TRICKY_TEXT),
+                AssistantMessage(
+                    id="a1",
+                    role="assistant",
+                    tool_calls=[
+                        ToolCall(
+                            id="c1",
+                            type="function",
+                            function=FunctionCall(name="search", arguments="{}"),
+                        )
+                    ],
+                ),
+                ToolMessage(id="t1", role="tool", content="ok", tool_call_id="c1"),
+            ],
+        ),
+    ],
+    RawEvent: [
+        RawEvent(type=EventType.RAW, event={"upstream": "event"}, source="openai"),
+        RawEvent(type=EventType.RAW, event="text"),
+    ],
+    CustomEvent: [
+        CustomEvent(type=EventType.CUSTOM, name="PredictState", value=[{"tool": "write"}]),
+        CustomEvent(type=EventType.CUSTOM, name="Nothing", value=None),
+    ],
+    RunStartedEvent: [
+        RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t1", run_id="r1"),
+    ],
+    RunFinishedEvent: [
+        RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t1", run_id="r1"),
+        RunFinishedEvent(
+            type=EventType.RUN_FINISHED, thread_id="t1", run_id="r1", result={"ok": True}
+        ),
+    ],
+    RunErrorEvent: [
+        RunErrorEvent(type=EventType.RUN_ERROR, message=TRICKY_TEXT, code="E1"),
+    ],
+    StepStartedEvent: [
+        StepStartedEvent(type=EventType.STEP_STARTED, step_name="plan"),
+    ],
+    StepFinishedEvent: [
+        StepFinishedEvent(type=EventType.STEP_FINISHED, step_name="plan"),
+    ],
+}
+
+
+class TestFastSerializers(unittest.TestCase):
+    """Test suite for the precompiled event serializers"""
+
+    def test_every_event_class_has_samples(self):
+        """Every event class with a fast serializer must be covered below"""
+        self.assertEqual(set(event_classes()), set(SAMPLES))
+
+    def test_byte_identical_to_pydantic(self):
+        """The fast serializers must match model_dump_json exactly"""
+        for cls, samples in SAMPLES.items():
+            serializer = get_serializer(cls)
+            self.assertIsNotNone(serializer, cls.__name__)
+            for event in samples:
+                with self.subTest(event=cls.__name__):
+                    self.assertEqual(
+                        serializer(event),
+                        event.model_dump_json(by_alias=True, exclude_none=True),
+                    )
+
+    def test_binary_byte_identical_to_pydantic(self):
+        """The binary serializers must match the JSON bytes of pydantic-core exactly"""
+        for cls, samples in SAMPLES.items():
+            serializer = get_binary_serializer(cls)
+            for event in samples:
+                with self.subTest(event=cls.__name__):
+                    self.assertEqual(
+                        serializer(event),
+                        event.__pydantic_serializer__.to_json(event, by_alias=True, exclude_none=True),
+                    )
+
+    def test_unregistered_subclass_uses_generic_path(self):
+        """Event classes defined outside ag_ui.core.events are not compiled"""
+        class MyEvent(TextMessageContentEvent):
+            """A user defined event subclass"""
+            extra_field: str = "x"
+
+        self.assertIsNone(get_serializer(MyEvent))
+
+    def test_unexpected_value_types_fall_back(self):
+        """Values that bypassed validation are serialized through the field adapter"""
+        event = TextMessageContentEvent.model_construct(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="m1",
+            delta="x",
+            timestamp=True,
+        )
+        serializer = get_serializer(TextMessageContentEvent)
+        self.assertEqual(
+            serializer(event),
+            event.model_dump_json(by_alias=True, exclude_none=True),
+        )
+
+
+class TestRawJSON(unittest.TestCase):
+    """Test suite for pre-encoded JSON values"""
+
+    def test_pretty_printed_text_is_compacted(self):
+        """Text with line breaks is made compact, so that frames stay decodable"""
+        snapshot = {"a": [1, 2], "text": "line\nbreak"}
+        raw = RawJSON(json.dumps(snapshot, indent=2).replace("\n", "\r\n"))
+        self.assertEqual(raw.text, '{"a":[1,2],"text":"line\\nbreak"}')
+        self.assertEqual(RawJSON(json.dumps(snapshot, indent=2).encode("utf-8")), raw)
+        event = StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=raw)
+        for accept, decode_frames in (
+            (None, iter_sse_events), (NDJSON_MEDIA_TYPE, iter_ndjson_events)
+        ):
+            with self.subTest(accept=accept):
+                frame = EventEncoder(accept=accept).encode_binary(event)
+                self.assertEqual(
+                    list(decode_frames([frame])),
+                    [StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=snapshot)],
+                )
+        with self.assertRaises(ValueError):
+            RawJSON('{"a":\n')
+
+    def test_spliced_verbatim(self):
+        """RawJSON text is written into the frame as it is"""
+        snapshot = {"rows": [{"id": 1, "note": None, "text": TRICKY_TEXT}], "ratio": 0.5}
+        raw = RawJSON.dumps(snapshot)
+        cases = [
+            StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=raw),
+            CustomEvent(type=EventType.CUSTOM, name="cached", value=raw),
+            RawEvent(type=EventType.RAW, event=raw, raw_event=RawJSON(b'{"a": 1}')),
+        ]
+        for event in cases:
+            with self.subTest(event=event):
+                self.assertIn(raw.text, get_serializer(type(event))(event))
+                self.assertEqual(
+                    get_binary_serializer(type(event))(event),
+                    get_serializer(type(event))(event).encode("utf-8"),
+                )
+                self.assertEqual(
+                    json.loads(get_serializer(type(event))(event)),
+                    json.loads(event.model_dump_json(by_alias=True, exclude_none=True)),
+                )
+        self.assertEqual(
+            get_serializer(StateSnapshotEvent)(cases[0]),
+            StateSnapshotEvent(
+                type=EventType.STATE_SNAPSHOT, snapshot=snapshot
+            ).model_dump_json(by_alias=True, exclude_none=True),
+        )
+        self.assertEqual(
+            EventEncoder().encode(cases[0]),
+            f"data: {{\"type\":\"STATE_SNAPSHOT\",\"snapshot\":{raw.text}}}\n\n",
+        )
+
+    def test_generic_paths_decode(self):
+        """model_dump and the protobuf encoding decode the text"""
+        event = StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=RawJSON("[1, {}]"))
+        self.assertEqual(event.model_dump()["snapshot"], [1, {}])
+        frame = EventEncoder(accept=AGUI_MEDIA_TYPE, binary=True).encode_binary(event)
+        self.assertEqual(decode(frame[4:]).snapshot, [1, {}])
+        self.assertEqual(RawJSON(b"[1]"), RawJSON("[1]"))
+
+
+if __name__ == "__main__":
+    unittest.main()
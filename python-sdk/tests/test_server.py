@@ -0,0 +1,122 @@
+import asyncio
+import gzip
+import json
+import unittest
+
+try:
+    import fastapi
+    from fastapi.testclient import TestClient
+except ImportError:  # pragma: no cover
+    fastapi = None
+
+from ag_ui.core import EventType, RunAgentInput, RunFinishedEvent, RunStartedEvent
+from ag_ui.decoder import iter_ndjson_events, iter_sse_events
+from ag_ui.encoder import NDJSON_MEDIA_TYPE
+from ag_ui.server import RunContext
+
+if fastapi is not None:
+    from ag_ui.server.fastapi import run_agent_input, run_context, streaming_response
+
+BODY = {
+    "threadId": "t1",
+    "runId": "r1",
+    "state": {"count": 1},
+    "messages": [
+        {"id": "u1", "role": "user", "content": "Hello"},
+        {"id": "a1", "role": "assistant", "content": "Hi"},
+    ],
+    "tools": [],
+    "context": [],
+    "forwardedProps": {},
+}
+
+
+async def run_events(input_data: RunAgentInput):
+    """Yields the events of a minimal run"""
+    yield RunStartedEvent(
+        type=EventType.RUN_STARTED, thread_id=input_data.thread_id, run_id=input_data.run_id
+    )
+    yield RunFinishedEvent(
+        type=EventType.RUN_FINISHED, thread_id=input_data.thread_id, run_id=input_data.run_id
+    )
+
+
+async def collect(chunks):
+    """Collects an async byte stream"""
+    return b"".join([chunk async for chunk in chunks])
+
+
+class TestRunContext(unittest.TestCase):
+    """Test suite for RunContext"""
+
+    def test_stream(self):
+        """Test that the run's events are encoded in the negotiated format"""
+        input_data = RunAgentInput.model_validate(BODY)
+        context = RunContext(input_data, accept=NDJSON_MEDIA_TYPE, accept_encoding="gzip")
+        self.assertEqual(context.run_id, "r1")
+        self.assertEqual(context.get_content_type(), NDJSON_MEDIA_TYPE)
+        self.assertEqual(context.get_headers(), {"Content-Encoding": "gzip"})
+        body = asyncio.run(collect(context.stream(run_events(input_data))))
+        events = list(iter_ndjson_events([gzip.decompress(body)]))
+        self.assertEqual([event.type for event in events],
+                         [EventType.RUN_STARTED, EventType.RUN_FINISHED])
+
+        context = RunContext(input_data)
+        self.assertEqual(context.get_headers(), {})
+
+
+@unittest.skipIf(fastapi is None, "fastapi is not installed")
+class TestFastAPIDependencies(unittest.TestCase):
+    """Test suite for the FastAPI dependencies"""
+
+    def setUp(self):
+        app = fastapi.FastAPI()
+
+        @app.post("/input")
+        async def input_endpoint(
+            input_data: RunAgentInput = fastapi.Depends(run_agent_input()),
+        ):
+            return {"runId": input_data.run_id, "messages": len(input_data.messages)}
+
+        @app.post("/lazy")
+        async def lazy_endpoint(
+            input_data: RunAgentInput = fastapi.Depends(
+                run_agent_input(lazy=True, eager_messages=1)
+            ),
+        ):
+            return {"validated": input_data.messages.validated_count}
+
+        @app.post("/run")
+        async def run_endpoint(context: RunContext = fastapi.Depends(run_context())):
+            return streaming_response(context, run_events(context.input_data))
+
+        self.client = TestClient(app)
+
+    def test_validates_body(self):
+        """Test that the body is validated as RunAgentInput"""
+        response = self.client.post("/input", content=json.dumps(BODY))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"runId": "r1", "messages": 2})
+        response = self.client.post("/lazy", content=json.dumps(BODY))
+        self.assertEqual(response.json(), {"validated": 1})
+
+    def test_invalid_body(self):
+        """Test that invalid bodies get FastAPI's 422 response"""
+        response = self.client.post("/input", content=json.dumps({**BODY, "runId": None}))
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json()["detail"][0]["loc"], ["body", "runId"])
+        response = self.client.post("/input", content=b"{not json")
+        self.assertEqual(response.status_code, 422)
+
+    def test_streaming_response(self):
+        """Test that the run context streams the encoded events"""
+        response = self.client.post("/run", content=json.dumps(BODY))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        events = list(iter_sse_events([response.content]))
+        self.assertEqual([event.type for event in events],
+                         [EventType.RUN_STARTED, EventType.RUN_FINISHED])
+
+
+if __name__ == "__main__":
+    unittest.main()
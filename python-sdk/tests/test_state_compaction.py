@@ -0,0 +1,268 @@
+import copy
+import random
+import unittest
+
+from ag_ui.state import PatchError, StateTracker, apply_patch, compact_patches, format_pointer
+from tests.state_helpers import make_state
+
+
+def generic_patches(rng: random.Random, document):
+    """
+    Returns random valid patches of every kind for the document, with object
+    keys that look like list indexes, and the document after them.
+    """
+    def locations(value, path=()):
+        yield path, value
+        if isinstance(value, dict):
+            for key, item in value.items():
+                yield from locations(item, path + (key,))
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                yield from locations(item, path + (str(index),))
+
+    patches = []
+    for _ in range(rng.randrange(1, 6)):
+        patch = []
+        for _ in range(rng.randrange(1, 5)):
+            existing = list(locations(document))
+            path, target = rng.choice(existing)
+            containers = [(p, value) for p, value in existing if isinstance(value, (dict, list))]
+            op = rng.choice(["add", "add", "replace", "remove", "move", "copy", "test"])
+            value = rng.choice([1, "s", None, [], {}, [1, 2], {"0": "a", "x": 1}])
+            if not containers:
+                operation = {"op": "replace", "path": "", "value": {"0": [1]}}
+            elif op == "add":
+                parent, container = rng.choice(containers)
+                if isinstance(container, dict):
+                    key = rng.choice(["0", "1", "2", "-", "a"])
+                else:
+                    key = rng.choice([str(i) for i in range(len(container) + 1)] + ["-"])
+                operation = {"op": "add", "path": format_pointer(parent + (key,)), "value": value}
+            elif op == "replace":
+                operation = {"op": "replace", "path": format_pointer(path), "value": value}
+            elif op == "remove":
+                operation = {"op": "remove", "path": format_pointer(path)}
+            elif op == "test":
+                operation = {"op": "test", "path": format_pointer(path), "value": copy.deepcopy(target)}
+            else:
+                parent, _ = rng.choice(containers)
+                operation = {
+                    "op": op,
+                    "from": format_pointer(path),
+                    "path": format_pointer(parent + (rng.choice(["0", "1", "a", "-"]),)),
+                }
+            try:
+                document = apply_patch(document, [operation])
+            except PatchError:
+                continue
+            patch.append(operation)
+        patches.append(patch)
+    return patches, document
+
+
+class TestCompactPatches(unittest.TestCase):
+    """Test suite for compact_patches"""
+
+    def assertCompacts(self, patches, expected, document=None, with_document=False):
+        """Asserts the compacted patch and that it has the effect of the patches"""
+        document = make_state(4) if document is None else document
+        compacted = compact_patches(patches, document if with_document else None)
+        self.assertEqual(compacted, expected)
+        self.assertEqual(
+            apply_patch(document, compacted),
+            apply_patch(document, [op for patch in patches for op in patch]),
+        )
+
+    def test_replace_chains(self):
+        """Test that replacing a path keeps only the last value"""
+        self.assertCompacts(
+            [[{"op": "replace", "path": "/steps/0/status", "value": status}]
+             for status in ("running", "failed", "completed")],
+            [{"op": "replace", "path": "/steps/0/status", "value": "completed"}],
+        )
+        self.assertCompacts(
+            [[{"op": "add", "path": "/meta/owner", "value": "a"}],
+             [{"op": "replace", "path": "/meta/owner", "value": "b"}]],
+            [{"op": "add", "path": "/meta/owner", "value": "b"}],
+        )
+
+    def test_superseded_operations(self):
+        """Test that replacing or removing a value drops the changes below it"""
+        self.assertCompacts(
+            [[{"op": "replace", "path": "/steps/1/status", "value": "done"},
+              {"op": "add", "path": "/steps/1/tags/-", "value": "x"},
+              {"op": "replace", "path": "/meta/title", "value": "New"}],
+             [{"op": "remove", "path": "/steps/1"}]],
+            [{"op": "replace", "path": "/meta/title", "value": "New"},
+             {"op": "remove", "path": "/steps/1"}],
+        )
+
+    def test_folding_into_added_values(self):
+        """Test that changes below an added value are applied to the value"""
+        self.assertCompacts(
+            [[{"op": "add", "path": "/steps/-", "value": {"description": "New", "tags": []}}],
+             [{"op": "add", "path": "/log", "value": []}],
+             [{"op": "add", "path": "/log/-", "value": "started"}],
+             [{"op": "add", "path": "/log/-", "value": "finished"}]],
+            [{"op": "add", "path": "/steps/-", "value": {"description": "New", "tags": []}},
+             {"op": "add", "path": "/log", "value": ["started", "finished"]}],
+        )
+
+    def test_removed_additions(self):
+        """Test that removing an added value drops the value but keeps the add"""
+        self.assertCompacts(
+            [[{"op": "add", "path": "/steps/1", "value": {"description": "Temp"}}],
+             [{"op": "replace", "path": "/meta/title", "value": "x"}],
+             [{"op": "remove", "path": "/steps/1"}]],
+            [{"op": "add", "path": "/steps/1", "value": None},
+             {"op": "replace", "path": "/meta/title", "value": "x"},
+             {"op": "remove", "path": "/steps/1"}],
+        )
+        # a key that looks like a list index may have existed before the add
+        self.assertCompacts(
+            [[{"op": "add", "path": "/obj/1", "value": "z"}],
+             [{"op": "remove", "path": "/obj/1"}]],
+            [{"op": "add", "path": "/obj/1", "value": None},
+             {"op": "remove", "path": "/obj/1"}],
+            document={"obj": {"1": "x"}},
+        )
+        self.assertCompacts(
+            [[{"op": "remove", "path": "/meta/title"}],
+             [{"op": "add", "path": "/meta/title", "value": "Again"}]],
+            [{"op": "replace", "path": "/meta/title", "value": "Again"}],
+        )
+
+    def test_removed_additions_with_document(self):
+        """Test that the document tells which additions are dropped with their removal"""
+        self.assertCompacts(
+            [[{"op": "add", "path": "/steps/1", "value": {"description": "Temp", "tags": []}}],
+             [{"op": "replace", "path": "/meta/title", "value": "x"}],
+             [{"op": "add", "path": "/steps/1/tags/-", "value": "t"}],
+             [{"op": "remove", "path": "/steps/1"}]],
+            [{"op": "replace", "path": "/meta/title", "value": "x"}],
+            with_document=True,
+        )
+        # keys that look like list indexes are keys of the object
+        patches = [
+            [{"op": "add", "path": "/obj/0", "value": "z"}],
+            [{"op": "replace", "path": "/obj/1", "value": "y"}],
+            [{"op": "remove", "path": "/obj/0"}],
+        ]
+        self.assertCompacts(patches, [op for patch in patches for op in patch], {"obj": {"1": "x"}})
+        self.assertCompacts(
+            patches,
+            [{"op": "replace", "path": "/obj/1", "value": "y"}],
+            {"obj": {"1": "x"}},
+            with_document=True,
+        )
+        # adding an existing key replaces its value, which the removal drops
+        self.assertCompacts(
+            [[{"op": "add", "path": "/obj/1", "value": "z"}],
+             [{"op": "remove", "path": "/obj/1"}]],
+            [{"op": "remove", "path": "/obj/1"}],
+            {"obj": {"1": "x"}},
+            with_document=True,
+        )
+        self.assertCompacts(
+            [[{"op": "remove", "path": "/meta/title"}],
+             [{"op": "add", "path": "/meta/title", "value": "Again"}],
+             [{"op": "remove", "path": "/meta/title"}]],
+            [{"op": "remove", "path": "/meta/title"}],
+            with_document=True,
+        )
+
+    def test_document_is_not_changed(self):
+        """Test that the document is left unchanged and patches that do not apply raise"""
+        document = make_state(2)
+        compact_patches(
+            [[{"op": "add", "path": "/steps/0/tags/-", "value": "x"},
+              {"op": "move", "from": "/meta/title", "path": "/title"},
+              {"op": "remove", "path": "/steps/1"}]],
+            document,
+        )
+        self.assertEqual(document, make_state(2))
+        with self.assertRaises(PatchError):
+            compact_patches([[{"op": "remove", "path": "/steps/5"}]], document)
+        with self.assertRaises(PatchError):
+            compact_patches([[{"op": "test", "path": "/meta/title", "value": "Other"}]], document)
+
+    def test_list_shifts(self):
+        """Test that operations are not merged across inserts and removals that shift them"""
+        patches = [
+            [{"op": "replace", "path": "/steps/2/status", "value": "done"}],
+            [{"op": "remove", "path": "/steps/0"}],
+            [{"op": "replace", "path": "/steps/2/status", "value": "failed"}],
+        ]
+        self.assertCompacts(patches, [op for patch in patches for op in patch])
+        patches = [
+            [{"op": "add", "path": "/steps/1", "value": {"description": "New"}}],
+            [{"op": "replace", "path": "/steps/3/status", "value": "done"}],
+            [{"op": "remove", "path": "/steps/1"}],
+        ]
+        self.assertCompacts(patches, [op for patch in patches for op in patch])
+
+    def test_tests_moves_and_errors(self):
+        """Test that test operations are dropped, moves kept and invalid operations raise"""
+        self.assertCompacts(
+            [[{"op": "test", "path": "/meta/title", "value": "Plan"},
+              {"op": "replace", "path": "/meta/title", "value": "A"},
+              {"op": "move", "from": "/meta/title", "path": "/title"},
+              {"op": "replace", "path": "/title", "value": "B"}]],
+            [{"op": "replace", "path": "/meta/title", "value": "A"},
+             {"op": "move", "from": "/meta/title", "path": "/title"},
+             {"op": "replace", "path": "/title", "value": "B"}],
+        )
+        with self.assertRaises(PatchError):
+            compact_patches([[{"op": "jump", "path": "/a"}]])
+
+    def test_random_streams(self):
+        """Test that compacted random tracker streams have the effect of the stream"""
+        for seed in range(200):
+            rng = random.Random(seed)
+            base = make_state(4)
+            tracker = StateTracker(copy.deepcopy(base))
+            patches = []
+            for _ in range(rng.randrange(1, 40)):
+                steps = tracker.state["steps"]
+                choice = rng.randrange(8)
+                if choice == 0 or not steps:
+                    steps.append({"description": "new", "status": "pending", "tags": []})
+                elif choice == 1:
+                    steps.insert(rng.randrange(len(steps)), {"description": "inserted", "tags": []})
+                elif choice == 2:
+                    del steps[rng.randrange(len(steps))]
+                elif choice == 3:
+                    steps[rng.randrange(len(steps))]["status"] = rng.choice("abc")
+                elif choice == 4:
+                    steps[rng.randrange(len(steps))]["tags"].append(rng.choice("xy"))
+                elif choice == 5:
+                    tracker.state["meta"][rng.choice("xyz")] = rng.random()
+                elif choice == 6:
+                    tracker.state["meta"].pop(rng.choice("xyz"), None)
+                else:
+                    tracker.state["meta"] = {"title": rng.choice("AB")}
+                if rng.random() < 0.5:
+                    patches.append(tracker.patch())
+            patches.append(tracker.patch())
+            with self.subTest(seed=seed):
+                compacted = compact_patches(patches)
+                self.assertLessEqual(len(compacted), sum(map(len, patches)))
+                self.assertEqual(apply_patch(base, compacted), tracker.data)
+
+    def test_random_patches(self):
+        """Test that compacted random patches of every kind have the effect of the patches"""
+        base = {"obj": {"0": "x", "1": "y"}, "list": [0, 1, 2], "nested": {"2": [{"0": 1}]}}
+        original = copy.deepcopy(base)
+        for seed in range(2000):
+            patches, expected = generic_patches(random.Random(seed), base)
+            with self.subTest(seed=seed, patches=patches):
+                compacted = compact_patches(patches)
+                self.assertEqual(apply_patch(base, compacted), expected)
+                with_document = compact_patches(patches, base)
+                self.assertLessEqual(len(with_document), len(compacted))
+                self.assertEqual(apply_patch(base, with_document), expected)
+        self.assertEqual(base, original)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+from ag_ui.core import EventType, RawJSON
+from ag_ui.encoder import EventEncoder
+from ag_ui.state import StateEmitter, StateTracker, apply_patch
+from tests.state_helpers import make_state
+
+
+class TestStateEmitter(unittest.TestCase):
+    """Test suite for StateEmitter"""
+
+    def test_first_event_is_snapshot(self):
+        """Test that the first event is a snapshot and nothing is sent without changes"""
+        emitter = StateEmitter(StateTracker(make_state(20)))
+        event = emitter.next_event()
+        self.assertEqual(event.type, EventType.STATE_SNAPSHOT)
+        self.assertEqual(event.snapshot, RawJSON.dumps(make_state(20)))
+        self.assertIsNone(emitter.next_event())
+
+    def test_small_changes_are_deltas(self):
+        """Test that small changes are sent as deltas that reproduce the state"""
+        tracker = StateTracker(make_state(20))
+        emitter = StateEmitter(tracker)
+        client = emitter.next_event().snapshot.loads()
+        for i in range(10):
+            tracker.state["steps"][i]["status"] = "completed"
+            event = emitter.next_event(timestamp=i)
+            self.assertEqual(event.type, EventType.STATE_DELTA)
+            self.assertEqual(event.timestamp, i)
+            client = apply_patch(client, event.delta, in_place=True)
+        self.assertEqual(client, tracker.data)
+        self.assertEqual(emitter.stats()["deltas"], 10)
+
+        # The deltas add up to the size of the snapshot
+        types = []
+        for i in range(10, 20):
+            tracker.state["steps"][i]["status"] = "completed"
+            types.append(emitter.next_event().type)
+        self.assertEqual(types.count(EventType.STATE_SNAPSHOT), 1)
+        self.assertEqual(emitter.stats()["snapshots"], 2)
+
+    def test_large_changes_are_snapshots(self):
+        """Test that a change of most of the state is sent as a snapshot"""
+        tracker = StateTracker(make_state(20))
+        emitter = StateEmitter(tracker)
+        emitter.next_event()
+        tracker.state = {
+            "steps": [{"description": f"Task {i}", "status": "done"} for i in range(20)],
+            "meta": {"title": "Tasks"},
+        }
+        event = emitter.next_event()
+        self.assertEqual(event.type, EventType.STATE_SNAPSHOT)
+        self.assertEqual(event.snapshot.loads(), tracker.data)
+        self.assertFalse(tracker.has_changes)
+
+        tracker.state["steps"][0]["status"] = "failed"
+        self.assertEqual(emitter.next_event().type, EventType.STATE_DELTA)
+
+    def test_forced_snapshots(self):
+        """Test that a snapshot is sent after max_deltas deltas or max_delta_bytes bytes"""
+        tracker = StateTracker(make_state(20))
+        emitter = StateEmitter(tracker, max_deltas=3)
+        emitter.next_event()
+        types = []
+        for i in range(8):
+            tracker.state["steps"][i]["status"] = "completed"
+            types.append(emitter.next_event().type)
+        self.assertEqual(types, [EventType.STATE_DELTA] * 3 + [EventType.STATE_SNAPSHOT]
+                         + [EventType.STATE_DELTA] * 3 + [EventType.STATE_SNAPSHOT])
+
+        emitter = StateEmitter(tracker, max_delta_bytes=150)
+        emitter.next_event()
+        types = []
+        for i in range(4):
+            tracker.state["steps"][i]["status"] = "done"
+            types.append(emitter.next_event().type)
+        self.assertEqual(types, [EventType.STATE_DELTA] * 2 + [EventType.STATE_SNAPSHOT]
+                         + [EventType.STATE_DELTA])
+
+    def test_snapshot_is_frozen(self):
+        """Test that a snapshot does not change with the state"""
+        tracker = StateTracker(make_state(1))
+        emitter = StateEmitter(tracker)
+        event = emitter.snapshot_event()
+        tracker.state["steps"][0]["status"] = "completed"
+        self.assertEqual(
+            EventEncoder().encode(event),
+            'data: {"type":"STATE_SNAPSHOT","snapshot":'
+            '{"steps":[{"description":"Step 1","status":"pending","tags":[]}],'
+            '"meta":{"title":"Plan","tags":["a"]}}}\n\n',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
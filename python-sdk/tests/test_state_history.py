@@ -0,0 +1,88 @@
+import copy
+import unittest
+
+from ag_ui.core import EventType, RawJSON, StateDeltaEvent, StateSnapshotEvent, TextMessageEndEvent
+from ag_ui.state import PatchError, StateHistory, StateTracker, apply_patch
+
+
+class TestStateHistory(unittest.TestCase):
+    """Test suite for StateHistory"""
+
+    def make_history(self, count: int, **kwargs) -> tuple:
+        """Returns a history of count step updates and the state after each"""
+        tracker = StateTracker({"steps": [{"status": "pending"} for _ in range(count)]})
+        history = StateHistory(tracker.data, **kwargs)
+        states = [copy.deepcopy(tracker.data)]
+        for i in range(count):
+            tracker.state["steps"][i]["status"] = "completed"
+            history.append(tracker.patch())
+            states.append(apply_patch(states[-1], history.patches(i)[0]))
+        return history, states
+
+    def test_state_at(self):
+        """Test that the state after every entry is rebuilt from checkpoints"""
+        history, states = self.make_history(23, checkpoint_interval=5)
+        self.assertEqual(len(history), 23)
+        self.assertEqual(history._checkpoint_offsets, [0, 5, 10, 15, 20])  # pylint: disable=protected-access
+        for offset, state in enumerate(states):
+            self.assertEqual(history.state_at(offset), state)
+        self.assertEqual(history.state_at(), history.state)
+        self.assertEqual(history.state_at(0)["steps"][0]["status"], "pending")
+        with self.assertRaises(IndexError):
+            history.state_at(24)
+
+    def test_checkpoints_are_not_changed(self):
+        """Test that later entries and rebuilt states leave checkpoints unchanged"""
+        history, states = self.make_history(4, checkpoint_interval=2)
+        rebuilt = history.state_at(3)
+        history.append([{"op": "add", "path": "/steps/-", "value": {"status": "new"}}])
+        self.assertEqual(history.state_at(3), rebuilt)
+        self.assertEqual(history.state_at(2), states[2])
+
+    def test_delta(self):
+        """Test that the delta between two offsets is one compacted patch"""
+        history, states = self.make_history(10)
+        delta = history.delta(3, 7)
+        self.assertEqual(len(delta), 4)
+        self.assertEqual(apply_patch(states[3], delta), states[7])
+        self.assertEqual(apply_patch(states[0], history.delta(0)), history.state)
+
+    def test_delta_drops_removed_additions(self):
+        """Test that the delta drops values that were added and removed again"""
+        history = StateHistory({"steps": [], "meta": {"0": "kept"}})
+        history.append([{"op": "add", "path": "/steps/0", "value": {"status": "pending"}}])
+        history.append([{"op": "add", "path": "/meta/1", "value": "draft"}])
+        history.append([{"op": "remove", "path": "/steps/0"}, {"op": "remove", "path": "/meta/1"}])
+        history.append([{"op": "add", "path": "/meta/done", "value": True}])
+        self.assertEqual(history.delta(0), [{"op": "add", "path": "/meta/done", "value": True}])
+        self.assertEqual(history.delta(1), [
+            {"op": "remove", "path": "/steps/0"},
+            {"op": "add", "path": "/meta/done", "value": True},
+        ])
+        self.assertEqual(apply_patch(history.state_at(1), history.delta(1)), history.state)
+
+    def test_events_and_errors(self):
+        """Test appending events and a patch that does not apply"""
+        history = StateHistory()
+        self.assertEqual(history.state, None)
+        self.assertEqual(
+            history.append_event(StateSnapshotEvent(type=EventType.STATE_SNAPSHOT,
+                                                    snapshot=RawJSON('{"count":1}'))), 0)
+        self.assertEqual(history.append_event(StateDeltaEvent(
+            type=EventType.STATE_DELTA, delta=[{"op": "replace", "path": "/count", "value": 2}]
+        )), 1)
+        self.assertIsNone(history.append_event(TextMessageEndEvent(
+            type=EventType.TEXT_MESSAGE_END, message_id="m1"
+        )))
+        with self.assertRaises(PatchError):
+            history.append([{"op": "add", "path": "/x", "value": 1},
+                            {"op": "remove", "path": "/missing"}])
+        self.assertEqual(len(history), 2)
+        self.assertEqual(history.state, {"count": 2})
+        self.assertEqual(history.delta(1), [{"op": "replace", "path": "/count", "value": 2}])
+        self.assertEqual(history.delta(0), [{"op": "replace", "path": "", "value": {"count": 2}}])
+        self.assertEqual(history.state_at(1), {"count": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
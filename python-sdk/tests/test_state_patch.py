@@ -0,0 +1,140 @@
+import copy
+import unittest
+
+from ag_ui.state import PatchError, apply_patch, parse_pointer
+from tests.state_helpers import make_state
+
+# Examples of RFC 6902, Appendix A: (document, patch, result or None if the patch fails)
+RFC_EXAMPLES = [
+    ({"foo": "bar"}, [{"op": "add", "path": "/baz", "value": "qux"}],
+     {"baz": "qux", "foo": "bar"}),
+    ({"foo": ["bar", "baz"]}, [{"op": "add", "path": "/foo/1", "value": "qux"}],
+     {"foo": ["bar", "qux", "baz"]}),
+    ({"baz": "qux", "foo": "bar"}, [{"op": "remove", "path": "/baz"}], {"foo": "bar"}),
+    ({"foo": ["bar", "qux", "baz"]}, [{"op": "remove", "path": "/foo/1"}],
+     {"foo": ["bar", "baz"]}),
+    ({"baz": "qux", "foo": "bar"}, [{"op": "replace", "path": "/baz", "value": "boo"}],
+     {"baz": "boo", "foo": "bar"}),
+    ({"foo": {"bar": "baz", "waldo": "fred"}, "qux": {"corge": "grault"}},
+     [{"op": "move", "from": "/foo/waldo", "path": "/qux/thud"}],
+     {"foo": {"bar": "baz"}, "qux": {"corge": "grault", "thud": "fred"}}),
+    ({"foo": ["all", "grass", "cows", "eat"]}, [{"op": "move", "from": "/foo/1", "path": "/foo/3"}],
+     {"foo": ["all", "cows", "eat", "grass"]}),
+    ({"baz": "qux", "foo": ["a", 2, "c"]},
+     [{"op": "test", "path": "/baz", "value": "qux"}, {"op": "test", "path": "/foo/1", "value": 2}],
+     {"baz": "qux", "foo": ["a", 2, "c"]}),
+    ({"baz": "qux"}, [{"op": "test", "path": "/baz", "value": "bar"}], None),
+    ({"foo": "bar"}, [{"op": "add", "path": "/child", "value": {"grandchild": {}}}],
+     {"foo": "bar", "child": {"grandchild": {}}}),
+    ({"foo": "bar"}, [{"op": "add", "path": "/baz/bat", "value": "qux"}], None),
+    ({"/": 9, "~1": 10}, [{"op": "test", "path": "/~01", "value": 10}], {"/": 9, "~1": 10}),
+    ({"/": 9, "~1": 10}, [{"op": "test", "path": "/~01", "value": "10"}], None),
+    ({"foo": ["bar"]}, [{"op": "add", "path": "/foo/-", "value": ["abc", "def"]}],
+     {"foo": ["bar", ["abc", "def"]]}),
+]
+
+
+class TestApplyPatch(unittest.TestCase):
+    """Test suite for apply_patch"""
+
+    def test_rfc_examples(self):
+        """Test the examples of RFC 6902 in both modes"""
+        for document, patch, expected in RFC_EXAMPLES:
+            for in_place in (False, True):
+                with self.subTest(patch=patch, in_place=in_place):
+                    original = copy.deepcopy(document)
+                    if expected is None:
+                        with self.assertRaises(PatchError):
+                            apply_patch(document, patch, in_place=in_place)
+                    else:
+                        self.assertEqual(apply_patch(document, patch, in_place=in_place), expected)
+                    if expected is None or not in_place:
+                        self.assertEqual(document, original)
+
+    def test_copy_on_write(self):
+        """Test that only the containers along changed paths are copied"""
+        state = make_state()
+        original = copy.deepcopy(state)
+        result = apply_patch(state, [
+            {"op": "replace", "path": "/steps/1/status", "value": "completed"},
+            {"op": "add", "path": "/steps/1/note", "value": "done"},
+        ])
+        self.assertEqual(state, original)
+        self.assertEqual(result["steps"][1], {
+            "description": "Step 2", "status": "completed", "tags": [], "note": "done"
+        })
+        self.assertIsNot(result["steps"], state["steps"])
+        self.assertIs(result["steps"][0], state["steps"][0])
+        self.assertIs(result["meta"], state["meta"])
+
+    def test_in_place(self):
+        """Test that an in-place patch changes the document itself"""
+        state = make_state()
+        result = apply_patch(state, [{"op": "add", "path": "/meta/tags/-", "value": "b"}], in_place=True)
+        self.assertIs(result, state)
+        self.assertEqual(state["meta"]["tags"], ["a", "b"])
+
+    def test_rollback(self):
+        """Test that a failing patch leaves the document unchanged in both modes"""
+        patch = [
+            {"op": "replace", "path": "/steps/0/status", "value": "completed"},
+            {"op": "remove", "path": "/meta/title"},
+            {"op": "add", "path": "/steps/0", "value": {"description": "Step 0"}},
+            {"op": "move", "from": "/steps/1", "path": "/meta/first"},
+            {"op": "copy", "from": "/meta", "path": "/steps/-"},
+            {"op": "replace", "path": "/steps/9/status", "value": "missing"},
+        ]
+        for in_place in (False, True):
+            with self.subTest(in_place=in_place):
+                state = make_state()
+                with self.assertRaises(PatchError):
+                    apply_patch(state, patch, in_place=in_place)
+                self.assertEqual(state, make_state())
+                self.assertEqual(list(state), ["steps", "meta"])
+
+    def test_values_are_copied(self):
+        """Test that added values are copied, so later operations do not change the patch"""
+        patch = [
+            {"op": "add", "path": "/item", "value": {"tags": []}},
+            {"op": "add", "path": "/item/tags/-", "value": "x"},
+            {"op": "copy", "from": "/item", "path": "/other"},
+            {"op": "add", "path": "/other/tags/-", "value": "y"},
+        ]
+        for in_place in (False, True):
+            with self.subTest(in_place=in_place):
+                result = apply_patch({}, patch, in_place=in_place)
+                self.assertEqual(result, {"item": {"tags": ["x"]}, "other": {"tags": ["x", "y"]}})
+                self.assertEqual(patch[0]["value"], {"tags": []})
+
+    def test_root_and_errors(self):
+        """Test operations on the whole document and invalid operations"""
+        self.assertEqual(apply_patch({"a": 1}, [{"op": "replace", "path": "", "value": [1]}]), [1])
+        self.assertEqual(apply_patch(None, [{"op": "add", "path": "", "value": {}}]), {})
+        self.assertEqual(
+            apply_patch({"a": {"b": 1}}, [{"op": "move", "from": "/a", "path": "/a"}]), {"a": {"b": 1}}
+        )
+        invalid = [
+            {"op": "remove", "path": ""},
+            {"op": "jump", "path": "/a"},
+            {"op": "add", "path": "/a"},
+            {"op": "add", "path": "a", "value": 1},
+            {"op": "move", "path": "/a/b/c", "from": "/a"},
+            {"op": "copy", "path": "/c"},
+            {"op": "replace", "path": "/list/01", "value": 1},
+            {"op": "add", "path": "/list/3", "value": 1},
+            {"op": "test", "path": "/list/0", "value": True},
+            {"path": "/a"},
+        ]
+        for operation in invalid:
+            with self.subTest(operation=operation):
+                with self.assertRaises(PatchError):
+                    apply_patch({"a": {"b": {}}, "list": [1, 2]}, [operation])
+
+    def test_parse_pointer(self):
+        """Test that pointers are unescaped"""
+        self.assertEqual(parse_pointer(""), ())
+        self.assertEqual(parse_pointer("/a~1b/m~0n/0/"), ("a/b", "m~n", "0", ""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import copy
+import random
+import unittest
+
+from ag_ui.core import EventType, StateDeltaEvent
+from ag_ui.state import StateTracker, TrackedDict, TrackedList, apply_patch
+from tests.state_helpers import make_state
+
+
+class TestStateTracker(unittest.TestCase):
+    """Test suite for StateTracker"""
+
+    def test_records_operations(self):
+        """Test that mutations through the proxies become JSON Patch operations"""
+        state = make_state()
+        tracker = StateTracker(state)
+        tracker.state["steps"][0]["status"] = "completed"
+        tracker.state["meta"]["owner"] = "me"
+        del tracker.state["meta"]["title"]
+        tracker.state["steps"].append({"description": "Step 4", "status": "pending"})
+        tracker.state["steps"].insert(0, {"description": "Step 0"})
+        tracker.state["steps"].pop(1)
+        self.assertIs(tracker.data, state)
+        self.assertEqual(tracker.patch(), [
+            {"op": "replace", "path": "/steps/0/status", "value": "completed"},
+            {"op": "add", "path": "/meta/owner", "value": "me"},
+            {"op": "remove", "path": "/meta/title"},
+            {"op": "add", "path": "/steps/-", "value": {"description": "Step 4", "status": "pending"}},
+            {"op": "add", "path": "/steps/0", "value": {"description": "Step 0"}},
+            {"op": "remove", "path": "/steps/1"},
+        ])
+        self.assertFalse(tracker.has_changes)
+        self.assertEqual(len(state["steps"]), 4)
+
+    def test_proxies(self):
+        """Test that proxies read like the containers they wrap"""
+        tracker = StateTracker(make_state())
+        steps = tracker.state["steps"]
+        self.assertIsInstance(tracker.state, TrackedDict)
+        self.assertIsInstance(steps, TrackedList)
+        self.assertEqual(steps, make_state()["steps"])
+        self.assertEqual(len(steps), 3)
+        self.assertEqual([step["status"] for step in steps], ["pending"] * 3)
+        self.assertEqual(steps[-1]["description"], "Step 3")
+        self.assertEqual(dict(tracker.state["meta"].items()), {"title": "Plan", "tags": ["a"]})
+        self.assertIn("meta", tracker.state)
+        self.assertFalse(tracker.has_changes)
+
+    def test_stale_indexes(self):
+        """Test that a held proxy finds its item again after the list changed"""
+        tracker = StateTracker(make_state())
+        last = tracker.state["steps"][2]
+        tracker.state["steps"].insert(0, {"description": "Step 0"})
+        last["status"] = "completed"
+        removed = tracker.state["steps"].pop()
+        self.assertEqual(tracker.patch()[1:], [
+            {"op": "replace", "path": "/steps/3/status", "value": "completed"},
+            {"op": "remove", "path": "/steps/3"},
+        ])
+        self.assertEqual(removed["status"], "completed")
+        with self.assertRaises(ValueError):
+            last["status"] = "pending"
+        self.assertFalse(tracker.has_changes)
+
+    def test_values_are_copied(self):
+        """Test that later changes of an added value do not change its operation"""
+        tracker = StateTracker({})
+        tracker.state["items"] = []
+        tracker.state["items"].append(1)
+        tracker.state["items"] += [2]
+        self.assertEqual(tracker.patch(), [
+            {"op": "add", "path": "/items", "value": []},
+            {"op": "add", "path": "/items/-", "value": 1},
+            {"op": "add", "path": "/items/-", "value": 2},
+        ])
+
+    def test_repeated_replace_is_merged(self):
+        """Test that replacing the path of the previous operation updates it"""
+        tracker = StateTracker({"progress": 0})
+        for i in range(1, 5):
+            tracker.state["progress"] = i
+        tracker.state["label"] = "a"
+        tracker.state["label"] = "b"
+        self.assertEqual(tracker.patch(), [
+            {"op": "replace", "path": "/progress", "value": 4},
+            {"op": "add", "path": "/label", "value": "b"},
+        ])
+
+    def test_escaping_and_bulk_changes(self):
+        """Test pointer escaping and the operations of bulk changes"""
+        tracker = StateTracker({"a/b": {"m~n": 1}, "list": [3, 1, 2]})
+        tracker.state["a/b"]["m~n"] = 2
+        tracker.state["list"].sort()
+        tracker.state["list"][1:] = [5]
+        tracker.state["a/b"].clear()
+        self.assertEqual(tracker.patch(), [
+            {"op": "replace", "path": "/a~1b/m~0n", "value": 2},
+            {"op": "replace", "path": "/list", "value": [1, 5]},
+            {"op": "replace", "path": "/a~1b", "value": {}},
+        ])
+        with self.assertRaises(TypeError):
+            tracker.state[1] = "x"
+
+    def test_events(self):
+        """Test the delta and snapshot events"""
+        tracker = StateTracker(make_state())
+        self.assertIsNone(tracker.delta_event())
+        tracker.state["meta"]["title"] = "Done"
+        event = tracker.delta_event(timestamp=1)
+        self.assertEqual(event, StateDeltaEvent(
+            type=EventType.STATE_DELTA,
+            delta=[{"op": "replace", "path": "/meta/title", "value": "Done"}],
+            timestamp=1,
+        ))
+        tracker.state["meta"]["title"] = "Again"
+        snapshot = tracker.snapshot_event()
+        self.assertEqual(snapshot.snapshot["meta"]["title"], "Again")
+        self.assertIsNone(tracker.delta_event())
+
+        tracker.state = {"new": True}
+        self.assertEqual(tracker.patch(), [{"op": "replace", "path": "", "value": {"new": True}}])
+
+    def test_random_mutations(self):
+        """Test that the patches reproduce random mutations"""
+        rng = random.Random(7)
+        state = make_state()
+        tracker = StateTracker(state)
+        client = copy.deepcopy(state)
+        for _ in range(300):
+            steps = tracker.state["steps"]
+            choice = rng.randrange(6)
+            if choice == 0 or not steps:
+                steps.append({"description": "new", "status": "pending"})
+            elif choice == 1:
+                steps.insert(rng.randrange(len(steps)), {"description": "inserted"})
+            elif choice == 2:
+                del steps[rng.randrange(len(steps))]
+            elif choice == 3:
+                steps[rng.randrange(len(steps))]["status"] = rng.choice(["done", "failed"])
+            elif choice == 4:
+                tracker.state["meta"][rng.choice("abc")] = rng.random()
+            else:
+                tracker.state["meta"].pop(rng.choice("abc"), None)
+            if rng.random() < 0.3:
+                client = apply_patch(client, tracker.patch())
+                self.assertEqual(client, state)
+        self.assertEqual(apply_patch(client, tracker.patch()), state)
+
+
+if __name__ == "__main__":
+    unittest.main()
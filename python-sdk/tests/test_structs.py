@@ -0,0 +1,176 @@
+import json
+import unittest
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+from ag_ui.core.events import BaseEvent, EventType, TextMessageContentEvent
+from ag_ui.core.types import RawJSON, RunAgentInput
+from ag_ui.encoder.encoder import EventEncoder, AGUI_MEDIA_TYPE, NDJSON_MEDIA_TYPE
+from ag_ui.encoder.serializers import event_classes
+from ag_ui.proto.proto import EVENT_SPECS
+
+from tests.test_serializers import SAMPLES
+
+if msgspec is not None:
+    from ag_ui.core import structs
+
+RUN_AGENT_INPUT = {
+    "threadId": "t1",
+    "runId": "r1",
+    "state": {"count": 1, "items": [None, "x"]},
+    "messages": [
+        {"id": "s1", "role": "system", "content": "Be brief"},
+        {"id": "d1", "role": "developer", "content": "Use tools", "name": "ops"},
+        {"id": "u1", "role": "user", "content": 'Hello "world" \n✓'},
+        {
+            "id": "a1",
+            "role": "assistant",
+            "toolCalls": [
+                {
+                    "id": "c1",
+                    "type": "function",
+                    "function": {"name": "search", "arguments": "{\"q\": 1}"},
+                }
+            ],
+        },
+        {"id": "t1", "role": "tool", "content": "done", "toolCallId": "c1"},
+    ],
+    "tools": [{"name": "search", "description": "Search", "parameters": {"type": "object"}}],
+    "context": [{"description": "user", "value": "admin"}],
+    "forwardedProps": {"source": "web"},
+}
+
+
+@unittest.skipIf(msgspec is None, "msgspec is not installed")
+class TestStructs(unittest.TestCase):
+    """Test suite for the msgspec struct backend"""
+
+    def _event_samples(self):
+        # a plain BaseEvent is not part of the Event union in either backend;
+        # the samples are compared as they arrive over the wire
+        for cls, samples in SAMPLES.items():
+            if cls is BaseEvent:
+                continue
+            for event in samples:
+                data = event.model_dump_json(by_alias=True, exclude_none=True)
+                try:
+                    yield cls.model_validate_json(data), data
+                except ValueError:
+                    # a required field that was None is not written by pydantic
+                    continue
+
+    def test_every_event_class_has_a_struct(self):
+        """Test that every event class is mirrored by a struct of the same name"""
+        for cls in event_classes():
+            struct_class = getattr(structs, cls.__name__)
+            if cls is BaseEvent:
+                continue
+            fields = {field.encode_name for field in msgspec.structs.fields(struct_class)}
+            aliases = {field.alias for name, field in cls.model_fields.items() if name != "type"}
+            self.assertEqual(fields, aliases, cls.__name__)
+            self.assertIn(struct_class, structs.Event.__args__)
+
+    def test_decodes_pydantic_output(self):
+        """Test that the pydantic JSON decodes to structs and re-encodes to the same value"""
+        for event, data in self._event_samples():
+            with self.subTest(event=event):
+                struct = structs.decode_event(data)
+                self.assertIs(type(struct), getattr(structs, type(event).__name__))
+                self.assertEqual(struct.type, event.type)
+                self.assertEqual(json.loads(structs.encode(struct)), json.loads(data))
+
+    def test_pydantic_decodes_struct_output(self):
+        """Test that the struct JSON validates as the same pydantic event"""
+        for event, data in self._event_samples():
+            with self.subTest(event=event):
+                struct = structs.decode_event(data)
+                self.assertEqual(type(event).model_validate_json(structs.encode(struct)), event)
+
+    def test_encoder_output_matches_models(self):
+        """Test that the EventEncoder writes structs like their models"""
+        encoders = [
+            EventEncoder(),
+            EventEncoder(accept=NDJSON_MEDIA_TYPE),
+            EventEncoder(accept=AGUI_MEDIA_TYPE, binary=True),
+        ]
+        for event, data in self._event_samples():
+            struct = structs.decode_event(data)
+            for encoder in encoders:
+                with self.subTest(event=event, content_type=encoder.get_content_type()):
+                    if encoder.accepts_protobuf:
+                        if event.type in EVENT_SPECS:
+                            self.assertEqual(
+                                encoder.encode_binary(struct), encoder.encode_binary(event)
+                            )
+                        continue
+                    self.assertEqual(
+                        json.loads(encoder.encode(struct).split("data: ")[-1]),
+                        json.loads(encoder.encode(event).split("data: ")[-1]),
+                    )
+
+    def test_run_agent_input_conformance(self):
+        """Test that RunAgentInput has the same wire format in both backends"""
+        data = json.dumps(RUN_AGENT_INPUT)
+        model = RunAgentInput.model_validate_json(data)
+        struct = structs.decode_run_agent_input(data)
+        self.assertEqual([message.role for message in struct.messages],
+                         [message.role for message in model.messages])
+        self.assertIsInstance(struct.messages[3], structs.AssistantMessage)
+        self.assertEqual(struct.messages[3].tool_calls[0].function.name, "search")
+        self.assertEqual(
+            json.loads(structs.encode(struct)),
+            json.loads(model.model_dump_json(by_alias=True, exclude_none=True)),
+        )
+        self.assertEqual(RunAgentInput.model_validate_json(structs.encode(struct)), model)
+
+        # required fields are written even when they are null
+        data = json.dumps({**RUN_AGENT_INPUT, "state": None, "forwardedProps": None})
+        encoded = json.loads(structs.encode(structs.decode_run_agent_input(data)))
+        self.assertIsNone(encoded["state"])
+        self.assertIsNone(encoded["forwardedProps"])
+
+    def test_discriminator_errors(self):
+        """Test that invalid events are rejected like the pydantic models reject them"""
+        invalid = [
+            b'{"messageId": "m1", "delta": "x"}',
+            b'{"type": "UNKNOWN", "messageId": "m1"}',
+            b'{"type": "TEXT_MESSAGE_CONTENT", "messageId": "m1"}',
+            b'{"type": "TEXT_MESSAGE_CONTENT", "messageId": "m1", "delta": ""}',
+            b'{"type": "TEXT_MESSAGE_CONTENT", "messageId": "m1", "delta": "x", "extra": 1}',
+            b'{"type": "TEXT_MESSAGE_START", "messageId": "m1", "role": "user"}',
+        ]
+        for data in invalid:
+            with self.subTest(data=data):
+                with self.assertRaises(msgspec.ValidationError):
+                    structs.decode_event(data)
+        with self.assertRaises(msgspec.ValidationError):
+            structs.decode_run_agent_input(
+                json.dumps({**RUN_AGENT_INPUT, "messages": [{"id": "x", "role": "robot"}]})
+            )
+
+    def test_construction(self):
+        """Test that structs are constructed with keyword arguments"""
+        event = structs.TextMessageContentEvent(message_id="m1", delta="x")
+        self.assertEqual(event.type, EventType.TEXT_MESSAGE_CONTENT)
+        self.assertEqual(
+            structs.encode(event),
+            TextMessageContentEvent(
+                type=EventType.TEXT_MESSAGE_CONTENT, message_id="m1", delta="x"
+            ).model_dump_json(by_alias=True, exclude_none=True).encode("utf-8"),
+        )
+        with self.assertRaises(ValueError):
+            structs.TextMessageContentEvent(message_id="m1", delta="")
+
+    def test_raw_json(self):
+        """Test that pre-encoded JSON values are spliced in verbatim"""
+        event = structs.StateSnapshotEvent(snapshot=RawJSON('{"a":[1,null]}'))
+        self.assertEqual(
+            structs.encode(event), b'{"type":"STATE_SNAPSHOT","snapshot":{"a":[1,null]}}'
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
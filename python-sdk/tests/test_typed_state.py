@@ -0,0 +1,116 @@
+import json
+import unittest
+from typing import List, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from ag_ui.core import EventType, RunAgentInput, StateSnapshotEvent, compact, parse_run_agent_input
+from ag_ui.encoder import EventEncoder, AGUI_MEDIA_TYPE
+from ag_ui.encoder.serializers import get_serializer
+
+
+class Step(BaseModel):
+    """A step of the plan"""
+    description: str
+    done: bool = False
+    note: Optional[str] = None
+
+
+class PlanState(BaseModel):
+    """A typed agent state"""
+    steps: List[Step] = []
+    count: int = 0
+
+
+BODY = {
+    "threadId": "t1",
+    "runId": "r1",
+    "state": {"steps": [{"description": "plan"}], "count": 1},
+    "messages": [{"id": "u1", "role": "user", "content": "Hi"}],
+    "tools": [],
+    "context": [],
+    "forwardedProps": {},
+}
+
+
+class TestTypedStateSnapshot(unittest.TestCase):
+    """Test suite for StateSnapshotEvent parameterized with a state model"""
+
+    def test_validates_snapshot(self):
+        """Test that the snapshot is validated as the state model"""
+        event = StateSnapshotEvent[PlanState](
+            type=EventType.STATE_SNAPSHOT, snapshot={"steps": [{"description": "a"}]}
+        )
+        self.assertIsInstance(event.snapshot, PlanState)
+        self.assertIsInstance(event, StateSnapshotEvent)
+        with self.assertRaises(ValidationError):
+            StateSnapshotEvent[PlanState](type=EventType.STATE_SNAPSHOT, snapshot={"count": "x"})
+        untyped = StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"count": "x"})
+        self.assertEqual(untyped.snapshot, {"count": "x"})
+
+    def test_serialization(self):
+        """Test that typed snapshots have their own serializer with the same output"""
+        state = PlanState(steps=[Step(description='say "hi"'), Step(description="b", done=True)])
+        event = StateSnapshotEvent[PlanState](type=EventType.STATE_SNAPSHOT, snapshot=state)
+        untyped = StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=state)
+        serializer = get_serializer(type(event))
+        self.assertIsNotNone(serializer)
+        self.assertIsNot(serializer, get_serializer(StateSnapshotEvent))
+        expected = untyped.model_dump_json(by_alias=True, exclude_none=True)
+        self.assertEqual(serializer(event), expected)
+        self.assertEqual(event.model_dump_json(by_alias=True, exclude_none=True), expected)
+        self.assertEqual(EventEncoder().encode(event), EventEncoder().encode(untyped))
+
+        proto_encoder = EventEncoder(accept=AGUI_MEDIA_TYPE, binary=True)
+        self.assertEqual(proto_encoder.encode_binary(event), proto_encoder.encode_binary(untyped))
+
+    def test_trusted_construction(self):
+        """Test that trusted construction works for parameterized classes"""
+        state = PlanState(count=3)
+        event = StateSnapshotEvent[PlanState].trusted(snapshot=state)
+        self.assertEqual(
+            event, StateSnapshotEvent[PlanState](type=EventType.STATE_SNAPSHOT, snapshot=state)
+        )
+
+
+    def test_compact_record(self):
+        """Test that events of parameterized classes have compact records"""
+        state = PlanState(count=3)
+        event = StateSnapshotEvent[PlanState](type=EventType.STATE_SNAPSHOT, snapshot=state)
+        for record in (compact.from_event(event), compact.StateSnapshotEvent.from_event(event)):
+            self.assertIsInstance(record, compact.StateSnapshotEvent)
+            self.assertIs(record.snapshot, state)
+            self.assertEqual(EventEncoder().encode(record), EventEncoder().encode(event))
+            self.assertEqual(
+                record.to_event(), StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=state)
+            )
+
+
+class TestTypedRunAgentInput(unittest.TestCase):
+    """Test suite for RunAgentInput parameterized with a state model"""
+
+    def test_validates_state(self):
+        """Test that the state is validated as the state model"""
+        input_data = RunAgentInput[PlanState].model_validate(BODY)
+        self.assertIsInstance(input_data.state, PlanState)
+        self.assertEqual(input_data.state.steps[0].description, "plan")
+        self.assertEqual(RunAgentInput.model_validate(BODY).state, BODY["state"])
+
+    def test_parse_with_state_type(self):
+        """Test that parse_run_agent_input validates the state in every mode"""
+        data = json.dumps(BODY)
+        expected = RunAgentInput[PlanState].model_validate(BODY)
+        for options in ({}, {"lazy": True}):
+            with self.subTest(options=options):
+                input_data = parse_run_agent_input(data, state_type=PlanState, **options)
+                self.assertIsInstance(input_data, RunAgentInput[PlanState])
+                self.assertIsInstance(input_data.state, PlanState)
+                self.assertEqual(input_data, expected)
+        with self.assertRaises(ValidationError):
+            parse_run_agent_input(
+                json.dumps({**BODY, "state": {"count": "x"}}), state_type=PlanState, lazy=True
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()